@@ -2,10 +2,14 @@
 Application Streamlit pour explorer et prédire les catégories de prix des parfums.
 """
 
+import time
+
 import streamlit as st
 import pandas as pd
 from pathlib import Path
 
+t_script = time.perf_counter()
+
 try:
     import plotly.express as px
 
@@ -50,14 +54,19 @@ except Exception:
     _PLOTLY_TEMPLATE = None 
     _PLOTLY_OK = False
 
-from src.app.module.fonction_filtre import filter_df, options, opts_no_all
-from src.app.module.fonction_prettycard import pretty_cards
-from src.app.module.fonction_filtre_2 import filter_by_terms
-from src.app.module.fonction_tableau import show_terms_table
-from src.app.module.fonction_cache import load_data, load_model, build_term_stats
+from src.app.module.fonction_facettes import facettes
+from src.app.module.fonction_prettycard import PAGE_SIZES, pagination, pretty_cards
+from src.app.module.fonction_requete import CARD_COLS, TABLE_COLS, page, sort_rows
+from src.app.module.fonction_tableau import show_associations_table, show_perfumes_table, show_terms_table
+from src.app.module.fonction_catalogue import dataset_version
+from src.app.module.fonction_cache import load_catalogue, load_contributions, load_model, load_lsh, load_positionnement, load_prediction_cache, load_similarite
+from src.app.module.fonction_prediction import cle_prediction, predire
 from src.app.module.fonction_css import local_css
+from src.Machine_learning.module.lsh import SEUIL_LSH
+from src.app.module.fonction_vues import choisir_vue, chrono_vues, executer_vue
 from src.app.module.fonction_stats import (
     distribution,
+    indicateurs,
     origins_choropleth,
     origins_geo,
     price_by_year,
@@ -72,120 +81,160 @@ local_css("style.css")
 ROOT = Path(__file__).resolve().parent
 DATA_PATH = ROOT / "data" / "parfums_data_base_machineLearning.csv"
 MODEL_PATH = ROOT / "src" / "Machine_learning" / "best_model.pkl"
+LSH_DIR = ROOT / "data" / "lsh"
+POSITIONNEMENT_PATH = ROOT / "data" / "positionnement.csv"
+CONTRIBUTIONS_PATH = ROOT / "data" / "contributions.npz"
 
-df = load_data(DATA_PATH)
+catalogue = load_catalogue(DATA_PATH)
+df = catalogue.df
 
 # --- INTERFACE PRINCIPALE ---
-tab5, tab1, tab2, tab3, tab4 = st.tabs([
+# Navigation : seule la vue choisie est exécutée (voir fonction_vues)
+VUES = [
     "📘 Présentation",
     "🔎 Explorer (catalogue)",
     "🔮 Prédire",
     "🧾 Ingrédients & Concepts",
     "📊 Stats",
-])
+]
+vue_active = choisir_vue(VUES, key="vue")
+zone_vue = st.container()
 
 
 #------------------------------------------------------------------------------------------------------------------------------------------
 
 
-# ONGLET 1 : EXPLORER
-with tab1:
+# VUE 1 : EXPLORER
+EXPLORE_FILTERS = {
+    "Prix_Categorie": "explore_prix",
+    "Marque": "explore_marque",
+    "Famille": "explore_famille",
+    "Sous_famille": "explore_sous_famille",
+    "Origine": "explore_origine",
+    "Genre": "explore_genre",
+    "Parfumeur": "explore_parfumeur",
+}
+
+def vue_explorer():
     col1, col2 = st.columns([3, 1])
 
-    ing_terms_all = build_term_stats(df, "Ingredients_txt")["Terme"].tolist() if not df.empty else []
-    con_terms_all = build_term_stats(df, "Concepts_txt")["Terme"].tolist() if not df.empty else []
+    ing_terms_all = catalogue.terms("Ingredients_txt")
+    con_terms_all = catalogue.terms("Concepts_txt")
 
     with col2:
         st.subheader("Filtres")
         with st.container(border=True):
-            prix = st.selectbox("Catégorie de prix", options(df, "Prix_Categorie"))
-            marque = st.selectbox("Marque", options(df, "Marque"))
-            famille = st.selectbox("Famille", options(df, "Famille"))
-            sous_famille = st.selectbox("Sous_famille", options(df, "Sous_famille"))
-            origine = st.selectbox("Origine", options(df, "Origine"))
-            genre = st.selectbox("Genre", options(df, "Genre"))
-            parfumeur = st.selectbox("Parfumeur", options(df, "Parfumeur"))
-            
-            annee_min, annee_max = (1900, 2100)
-            if "Année" in df.columns:
-                annee_min, annee_max = int(df["Année"].min()), int(df["Année"].max())
-            annee_range = st.slider("Année", annee_min, annee_max, (annee_min, annee_max))
-            
-            ingredients_pick = st.multiselect(
+            search_index = catalogue.search
+            recherche = st.text_input("Recherche", key="explore_q", placeholder="Parfum, marque, parfumeur, ingrédient…")
+            suggestions = search_index.suggest(recherche) if recherche.strip() else []
+            if suggestions:
+                st.caption("Suggestions : " + " · ".join(suggestions))
+            meta = catalogue.meta
+            annee_min, annee_max = meta.annees()
+
+            # Les comptes par facette s'affichent dans les listes : ils sont calculés à partir
+            # de l'état de session, avant la création des widgets
+            sous_famille_opts = catalogue.options_dependantes(
+                "Sous_famille", {"Famille": st.session_state.get("explore_famille", "Tous")}
+            )
+            if st.session_state.get("explore_sous_famille", "Tous") not in sous_famille_opts:
+                st.session_state["explore_sous_famille"] = "Tous"
+            filters = {col: st.session_state.get(key, "Tous") for col, key in EXPLORE_FILTERS.items()}
+            annee_range = st.session_state.get("explore_annees", (annee_min, annee_max))
+            ingredients_pick = st.session_state.get("explore_ingredients", [])
+            concepts_pick = st.session_state.get("explore_concepts", [])
+            terms_mode = st.session_state.get("explore_terms_mode", "Tous les termes")
+            mode = "or" if terms_mode == "Au moins un terme" else "and"
+
+            resultat = facettes(
+                catalogue, filters, recherche, annees=annee_range,
+                termes={"Ingredients_txt": ingredients_pick, "Concepts_txt": concepts_pick}, mode=mode,
+            )
+
+            for label, col in [
+                ("Catégorie de prix", "Prix_Categorie"), ("Marque", "Marque"), ("Famille", "Famille"),
+                ("Sous_famille", "Sous_famille"), ("Origine", "Origine"), ("Genre", "Genre"), ("Parfumeur", "Parfumeur"),
+            ]:
+                opts = sous_famille_opts if col == "Sous_famille" else meta.options(col)
+                st.selectbox(label, opts, key=EXPLORE_FILTERS[col], format_func=resultat.libelle(col))
+
+            st.slider("Année", annee_min, annee_max, (annee_min, annee_max), key="explore_annees")
+
+            st.multiselect(
                 "Ingrédients",
-                options=ing_terms_all
+                options=ing_terms_all,
+                key="explore_ingredients",
+                format_func=resultat.libelle("Ingredients_txt"),
             )
-            concepts_pick = st.multiselect(
+            st.multiselect(
                 "Concepts",
-                options=con_terms_all
+                options=con_terms_all,
+                key="explore_concepts",
+                format_func=resultat.libelle("Concepts_txt"),
+            )
+            st.radio(
+                "Correspondance des termes",
+                ["Tous les termes", "Au moins un terme"],
+                horizontal=True,
+                key="explore_terms_mode",
             )
 
     # Résultats
     with col1:
-        filters = {
-            "Prix_Categorie": prix, "Marque": marque, "Famille": famille,
-            "Sous_famille": sous_famille, "Origine": origine, "Genre": genre, "Parfumeur": parfumeur
-        }
-        df_f = filter_df(df, filters)
-        if "Année" in df_f.columns:
-            df_f = df_f[(df_f["Année"] >= annee_range[0]) & (df_f["Année"] <= annee_range[1])]
-
-        df_f = filter_by_terms(df_f, "Ingredients_txt", ingredients_pick)
-        df_f = filter_by_terms(df_f, "Concepts_txt", concepts_pick)
+        # Positions des lignes retenues : aucune copie du DataFrame avant l'extraction de la page
+        rows = resultat.rows
 
-        st.info(f"✨ **{len(df_f)}** parfums trouvés")
-        
-        limit = min(50, len(df_f))
+        st.info(f"✨ **{len(rows)}** parfums trouvés")
         
         c_view, c_sort, c_limit = st.columns([2, 2, 3])
         with c_view: 
             view_mode = st.radio("Vue", ["Cartes", "Tableau"], horizontal=True)
         with c_sort: 
-            sort_by = st.selectbox("Trier par", ["Années (récent)", "Marques (A-Z)"])
+            sort_choices = ["Années (récent)", "Marques (A-Z)"]
+            if recherche.strip():
+                sort_choices = ["Pertinence"] + sort_choices
+            sort_by = st.selectbox("Trier par", sort_choices)
         with c_limit: 
-            if limit > 0:
-                if limit >= 5:
-                    max_cards = st.slider("Nombre de parfums", 5, limit, 5)
-                else:
-                    max_cards = st.slider("Nombre de parfums", 1, limit, limit)
-            else:
-                st.caption("Aucun résultat")
-                max_cards = 0
+            page_size = st.select_slider("Parfums par page", PAGE_SIZES, value=PAGE_SIZES[0])
 
-        if sort_by == "Années (récent)" and "Année" in df_f.columns:
-            df_f = df_f.sort_values("Année", ascending=False)
-        elif sort_by == "Marques (A-Z)" and "Marque" in df_f.columns:
-            df_f = df_f.sort_values("Marque", ascending=True)
+        if sort_by == "Pertinence":
+            rows = search_index.search(recherche, rows=rows)
+        elif sort_by == "Années (récent)" and "Année" in catalogue.ordres:
+            rows = sort_rows(rows, catalogue.ordres["Année"])
+        elif sort_by == "Marques (A-Z)" and "Marque" in catalogue.ordres:
+            rows = sort_rows(rows, catalogue.ordres["Marque"])
 
         st.divider()
 
-        if len(df_f) == 0:
+        if len(rows) == 0:
             st.warning("Aucun résultat ne correspond à votre recherche.")
-        elif view_mode == "Tableau":
-            st.dataframe(df_f.head(max_cards), use_container_width=True, height=600)
         else:
-            if limit == 0:
-                st.warning("Aucun résultat à afficher.")
-            elif limit == 1:
-                pretty_cards(df_f, max_cards=1)
+            signature = (recherche, tuple(filters.values()), annee_range, tuple(ingredients_pick),
+                         tuple(concepts_pick), terms_mode, sort_by)
+            start, stop = pagination(len(rows), page_size, key="explore_page", signature=signature)
+            if view_mode == "Tableau":
+                t0 = time.perf_counter()
+                show_perfumes_table(page(df, rows, start, stop, TABLE_COLS), height=600)
+                rendu_ms = (time.perf_counter() - t0) * 1000
             else:
-                pretty_cards(df_f, max_cards=max_cards)
+                rendu_ms = pretty_cards(page(df, rows, start, stop, CARD_COLS), max_cards=page_size)
+            st.caption(f"⏱️ Rendu de la page : {rendu_ms:.1f} ms — explorateur prêt en {(time.perf_counter() - t_script) * 1000:.0f} ms")
 
     
 #------------------------------------------------------------------------------------------------------------------------------------------
-# TAB 2 : Prédire (ML)
+# VUE 2 : Prédire (ML)
 
-with tab2:
-    sub1, sub2 = st.tabs(["Prédire", "Comparer"])
-    # Sous-onglet 1 : Prédire
-    with sub1:
+def vue_predire():
+    sous_vue = choisir_vue(["Prédire", "Comparer", "Positionnement"], key="vue_ml", label="Mode")
+    # Sous-vue 1 : Prédire
+    if sous_vue == "Prédire":
         st.subheader("Prédire une catégorie de prix")
 
-        model = load_model(MODEL_PATH)
+        model = load_model(MODEL_PATH, dataset_version(MODEL_PATH))
 
         if model is None:
             st.error("Le modèle n'a pas pu être chargé. Vérifie le fichier .pkl et les versions (numpy/sklearn).")
-            st.stop()
+            return
 
         if "ml_pred" not in st.session_state:
             st.session_state["ml_pred"] = None
@@ -195,51 +244,39 @@ with tab2:
         c1, c2, c3 = st.columns(3)
 
         with c1:
-            famille = st.selectbox("Famille", opts_no_all(df, "Famille"), index=0, key="pred_famille")
-            sous_famille = st.selectbox("Sous_famille", opts_no_all(df, "Sous_famille"), index=0, key="pred_sous_famille")
-            parfumeur = st.selectbox("Parfumeur", opts_no_all(df, "Parfumeur"), index=0, key="pred_parfumeur")
+            famille = st.selectbox("Famille", catalogue.meta.opts_no_all("Famille"), index=0, key="pred_famille")
+            sous_famille = st.selectbox(
+                "Sous_famille",
+                catalogue.options_dependantes("Sous_famille", {"Famille": famille}, tous=False),
+                index=0,
+                key="pred_sous_famille",
+            )
+            parfumeur = st.selectbox("Parfumeur", catalogue.meta.opts_no_all("Parfumeur"), index=0, key="pred_parfumeur")
 
         with c2:
-            origine = st.selectbox("Origine", opts_no_all(df, "Origine"), index=0, key="pred_origine")
-            genre = st.selectbox("Genre", opts_no_all(df, "Genre"), index=0, key="pred_genre")
+            origine = st.selectbox("Origine", catalogue.meta.opts_no_all("Origine"), index=0, key="pred_origine")
+            genre = st.selectbox("Genre", catalogue.meta.opts_no_all("Genre"), index=0, key="pred_genre")
 
             if "Année" in df.columns:
-                annee = st.selectbox("Année", opts_no_all(df, "Année"), index=0, key="pred_annee")
+                annee = st.selectbox("Année", catalogue.meta.opts_no_all("Année"), index=0, key="pred_annee")
             else:
                 annee = 0
                 st.info("Colonne Année indisponible dans la base.")
 
         with c3:
-            ing_terms_all = build_term_stats(df, "Ingredients_txt")["Terme"].tolist() if not df.empty else []
-            con_terms_all = build_term_stats(df, "Concepts_txt")["Terme"].tolist() if not df.empty else []
+            ing_terms_all = catalogue.terms("Ingredients_txt")
+            con_terms_all = catalogue.terms("Concepts_txt")
 
             ingredients = st.multiselect("Sélectionner des ingrédients", options=ing_terms_all, key="pred_ingredients")
             concepts = st.multiselect("Sélectionner des concepts", options=con_terms_all, key="pred_concepts")
 
             if st.button("Prédire", type="primary", key="pred_button"):
-                X_new = pd.DataFrame([{
-                    "Famille": famille,
-                    "Sous_famille": sous_famille,
-                    "Parfumeur": parfumeur,
-                    "Origine": origine,
-                    "Genre": genre,
-                    "Année": int(annee) if str(annee).isdigit() else 0,
-                    "Ingredients_txt": (" ".join(ingredients) if ingredients else "").strip().lower(),
-                    "Concepts_txt": (" ".join(concepts) if concepts else "").strip().lower(),
-                }])
-
-                st.session_state["ml_pred"] = model.predict(X_new)[0]
-
-                proba_df = None
-                if hasattr(model, "predict_proba"):
-                    proba = model.predict_proba(X_new)[0]
-                    classes = list(getattr(model, "classes_", []))
-                    if classes:
-                        proba_df = (
-                            pd.DataFrame({"Classe": classes, "Probabilité": proba})
-                            .sort_values("Probabilité", ascending=False)
-                        )
-                st.session_state["ml_proba_df"] = proba_df
+                pred_cache = load_prediction_cache(MODEL_PATH, dataset_version(MODEL_PATH))
+                pred = pred_cache.predict(
+                    cle_prediction(famille, sous_famille, parfumeur, origine, genre, annee, ingredients, concepts)
+                )
+                st.session_state["ml_pred"] = pred.label
+                st.session_state["ml_proba_df"] = pred.proba_df()
 
         st.divider()
         st.markdown("### Résultat")
@@ -250,19 +287,71 @@ with tab2:
             proba_df = st.session_state.get("ml_proba_df")
             if isinstance(proba_df, pd.DataFrame) and not proba_df.empty:
                 st.dataframe(proba_df, use_container_width=True)
+            cache_stats = load_prediction_cache(MODEL_PATH, dataset_version(MODEL_PATH)).stats()
+            st.caption(
+                f"Cache de prédiction : {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                f"({cache_stats['taille']} combinaisons mémorisées)"
+            )
+
+    # Sous-vue 3 : Positionnement (tout le catalogue, probabilités hors échantillon)
+    elif sous_vue == "Positionnement":
+        st.subheader("Parfums sur- ou sous-positionnés en prix")
+
+        table = load_positionnement(POSITIONNEMENT_PATH)
+        if table is None:
+            st.info(
+                "Tableau non calculé : lancer `python -m src.Machine_learning.Positionnement` "
+                "(probabilités hors échantillon sur tout le catalogue)."
+            )
+            return
+
+        st.caption(
+            "Chaque parfum est évalué par un modèle entraîné sans lui (validation croisée). "
+            "Écart = rang de prix réel − rang attendu (0 = Mass Market, 2 = Niche) : "
+            "positif, le parfum est plus cher que ce que prédisent ses caractéristiques."
+        )
+        comptes = table["Positionnement"].value_counts()
+        k1, k2, k3 = st.columns(3)
+        with k1:
+            st.metric("Surpositionnés", int(comptes.get("Surpositionné", 0)))
+        with k2:
+            st.metric("Sous-positionnés", int(comptes.get("Sous-positionné", 0)))
+        with k3:
+            st.metric("Cohérents", int(comptes.get("Cohérent", 0)))
+
+        types = st.multiselect(
+            "Positionnement",
+            ["Surpositionné", "Sous-positionné", "Cohérent"],
+            default=["Surpositionné", "Sous-positionné"],
+            key="positionnement_types",
+        )
+        vue_table = table[table["Positionnement"].isin(types)]
+        st.dataframe(
+            vue_table,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Prix_Categorie": st.column_config.TextColumn("Prix réel"),
+                "Proba_reelle": st.column_config.ProgressColumn("P(prix réel)", min_value=0.0, max_value=1.0, format="%.2f"),
+                "Proba_predite": st.column_config.ProgressColumn("P(prédiction)", min_value=0.0, max_value=1.0, format="%.2f"),
+                "Marge": st.column_config.NumberColumn("Marge", format="%.2f"),
+                "Rang_attendu": st.column_config.NumberColumn("Rang attendu", format="%.2f"),
+                "Ecart": st.column_config.NumberColumn("Écart", format="%+.2f"),
+            },
+        )
 
-    # Sous-onglet 2 : Comparer (réel vs ML)
-    with sub2:
+    # Sous-vue 2 : Comparer (réel vs ML)
+    else:
         st.subheader("Comparer la catégorie de prix : réelle vs prédite")
 
-        model = load_model(MODEL_PATH)
+        model = load_model(MODEL_PATH, dataset_version(MODEL_PATH))
         if model is None:
             st.error("Le modèle n'a pas pu être chargé. Vérifie le fichier .pkl et les versions (numpy/sklearn).")
-            st.stop()
+            return
 
         if "Fragrance" not in df.columns or "Prix_Categorie" not in df.columns:
             st.info("Comparaison impossible : colonnes manquantes (Fragrance / Prix_Categorie).")
-            st.stop()
+            return
 
         df_cmp = df.copy()
         df_cmp["Label"] = df_cmp["Marque"].astype(str) + " — " + df_cmp["Fragrance"].astype(str)
@@ -273,7 +362,8 @@ with tab2:
             key="compare_perfume_select",
         )
 
-        row = df_cmp[df_cmp["Label"] == label_pick].iloc[0]
+        position = int((df_cmp["Label"] == label_pick).to_numpy().argmax())
+        row = df_cmp.iloc[position]
 
         y_true = row["Prix_Categorie"]
 
@@ -288,7 +378,8 @@ with tab2:
             "Concepts_txt": str(row.get("Concepts_txt", "")).strip().lower(),
         }])
 
-        y_pred = model.predict(X_row)[0]
+        pred_row = predire(model, X_row)
+        y_pred = pred_row.label
 
         k1, k2, k3 = st.columns(3)
         with k1:
@@ -298,27 +389,66 @@ with tab2:
         with k3:
             st.metric("Match ?", "✅ Oui" if str(y_true) == str(y_pred) else "❌ Non")
 
-        if hasattr(model, "predict_proba"):
-            proba = model.predict_proba(X_row)[0]
-            classes = list(getattr(model, "classes_", []))
-            if classes:
-                proba_df2 = (
-                    pd.DataFrame({"Classe": classes, "Probabilité": proba})
-                    .sort_values("Probabilité", ascending=False)
-                )
-                st.dataframe(proba_df2, use_container_width=True)
+        proba_df2 = pred_row.proba_df()
+        if proba_df2 is not None:
+            st.dataframe(proba_df2, use_container_width=True)
+
+        st.markdown("#### Ce qui pèse sur la prédiction")
+        contributions = load_contributions(CONTRIBUTIONS_PATH, catalogue.version, dataset_version(MODEL_PATH))
+        if contributions is None:
+            st.caption("Contributions non calculées pour ce modèle : lancer `python -m src.Machine_learning.Contributions`.")
+        else:
+            classes_contrib = contributions.classes.tolist()
+            classe = st.segmented_control(
+                "Vers la classe",
+                classes_contrib,
+                default=str(y_pred) if str(y_pred) in classes_contrib else classes_contrib[0],
+                key="compare_contrib_classe",
+            ) or str(y_pred)
+            df_contrib = contributions.pour(position, classe)
+            st.caption(
+                "Contributions des variables au score du modèle pour cette classe (chemins des arbres) : "
+                "positives, elles poussent vers la classe ; négatives, elles l'en éloignent."
+            )
+            st.bar_chart(df_contrib.iloc[::-1], x="Variable", y="Contribution", horizontal=True, sort=False, height=320)
+
+        st.markdown("#### Parfums les plus proches")
+        k_voisins = st.slider("Nombre de parfums proches", 5, 30, 10, key="compare_k")
+        index_lsh = load_lsh(LSH_DIR, catalogue.version)
+        approche = index_lsh is not None and st.toggle(
+            "Recherche approchée (index LSH)", value=len(df) >= SEUIL_LSH, key="compare_lsh"
+        )
+        if approche:
+            voisins, similarites = index_lsh.voisins(position, k=k_voisins, sondes=1)
+        else:
+            voisins, similarites = load_similarite(DATA_PATH).voisins(position, k=k_voisins)
+        df_voisins = df.iloc[voisins][["Fragrance", "Marque", "Prix_Categorie", "Famille", "Sous_famille", "Genre"]].copy()
+        df_voisins.insert(0, "Similarité", similarites)
+        st.caption(
+            "Similarité cosinus sur les ingrédients, les concepts (TF-IDF) et Famille / Sous-famille / Genre. "
+            f"Catégories de prix des voisins : {', '.join(f'{k} ({v})' for k, v in df_voisins['Prix_Categorie'].value_counts().items())}"
+        )
+        st.dataframe(
+            df_voisins,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Similarité": st.column_config.ProgressColumn("Similarité", min_value=0.0, max_value=1.0, format="%.2f"),
+                "Prix_Categorie": st.column_config.TextColumn("Prix"),
+            },
+        )
 
 
 #------------------------------------------------------------------------------------------------------------------------------------------
 
 
-# TAB 3 : Ingrédients & Concepts
-with tab3:
+# VUE 3 : Ingrédients & Concepts
+def vue_termes():
     st.subheader("Lister les ingrédients et concepts")
 
 
-    ing_stats = build_term_stats(df, "Ingredients_txt")
-    con_stats = build_term_stats(df, "Concepts_txt")
+    ing_stats = catalogue.term_stats["Ingredients_txt"]
+    con_stats = catalogue.term_stats["Concepts_txt"]
 
     k1, k2, k3, k4 = st.columns(4)
     with k1:
@@ -375,22 +505,45 @@ with tab3:
             con_view = con_view.sort_values(["Parfums", "Occurrences", "Terme"], ascending=[False, False, True])
         show_terms_table(con_view.head(con_top), height=520)
 
+    st.divider()
+    st.markdown("### Associations")
+    st.caption("Lift > 1 : termes présents ensemble plus souvent que par hasard (au moins 5 parfums en commun).")
+
+    a1, a2 = st.columns(2)
+    with a1:
+        assoc_type = st.segmented_control("Termes", ["Ingrédients", "Concepts"], default="Ingrédients", key="assoc_type")
+    assoc_col = "Concepts_txt" if assoc_type == "Concepts" else "Ingredients_txt"
+    associations = catalogue.associations[assoc_col]
+    with a2:
+        assoc_segment = st.selectbox("Catégorie de prix", list(associations), key="assoc_segment")
+    assoc = associations[assoc_segment]
+
+    c_voisins, c_paires = st.columns(2)
+    with c_voisins:
+        termes = catalogue.terms(assoc_col)
+        assoc_terme = st.selectbox("Va bien avec…", termes, key="assoc_terme") if termes else None
+        if assoc_terme:
+            show_associations_table(assoc.voisins(assoc_terme))
+    with c_paires:
+        st.markdown(f"**Meilleures associations — {assoc_segment}**")
+        show_associations_table(assoc.paires(n=50))
+
 
 #------------------------------------------------------------------------------------------------------------------------------------------
 
 
-# TAB 4 : Stats
-with tab4:
+# VUE 4 : Stats
+def vue_stats():
     st.subheader("Statistiques du catalogue")
 
 
     c_f1, c_f2, c_f3, c_f4 = st.columns([2, 2, 2, 3])
     with c_f1:
-        stats_prix = st.selectbox("Filtrer par catégorie de prix", options(df, "Prix_Categorie"), key="stats_prix")
+        stats_prix = st.selectbox("Filtrer par catégorie de prix", catalogue.meta.options("Prix_Categorie"), key="stats_prix")
     with c_f2:
-        stats_genre = st.selectbox("Filtrer par genre", options(df, "Genre"), key="stats_genre")
+        stats_genre = st.selectbox("Filtrer par genre", catalogue.meta.options("Genre"), key="stats_genre")
     with c_f3:
-        stats_origine = st.selectbox("Filtrer par origine", options(df, "Origine"), key="stats_origine")
+        stats_origine = st.selectbox("Filtrer par origine", catalogue.meta.options("Origine"), key="stats_origine")
     with c_f4:
         top_n = st.slider("Top N (catégories)", 5, 15, 10, key="stats_top_n")
 
@@ -407,31 +560,33 @@ with tab4:
         key="stats_view",
     )
 
-    df_stats = filter_df(
-        df,
-        {
-            "Prix_Categorie": stats_prix,
-            "Genre": stats_genre,
-            "Origine": stats_origine,
-        },
-    )
+    stats_filters = {
+        "Prix_Categorie": stats_prix,
+        "Genre": stats_genre,
+        "Origine": stats_origine,
+    }
+    vue_stats = catalogue.vue(stats_filters)
+    years_vue = catalogue.engine.years[vue_stats.rows(catalogue)] if catalogue.engine.years is not None else None
 
-    if "Année" in df_stats.columns:
-        a_min, a_max = int(df_stats["Année"].min()), int(df_stats["Année"].max())
+    if years_vue is not None and years_vue.size:
+        a_min, a_max = int(years_vue.min()), int(years_vue.max())
         a_range = st.slider("Période", a_min, a_max, (a_min, a_max), key="stats_year_range")
-        df_stats = df_stats[(df_stats["Année"] >= a_range[0]) & (df_stats["Année"] <= a_range[1])]
+        vue_stats = catalogue.vue(stats_filters, a_range)
+
+    # Indicateurs et histogrammes depuis les agrégats de la vue (cube), sans extraire les lignes
+    kpi = indicateurs(catalogue, vue_stats)
 
     st.divider()
 
     k1, k2, k3, k4 = st.columns(4)
     with k1:
-        st.metric("Parfums", int(len(df_stats)))
+        st.metric("Parfums", kpi["Parfums"])
     with k2:
-        st.metric("Marques", int(df_stats["Marque"].nunique()) if "Marque" in df_stats.columns else 0)
+        st.metric("Marques", kpi["Marque"])
     with k3:
-        st.metric("Origines", int(df_stats["Origine"].nunique()) if "Origine" in df_stats.columns else 0)
+        st.metric("Origines", kpi["Origine"])
     with k4:
-        st.metric("Années", int(df_stats["Année"].nunique()) if "Année" in df_stats.columns else 0)
+        st.metric("Années", kpi["Année"])
 
 
     def _plot_bar(dist_df: pd.DataFrame, title: str):
@@ -472,94 +627,90 @@ with tab4:
         return 10
 
     if view == "Histogramme des années":
-        if "Année" not in df_stats.columns:
+        if "Année" not in catalogue.df.columns:
             st.info("Colonne Année indisponible.")
         else:
             color_opts = ["Aucun"]
             for c in ["Prix_Categorie", "Genre", "Origine", "Famille"]:
-                if c in df_stats.columns:
+                if c in catalogue.df.columns:
                     color_opts.append(c)
             c1, c2 = st.columns([2, 2])
             with c1:
                 color_by = st.selectbox("Colorer par", color_opts, key="stats_year_color")
 
-            if not _PLOTLY_OK:
-                y_df = yearly_counts(df_stats)
-                if y_df.empty:
-                    st.info("Pas de données année à afficher.")
-                else:
-                    st.line_chart(y_df.set_index("Année")["Count"], height=320)
+            y_df = yearly_counts(catalogue, vue_stats)
+            if y_df.empty:
+                st.info("Pas de données année à afficher.")
+            elif not _PLOTLY_OK:
+                st.line_chart(y_df.set_index("Année")["Count"], height=320)
             else:
-                df_stats_plot = df_stats.copy()
-                df_stats_plot["Année"] = pd.to_numeric(df_stats_plot["Année"], errors="coerce")
-                df_stats_plot = df_stats_plot.dropna(subset=["Année"])  # évite les ticks bizarres
-                df_stats_plot["Année"] = df_stats_plot["Année"].astype(int)
+                # Comptes par (année[, couleur]) : l'histogramme somme les comptes dans chaque classe
+                if color_by == "Aucun":
+                    hist_df = y_df
+                else:
+                    croise = price_by_year(catalogue, vue_stats, price_col=color_by)
+                    hist_df = croise.stack().rename("Count").reset_index() if not croise.empty else y_df
+                    hist_df = hist_df[hist_df["Count"] > 0]
 
                 fig = px.histogram(
-                    df_stats_plot,
+                    hist_df,
                     x="Année",
-                    color=None if color_by == "Aucun" else color_by,
+                    y="Count",
+                    histfunc="sum",
+                    color=color_by if color_by in hist_df.columns else None,
                     nbins=10,
-                    marginal="box",
                     template=_PLOTLY_TEMPLATE,
                     color_discrete_sequence=_PLOTLY_COLORS,
                     title="Distribution des années",
                 )
-                if "Année" in df_stats_plot.columns and not df_stats_plot.empty:
-                    y_min = int(df_stats_plot["Année"].min())
-                    y_max = int(df_stats_plot["Année"].max())
-                    step = _year_tick_step(y_min, y_max)
-                    tickvals = list(range(y_min, y_max + 1, step))
-                    fig.update_xaxes(
-                        tickmode="array",
-                        tickvals=tickvals,
-                        ticktext=[str(v) for v in tickvals],
-                    )
-                fig.update_layout(height=520, margin=dict(l=10, r=10, t=60, b=10))
+                y_min, y_max = int(y_df["Année"].min()), int(y_df["Année"].max())
+                step = _year_tick_step(y_min, y_max)
+                tickvals = list(range(y_min, y_max + 1, step))
+                fig.update_xaxes(
+                    tickmode="array",
+                    tickvals=tickvals,
+                    ticktext=[str(v) for v in tickvals],
+                )
+                fig.update_layout(height=520, margin=dict(l=10, r=10, t=60, b=10), yaxis_title="Parfums")
                 st.plotly_chart(fig, use_container_width=True, config={"displaylogo": False})
 
-                py = price_by_year(df_stats)
+                py = price_by_year(catalogue, vue_stats)
                 if isinstance(py, pd.DataFrame) and not py.empty:
                     fig2 = px.area(
                         py, template=_PLOTLY_TEMPLATE, 
                         color_discrete_sequence=_PLOTLY_COLORS,
                         title="Catégories de prix par année",)
-                    if "Année" in df_stats.columns and not df_stats.empty:
-                        y_min = int(pd.to_numeric(df_stats["Année"], errors="coerce").dropna().min())
-                        y_max = int(pd.to_numeric(df_stats["Année"], errors="coerce").dropna().max())
-                        step = _year_tick_step(y_min, y_max)
-                        tickvals = list(range(y_min, y_max + 1, step))
-                        fig2.update_xaxes(
-                            tickmode="array",
-                            tickvals=tickvals,
-                            ticktext=[str(v) for v in tickvals],
-                        )
+                    fig2.update_xaxes(
+                        tickmode="array",
+                        tickvals=tickvals,
+                        ticktext=[str(v) for v in tickvals],
+                    )
                     fig2.update_layout(height=420, margin=dict(l=10, r=10, t=30, b=10))
                     st.plotly_chart(fig2, use_container_width=True, config={"displaylogo": False})
 
     elif view == "Répartition des prix":
-        dist = distribution(df_stats, "Prix_Categorie", top_n=top_n).df
+        dist = distribution(catalogue, vue_stats, "Prix_Categorie", top_n=top_n).df
         if dist.empty:
             st.info("Colonne Prix_Categorie indisponible.")
         else:
             _plot_bar(dist, "Répartition des catégories de prix")
 
     elif view == "Genre":
-        dist = distribution(df_stats, "Genre", top_n=top_n).df
+        dist = distribution(catalogue, vue_stats, "Genre", top_n=top_n).df
         if dist.empty:
             st.info("Colonne Genre indisponible.")
         else:
             _plot_bar(dist, "Répartition par genre")
 
     elif view == "Famille":
-        dist = distribution(df_stats, "Famille", top_n=top_n).df
+        dist = distribution(catalogue, vue_stats, "Famille", top_n=top_n).df
         if dist.empty:
             st.info("Colonne Famille indisponible.")
         else:
             _plot_bar(dist, "Répartition par famille")
 
     elif view == "Sous-famille":
-        dist = distribution(df_stats, "Sous_famille", top_n=top_n).df
+        dist = distribution(catalogue, vue_stats, "Sous_famille", top_n=top_n).df
         if dist.empty:
             st.info("Colonne Sous_famille indisponible.")
         else:
@@ -567,14 +718,14 @@ with tab4:
 
     else:  # Origine
         st.markdown("### Origine")
-        origine_dist = distribution(df_stats, "Origine", top_n=top_n).df
+        origine_dist = distribution(catalogue, vue_stats, "Origine", top_n=top_n).df
         if origine_dist.empty:
             st.info("Colonne Origine indisponible.")
         else:
             _plot_bar(origine_dist, "Top origines")
             showed_choro = False
             if _PLOTLY_OK:
-                ch = origins_choropleth(df_stats, top_n=30)
+                ch = origins_choropleth(catalogue, vue_stats, top_n=30)
                 if ch is not None and not ch.empty:
                     figm = px.choropleth(
                         ch,
@@ -609,7 +760,7 @@ with tab4:
                     )
 
             if (not _PLOTLY_OK) or (not showed_choro):
-                geo = origins_geo(df_stats, top_n=top_n)
+                geo = origins_geo(catalogue, vue_stats, top_n=top_n)
                 if geo.empty:
                     st.info(
                         "Aucune origine n'a pu être placée sur la carte (libellés non reconnus). "
@@ -622,9 +773,9 @@ with tab4:
 #------------------------------------------------------------------------------------------------------------------------------------------
 
 
-# TAB 5 : Présentation
+# VUE 5 : Présentation
 
-with tab5:
+def vue_presentation():
         st.markdown(
                 """
 <div class="presentation-hero">
@@ -738,6 +889,11 @@ with tab5:
                         unsafe_allow_html=True,
                 )
 
+with zone_vue:
+    vue_fonctions = dict(zip(VUES, [vue_presentation, vue_explorer, vue_predire, vue_termes, vue_stats]))
+    executer_vue(vue_active, vue_fonctions[vue_active])
+chrono_vues(VUES, vue_active, (time.perf_counter() - t_script) * 1000)
+
 st.divider()
 with st.container():
         st.warning(
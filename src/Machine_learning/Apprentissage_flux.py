@@ -0,0 +1,56 @@
+"""
+Ce fichier entraîne le modèle de catégorie de prix en flux, pour les catalogues qui ne tiennent pas en mémoire : le catalogue
+nettoyé est lu en Parquet un groupe de lignes à la fois, les variables sont hachées (sans vocabulaire) et un SGDClassifier
+est entraîné bloc par bloc (partial_fit). Le débit (lignes/s) et le F1 macro sur le jeu de test de Model_GB.py sont
+affichés, comparés au GradientBoosting entraîné en mémoire s'il est disponible.
+
+Exemple : python -m src.Machine_learning.Apprentissage_flux --epoques 3 --sortie src/Machine_learning/model_flux.pkl
+"""
+
+import argparse
+import resource
+from pathlib import Path
+
+import joblib
+
+from src.Machine_learning.module.apprentissage_flux import PARQUET_PATH, csv_vers_parquet, entrainer_flux, evaluer_flux, modele_flux
+from src.Machine_learning.module.pretraitement import MODEL_PATH
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entraînement en flux (Parquet par groupes de lignes, hachage, SGD).")
+    parser.add_argument("--parquet", default=str(PARQUET_PATH), help="Catalogue nettoyé (.parquet, créé depuis le CSV s'il manque)")
+    parser.add_argument("--epoques", type=int, default=3, help="Nombre de passes sur le fichier")
+    parser.add_argument("--alpha", type=float, default=1e-5, help="Régularisation du SGDClassifier")
+    parser.add_argument("--sortie", default=None, help="Fichier du modèle entraîné (.pkl)")
+    parser.add_argument("--reference", default=str(MODEL_PATH), help="Modèle en mémoire comparé (GradientBoosting)")
+    args = parser.parse_args()
+
+    parquet = Path(args.parquet)
+    if not parquet.exists():
+        csv_vers_parquet(parquet_path=parquet)
+        print(f"Catalogue converti en Parquet : {parquet}")
+
+    model, bilan = entrainer_flux(parquet, modele_flux(alpha=args.alpha), epoques=args.epoques)
+    print(
+        f"Entraînement : {bilan['lignes']} lignes ({bilan['epoques']} passes, {bilan['blocs']} blocs) en {bilan['duree_s']:.2f} s, "
+        f"{bilan['lignes_par_s']:,.0f} lignes/s"
+    )
+
+    modeles = {"SGD en flux": model}
+    if Path(args.reference).exists():
+        modeles["GradientBoosting en mémoire"] = joblib.load(args.reference)
+    for nom, mesures in evaluer_flux(parquet, modeles).items():
+        print(f"{nom} : F1 macro {mesures['f1_macro']:.4f} ({mesures['lignes']} parfums de test, {mesures['lignes_par_s']:,.0f} lignes/s)")
+    print(f"Mémoire maximale du processus : {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} Mo")
+
+    if args.sortie:
+        joblib.dump(model, args.sortie)
+        print(f"Modèle enregistré dans {args.sortie}")
+
+
+#-----------------------------------------------------------------------------------------------------------------------
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Ce fichier compare les familles de modèles (GradientBoosting, HistGradientBoosting, régression logistique, SVM linéaire,
+forêt aléatoire) sur les mêmes variables et les mêmes plis de validation croisée, en parallèle, et affiche le tableau
+F1 macro / temps d'entraînement / latence de prédiction / taille qui justifie le choix du modèle de Model_GB.py.
+
+Exemple : python -m src.Machine_learning.Comparaison_modeles --plis 5 --jobs -1 --sortie data/comparaison_modeles.csv
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from src.Machine_learning.module.benchmark import MODELES, comparer
+from src.Machine_learning.module.pretraitement import CSV_PATH, prepare_X, prepare_y
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare les modèles de catégorie de prix sur des plis identiques.")
+    parser.add_argument("--modeles", nargs="+", default=list(MODELES), choices=list(MODELES))
+    parser.add_argument("--plis", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=-1, help="Nombre de processus (-1 = tous les cœurs)")
+    parser.add_argument("--sortie", default=None, help="Fichier CSV du tableau récapitulatif")
+    args = parser.parse_args()
+
+    df = pd.read_csv(CSV_PATH, encoding="utf-8")
+
+    # Préprocesseur entraîné sur chaque pli (matrices mises en cache par pli)
+    t0 = time.perf_counter()
+    resume, _ = comparer(prepare_X(df), prepare_y(df), modeles=args.modeles, n_splits=args.plis, n_jobs=args.jobs)
+    print(f"{len(args.modeles)} modèles x {args.plis} plis en {time.perf_counter() - t0:.1f} s")
+    print(resume.round(4).to_string(index=False))
+    if args.sortie:
+        resume.to_csv(args.sortie, index=False, encoding="utf-8")
+        print(f"Tableau enregistré dans {args.sortie}")
+
+
+#-----------------------------------------------------------------------------------------------------------------------
+
+
+if __name__ == "__main__":
+    main()
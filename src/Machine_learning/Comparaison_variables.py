@@ -0,0 +1,42 @@
+"""
+Ce fichier compare les modes d'extraction des variables texte (TF-IDF à vocabulaire appris, hashing à dimension fixe,
+élagage du vocabulaire par chi², float32) avec le GradientBoosting : F1 macro, mémoire de la matrice, taille du modèle
+et latence d'une prédiction unitaire. Le mode retenu se passe ensuite à Model_GB.py (--variables, --float32).
+
+Exemple : python -m src.Machine_learning.Comparaison_variables --jobs -1
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from src.Machine_learning.module.benchmark import comparer_variables
+from src.Machine_learning.module.pretraitement import CSV_PATH, prepare_X, prepare_y
+from src.Machine_learning.module.reentrainement import split_stable
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare les modes d'extraction des variables texte.")
+    parser.add_argument("--jobs", type=int, default=-1, help="Nombre de processus (-1 = tous les cœurs)")
+    parser.add_argument("--sortie", default=None, help="Fichier CSV du tableau")
+    args = parser.parse_args()
+
+    df = pd.read_csv(CSV_PATH, encoding="utf-8")
+    X, y = prepare_X(df), prepare_y(df)
+    test = split_stable(df)
+
+    t0 = time.perf_counter()
+    tableau = comparer_variables(X[~test], y[~test], X[test], y[test], n_jobs=args.jobs)
+    print(f"{len(tableau)} modes en {time.perf_counter() - t0:.1f} s ({(~test).sum()} parfums d'entraînement, {test.sum()} de test)")
+    print(tableau.round(4).to_string(index=False))
+    if args.sortie:
+        tableau.to_csv(args.sortie, index=False, encoding="utf-8")
+        print(f"Tableau enregistré dans {args.sortie}")
+
+
+#-----------------------------------------------------------------------------------------------------------------------
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Ce fichier précalcule les contributions des variables (ingrédients, concepts, catégories) aux prédictions
+du modèle pour tout le catalogue, et les enregistre (top-k par parfum et par classe) dans data/contributions.npz,
+lu par la vue Comparer de l'application.
+
+Exemple : python -m src.Machine_learning.Contributions --k 10
+"""
+
+import argparse
+import time
+
+import joblib
+import pandas as pd
+
+from src.Machine_learning.module.contributions import Contributions
+from src.Machine_learning.module.pretraitement import CSV_PATH, DATA_DIR, MODEL_PATH, prepare_X
+from src.app.module.fonction_catalogue import dataset_version
+
+CONTRIBUTIONS_PATH = DATA_DIR / "contributions.npz"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Précalcule les contributions des variables aux prédictions du catalogue.")
+    parser.add_argument("--k", type=int, default=10, help="Contributions gardées par parfum et par classe")
+    parser.add_argument("--taille-bloc", type=int, default=2000)
+    args = parser.parse_args()
+
+    df = pd.read_csv(CSV_PATH, encoding="utf-8")
+    model = joblib.load(MODEL_PATH)
+
+    t0 = time.perf_counter()
+    contributions = Contributions.depuis_modele(
+        model, prepare_X(df), k=args.k, taille_bloc=args.taille_bloc, version=dataset_version(CSV_PATH),
+        modele=dataset_version(MODEL_PATH),
+    )
+    contributions.sauver(CONTRIBUTIONS_PATH)
+    print(f"Contributions de {len(df)} parfums x {len(contributions.classes)} classes en {time.perf_counter() - t0:.1f} s")
+    print(f"Enregistrées dans {CONTRIBUTIONS_PATH} ({CONTRIBUTIONS_PATH.stat().st_size / 1024:.0f} Ko)")
+
+
+#-----------------------------------------------------------------------------------------------------------------------
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Ce fichier construit hors ligne l'index approché des parfums similaires (LSH), l'enregistre sur disque
+et mesure son rappel et sa latence par rapport à la recherche exacte.
+
+Exemple : python -m src.Machine_learning.Index_LSH --repeat 20 --tables 32 --bits 10
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.Machine_learning.module.lsh import IndexLSH, rappel
+from src.Machine_learning.module.pretraitement import CSV_PATH, DATA_DIR
+from src.Machine_learning.module.similarite import IndexSimilarite
+from src.app.module.fonction_catalogue import dataset_version
+
+LSH_DIR = DATA_DIR / "lsh"
+
+
+def agrandir(df: pd.DataFrame, repeat: int, taux_oubli: float = 0.3, seed: int = 0) -> pd.DataFrame:
+    """
+    Simule un grand catalogue : `repeat` copies du catalogue, chaque copie (sauf la première)
+    perdant au hasard une part des mots de ses ingrédients et concepts, pour éviter des
+    doublons exacts qui rendraient le rappel trivial.
+
+    :param df: Catalogue de départ
+    :param repeat: Nombre de copies
+    :param taux_oubli: Probabilité de retirer chaque mot
+    :return: Catalogue agrandi
+    :rtype: pd.DataFrame
+    """
+    rng = np.random.default_rng(seed)
+    copies = [df]
+    for _ in range(repeat - 1):
+        c = df.copy()
+        for col in ("Ingredients_txt", "Concepts_txt"):
+            c[col] = [
+                " ".join(w for w in str(t).split() if rng.random() >= taux_oubli) if isinstance(t, str) else t
+                for t in c[col]
+            ]
+        copies.append(c)
+    return pd.concat(copies, ignore_index=True)
+
+
+def benchmark(exact: IndexSimilarite, lsh: IndexLSH, n_requetes: int = 200, k: int = 10, seed: int = 0) -> pd.DataFrame:
+    """
+    Compare la recherche exacte et l'index LSH (avec et sans multi-probe) sur des requêtes tirées au hasard.
+
+    :param exact: Index exact
+    :param lsh: Index LSH construit sur les mêmes vecteurs
+    :param n_requetes: Nombre de parfums requêtes
+    :param k: Nombre de voisins
+    :return: Tableau méthode / rappel@k / latences p50, p95 (ms) / nb moyen de candidats
+    :rtype: pd.DataFrame
+    """
+    rng = np.random.default_rng(seed)
+    positions = rng.integers(0, exact.n_rows, n_requetes)
+    lignes = []
+    exacts = {}
+
+    temps = []
+    for p in positions:
+        t0 = time.perf_counter()
+        _, s = exact.voisins(int(p), k=k)
+        temps.append(time.perf_counter() - t0)
+        exacts[int(p)] = exact.scores(exact.X[int(p)])
+        exacts[int(p)][int(p)] = -np.inf
+    lignes.append({"Méthode": "Exacte", "Rappel@k": 1.0, "p50 (ms)": np.percentile(temps, 50) * 1000,
+                   "p95 (ms)": np.percentile(temps, 95) * 1000, "Candidats": float(exact.n_rows)})
+
+    for sondes in (0, 1):
+        temps, rappels, candidats = [], [], []
+        for p in positions:
+            t0 = time.perf_counter()
+            _, s = lsh.voisins(int(p), k=k, sondes=sondes)
+            temps.append(time.perf_counter() - t0)
+            rappels.append(rappel(exacts[int(p)], s, k))
+            candidats.append(len(lsh.candidats(lsh.X[int(p)], sondes=sondes)))
+        lignes.append({"Méthode": f"LSH (sondes={sondes})", "Rappel@k": float(np.mean(rappels)),
+                       "p50 (ms)": np.percentile(temps, 50) * 1000, "p95 (ms)": np.percentile(temps, 95) * 1000,
+                       "Candidats": float(np.mean(candidats))})
+    return pd.DataFrame(lignes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Construit et évalue l'index LSH des parfums similaires.")
+    parser.add_argument("--repeat", type=int, default=1, help="Copies bruitées du catalogue (simulation d'un grand catalogue, benchmark seulement)")
+    parser.add_argument("--tables", type=int, default=32)
+    parser.add_argument("--bits", type=int, default=10)
+    parser.add_argument("--requetes", type=int, default=200)
+    args = parser.parse_args()
+
+    df = pd.read_csv(CSV_PATH, encoding="utf-8")
+    if args.repeat > 1:
+        df = agrandir(df, args.repeat)
+
+    t0 = time.perf_counter()
+    exact = IndexSimilarite(df)
+    print(f"Vecteurs : {exact.X.shape[0]} x {exact.X.shape[1]} ({time.perf_counter() - t0:.1f} s)")
+
+    t0 = time.perf_counter()
+    lsh = IndexLSH.construire(exact.X, n_tables=args.tables, n_bits=args.bits,
+                              version=dataset_version(CSV_PATH) if args.repeat == 1 else "")
+    print(f"Index LSH : {args.tables} tables x {args.bits} bits ({time.perf_counter() - t0:.1f} s)")
+
+    # Seul l'index du vrai catalogue est enregistré (c'est lui que charge l'application)
+    if args.repeat == 1:
+        lsh.sauver(LSH_DIR)
+        lsh = IndexLSH.charger(LSH_DIR, mmap=True)
+        print(f"Index enregistré dans {LSH_DIR}")
+
+    print(benchmark(exact, lsh, n_requetes=args.requetes).round(3).to_string(index=False))
+
+
+#-----------------------------------------------------------------------------------------------------------------------
+
+
+if __name__ == "__main__":
+    main()
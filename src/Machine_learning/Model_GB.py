@@ -1,84 +1,157 @@
 """
 Ce fichier exécute l’entraînement, l’optimisation et la sauvegarde du modèle GradientBoostingClassifier, sélectionné comme meilleur modèle au regard des performances obtenues (F1 macro).
+Les hyperparamètres retenus et les mesures de référence sont enregistrés à côté du modèle (best_model.json) pour les réentraînements rapides (Reentrainement.py).
 """
 
 
+import argparse
+import warnings
+from pathlib import Path
+from typing import Optional
+
 import pandas as pd
 import numpy as np
 import joblib
+from joblib import Parallel, delayed
 
-from pathlib import Path
+from sklearn.base import clone
+from sklearn.exceptions import FitFailedWarning
+from sklearn.metrics import f1_score
 from sklearn.pipeline import Pipeline
-from sklearn.compose import ColumnTransformer
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.preprocessing import OneHotEncoder
 from sklearn.ensemble import GradientBoostingClassifier
-from sklearn.model_selection import  GridSearchCV, train_test_split
-from sklearn.metrics import f1_score
-from src.Scraping.Scraping_Data import ROOT
+from sklearn.model_selection import ParameterGrid, StratifiedKFold
+from src.Machine_learning.module.feature_store import FEATURES_DIR, materialiser_plis
+from src.Machine_learning.module.ordonnancement import BACKENDS, MesureCPU, Planification, contexte, garde_imbrication
+from src.Machine_learning.module.pretraitement import (
+    CSV_PATH,
+    K_CHI2,
+    MODEL_PATH,
+    MODES_TEXTE,
+    N_HASH,
+    build_preprocess,
+    prepare_X,
+    prepare_y,
+)
+from src.Machine_learning.module.reentrainement import construire_meta, sauver_meta, scores, split_stable
+from src.app.module.fonction_catalogue import dataset_version
+
+
+bost_grid = {
+"clf__n_estimators": np.arange(50, 250, 50),
+"clf__learning_rate": [0.1, 1, 0.1],
+"clf__max_depth": np.arange(2, 10, 1),
+"clf__subsample": np.arange(0.5, 1.0, 0.1),}
+
+
+def score_pli(clf, X, y: np.ndarray, train: np.ndarray, test: np.ndarray) -> float:
+    """
+    F1 macro d'un classifieur entraîné sur un pli (0 si l'entraînement échoue, comme `error_score=0.0`).
+
+    :param clf: Classifieur non entraîné
+    :param X: Matrice de variables du pli (toutes les lignes, en mémoire mappée)
+    :param y: Cible
+    :param train: Positions d'entraînement
+    :param test: Positions de validation
+    :return: F1 macro sur le pli de validation
+    :rtype: float
+    """
+    try:
+        clf.fit(X[train], y[train])
+    except Exception as e:
+        warnings.warn(f"Entraînement impossible avec {clf.get_params()} : {e}", FitFailedWarning)
+        return 0.0
+    return float(f1_score(y[test], clf.predict(X[test]), average="macro"))
+
+
+def recherche_complete(X_train: pd.DataFrame, y_train: pd.Series, planification: Optional[Planification] = None,
+                       grille: Optional[dict] = None, dossier: Path = FEATURES_DIR, **variables) -> tuple[Pipeline, dict]:
+    """
+    Recherche des hyperparamètres du GradientBoosting par validation croisée (5 plis stratifiés).
+
+    Le préprocesseur est entraîné sur chaque pli d'entraînement seulement (vocabulaire
+    TF-IDF, IDF et sélection chi² sans voir le pli de validation). Les matrices des plis
+    sont calculées une fois (cache `feature_store`) puis relues en mémoire mappée : les
+    workers reçoivent une référence aux fichiers au lieu d'une copie du texte brut, quel
+    que soit le nombre de combinaisons d'hyperparamètres. Le meilleur classifieur est
+    ensuite réentraîné, avec le préprocesseur, sur tout `X_train`.
+
+    :param X_train: Variables explicatives d'entraînement
+    :param y_train: Catégorie de prix
+    :param planification: Parallélisme de la validation croisée (par défaut : tous les cœurs, backend loky)
+    :param grille: Grille d'hyperparamètres `clf__...` (par défaut `bost_grid`)
+    :param dossier: Dossier du cache des matrices par pli
+    :param variables: Options d'extraction des variables (`build_preprocess` : mode, n_hash, k_chi2, float32)
+    :return: (pipeline préprocesseur + meilleur classifieur, meilleurs paramètres `clf__...`)
+    :rtype: tuple[Pipeline, dict]
+    """
+    plan = planification or Planification()
+    combinaisons = ParameterGrid(bost_grid if grille is None else grille)
+    y = np.asarray(y_train)
+    plis = list(StratifiedKFold(n_splits=5).split(np.zeros(len(y)), y))
+    features = materialiser_plis(X_train, y_train, plis, dossier=dossier, **variables)
+
+    clf = garde_imbrication(GradientBoostingClassifier(), plan)
+    with contexte(plan):
+        f1 = Parallel()(
+            delayed(score_pli)(clone(clf).set_params(**{k.removeprefix("clf__"): v for k, v in params.items()}), f.X, y, train, test)
+            for params in combinaisons
+            for f, (train, test) in zip(features, plis)
+        )
+    moyennes = np.asarray(f1).reshape(len(combinaisons), len(plis)).mean(axis=1)
+    best_params = combinaisons[int(np.argmax(moyennes))]
+
+    best_model = Pipeline([("prep", build_preprocess(**variables)), ("clf", clf)]).set_params(**best_params)
+    return best_model.fit(X_train, y_train), dict(best_params)
 
 
 def main():
-    ROOT = Path(__file__).resolve().parents[2]            
-    DATA_DIR = ROOT / "Data"
-    CSV_PATH = DATA_DIR / "parfums_data_base_machineLearning.csv"
+    parser = argparse.ArgumentParser(description="Recherche des hyperparamètres et sauvegarde du modèle GradientBoosting.")
+    parser.add_argument("--variables", choices=MODES_TEXTE, default="tfidf", help="Extraction des variables texte")
+    parser.add_argument("--n-hash", type=int, default=N_HASH, help="Dimension par colonne texte (mode hashing)")
+    parser.add_argument("--k-chi2", type=int, default=K_CHI2, help="Termes gardés par colonne texte (mode chi2)")
+    parser.add_argument("--float32", action="store_true", help="Matrices de variables en float32")
+    parser.add_argument("--jobs", type=int, default=-1, help="Workers de la validation croisée (-1 = tous les cœurs)")
+    parser.add_argument("--backend", choices=BACKENDS, default="loky", help="Backend joblib de la validation croisée")
+    parser.add_argument("--threads", type=int, default=None, help="Threads BLAS / OpenMP par worker (défaut : cœurs / workers)")
+    parser.add_argument("--max-nbytes", default="1M",
+                        help="Taille au-delà de laquelle les autres tableaux (cible, positions des plis) sont partagés en mémoire mappée ('none' : jamais) ; "
+                             "les matrices des plis le sont toujours")
+    args = parser.parse_args()
+    planification = Planification(n_jobs=args.jobs, backend=args.backend, threads=args.threads,
+                                  max_nbytes=None if args.max_nbytes.lower() == "none" else args.max_nbytes)
+    variables = {"mode": args.variables, "float32": args.float32}
+    if args.variables == "hashing":
+        variables["n_hash"] = args.n_hash
+    if args.variables == "chi2":
+        variables["k_chi2"] = args.k_chi2
 
     df = pd.read_csv(CSV_PATH, encoding="utf-8")
-    y = df["Prix_Categorie"]
-    X = df.drop(columns=["Prix_Categorie","Fragrance", "Marque"])
-    text_cols = ["Ingredients_txt", "Concepts_txt"]
-    cat_cols = [ "Famille", "Sous_famille", "Parfumeur", "Origine", "Genre"]
-    num_cols = ["Année"]
-
-    X["Ingredients_txt"] = X["Ingredients_txt"].fillna("") 
-    X["Concepts_txt"] = X["Concepts_txt"].fillna("")
-    for c in cat_cols:
-        X[c] = X[c].fillna("Inconnu")
-    X["Année"] = X["Année"].fillna(X["Année"].median())
-
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, stratify=y, random_state=1)
-
-    preprocess = ColumnTransformer(
-        transformers=[
-            ("ing", TfidfVectorizer(min_df=5, ngram_range=(1, 2)), "Ingredients_txt"),
-            ("con", TfidfVectorizer(min_df=5, ngram_range=(1, 2)), "Concepts_txt"),
-            ("cat", OneHotEncoder(handle_unknown="ignore"), cat_cols),
-            ("num", "passthrough", num_cols),
-        ]
-    )
-
-
-    gbc = Pipeline([
-    ("prep", preprocess),
-    ("clf", GradientBoostingClassifier()),])
-
-    bost_grid = {
-    "clf__n_estimators": np.arange(50, 250, 50),
-    "clf__learning_rate": [0.1, 1, 0.1],
-    "clf__max_depth": np.arange(2, 10, 1),
-    "clf__subsample": np.arange(0.5, 1.0, 0.1),}
-
-    grid_gbc = GridSearchCV(
-    gbc,
-    param_grid=bost_grid,
-    scoring="f1_macro",
-    cv=5,
-    n_jobs=-1,
-    error_score=0.0)
-
-    grid_gbc.fit(X_train, y_train)
-    y_pred = grid_gbc.predict(X_test)
-    print("F1 macro GradientBoostingClassifier :", f1_score(y_test, y_pred, average="macro"))
-    print("Meilleurs paramètres GradientBoostingClassifier :", grid_gbc.best_params_)
-    
-    
-    best_model = grid_gbc.best_estimator_
-    joblib.dump(best_model, "best_model.pkl")
+    y = prepare_y(df)
+    X = prepare_X(df)
+
+    # Jeu de test stable quand le catalogue grossit (comparaisons lors des réentraînements)
+    test = split_stable(df)
+    X_train, X_test, y_train, y_test = X[~test], X[test], y[~test], y[test]
+
+    with MesureCPU() as cpu:
+        best_model, best_params = recherche_complete(X_train, y_train, planification, **variables)
+    entrainement = {**planification.resume(), **cpu.bilan}
+    print(f"Recherche : {cpu.bilan['duree_s']:.1f} s, {planification.workers} workers x {planification.threads_par_worker} threads "
+          f"({planification.backend}), utilisation CPU moyenne {cpu.bilan['utilisation_moyenne']:.0%} "
+          f"({cpu.bilan['coeurs_equivalents']:.1f} / {cpu.bilan['coeurs']} cœurs), max {cpu.bilan['utilisation_max']:.0%}")
+    score_test = scores(best_model, X_test, y_test)
+    print("F1 macro GradientBoostingClassifier :", score_test["f1_macro"])
+    print("Meilleurs paramètres GradientBoostingClassifier :", best_params)
+
+
+    joblib.dump(best_model, MODEL_PATH)
+    sauver_meta(construire_meta(best_model, X_train, y_train, score_test, best_params,
+                                dataset_version(CSV_PATH), mode="recherche", variables=variables,
+                                entrainement=entrainement))
 
 
 #-----------------------------------------------------------------------------------------------------------------------
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
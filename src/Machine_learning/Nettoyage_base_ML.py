@@ -2,22 +2,25 @@
 Module pour le nettoyage de la base de données de parfums en vue de l'apprentissage automatique.
 """
 
-from pathlib import Path
 import polars as pl
+from src.Machine_learning.module.apprentissage_flux import PARQUET_PATH, TAILLE_GROUPE
 from src.Machine_learning.module.load_data import load_data
 from src.Machine_learning.module.nettoyage import nettoyage
+from src.Machine_learning.module.pretraitement import CSV_PATH, DATA_DIR
 
-root = Path(__file__).resolve().parents[2]
-in_path = root / "Data" / "parfums_data_base.json"
-out_path = root / "Data" / "parfums_data_base_machineLearning.csv"
+in_path = DATA_DIR / "parfums_data_base.json"
+out_path = CSV_PATH
+# Copie Parquet (groupes de lignes) lue par l'apprentissage en flux (Apprentissage_flux.py)
+out_parquet = PARQUET_PATH
 
 def main():
     """    
-    Télécharge les données brutes, les nettoie, et enregistre les données nettoyées dans un fichier CSV.
+    Télécharge les données brutes, les nettoie, et enregistre les données nettoyées dans un fichier CSV et un fichier Parquet.
     """ 
     df_brut = load_data(in_path)
     df_clean = nettoyage(df_brut)
     df_clean.write_csv(out_path)
+    df_clean.write_parquet(out_parquet, row_group_size=TAILLE_GROUPE)
 
     print( df_clean.shape)
     print(df_clean.select(pl.all().is_null().sum()))
@@ -0,0 +1,41 @@
+"""
+Ce fichier évalue tout le catalogue avec des probabilités hors échantillon du modèle retenu et enregistre
+le tableau des parfums sur- ou sous-positionnés en prix (data/positionnement.csv), lu par l'application.
+"""
+
+import time
+
+import joblib
+import pandas as pd
+
+from src.Machine_learning.module.positionnement import probas_hors_echantillon, table_positionnement
+from src.Machine_learning.module.pretraitement import CSV_PATH, DATA_DIR, MODEL_PATH, prepare_X, prepare_y
+
+OUT_PATH = DATA_DIR / "positionnement.csv"
+
+
+def main():
+    df = pd.read_csv(CSV_PATH, encoding="utf-8")
+    X = prepare_X(df)
+    y = prepare_y(df)
+    if not MODEL_PATH.exists():
+        raise SystemExit(f"Modèle introuvable ({MODEL_PATH}) : lancer d'abord Model_GB.py.")
+    model = joblib.load(MODEL_PATH)
+
+    t0 = time.perf_counter()
+    # Le pipeline complet (préprocesseur compris, avec son mode de variables) est réentraîné par pli :
+    # ni le vocabulaire ni la sélection des variables ne voient le pli évalué
+    proba, classes = probas_hors_echantillon(model, X, y, n_splits=5)
+    print(f"Probabilités hors échantillon : {len(df)} parfums en {time.perf_counter() - t0:.1f} s")
+
+    table = table_positionnement(df, proba, classes)
+    table.to_csv(OUT_PATH, index=False, encoding="utf-8")
+    print(table["Positionnement"].value_counts().to_string())
+    print(f"Tableau enregistré dans {OUT_PATH}")
+
+
+#-----------------------------------------------------------------------------------------------------------------------
+
+
+if __name__ == "__main__":
+    main()
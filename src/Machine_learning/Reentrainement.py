@@ -0,0 +1,104 @@
+"""
+Ce fichier rafraîchit le modèle quand le catalogue a grossi, sans relancer la recherche d'hyperparamètres de Model_GB.py
+sauf si une dérive des données ou une baisse du score est détectée. Un rapport compare l'ancien et le nouveau modèle
+sur le même jeu de test. Le nouveau modèle, entraîné sur le catalogue à jour, remplace l'ancien sauf si son F1 macro est
+inférieur de plus de --tolerance-f1 à celui de l'ancien : une légère baisse est acceptée. Elle ne peut pas s'accumuler
+d'un rafraîchissement à l'autre, car la dérive et le F1 sont comparés aux références de la dernière recherche complète,
+conservées tant que le préprocesseur ne change pas.
+
+Exemple : python -m src.Machine_learning.Reentrainement --mode warm --ajout 20
+"""
+
+import argparse
+import time
+
+import joblib
+import pandas as pd
+
+from src.Machine_learning.Model_GB import recherche_complete
+from src.Machine_learning.module.pretraitement import CSV_PATH, MODEL_PATH, prepare_X, prepare_y
+from src.Machine_learning.module.reentrainement import (
+    SEUILS_DERIVE,
+    TOLERANCE_F1,
+    charger_meta,
+    construire_meta,
+    ecarts_derive,
+    mesurer_derive,
+    rafraichir,
+    sauver_meta,
+    scores,
+    split_stable,
+)
+from src.app.module.fonction_catalogue import dataset_version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rafraîchit le modèle de catégorie de prix sur le catalogue actuel.")
+    parser.add_argument("--mode", choices=["warm", "fixe"], default="warm",
+                        help="warm : ajout d'arbres (warm_start) ; fixe : réentraînement avec les hyperparamètres retenus")
+    parser.add_argument("--ajout", type=int, default=20, help="Arbres ajoutés en mode warm")
+    parser.add_argument("--tolerance-f1", type=float, default=TOLERANCE_F1,
+                        help="Baisse de F1 macro tolérée, vis-à-vis de l'ancien modèle et de la dernière recherche complète")
+    parser.add_argument("--forcer-recherche", action="store_true", help="Relancer la recherche complète dans tous les cas")
+    args = parser.parse_args()
+
+    df = pd.read_csv(CSV_PATH, encoding="utf-8")
+    X, y = prepare_X(df), prepare_y(df)
+    test = split_stable(df)
+    X_train, X_test, y_train, y_test = X[~test], X[test], y[~test], y[test]
+
+    ancien = joblib.load(MODEL_PATH)
+    meta = charger_meta() or {}
+    parametres = meta.get("parametres") or {
+        f"clf__{k}": v for k, v in ancien.named_steps["clf"].get_params().items()
+        if k in ("n_estimators", "learning_rate", "max_depth", "subsample")
+    }
+    score_ancien = scores(ancien, X_test, y_test)
+
+    # Contrôles : dérive des données et score de l'ancien modèle, par rapport à la dernière recherche complète
+    raisons = []
+    ecarts = ecarts_derive(meta.get("derive", {}), mesurer_derive(ancien.named_steps["prep"], X_train, y_train))
+    if "derive" in meta:
+        raisons += [f"{k} +{v:.3f}" for k, v in ecarts.items() if v > SEUILS_DERIVE[k]]
+    if "test" in meta and score_ancien["f1_macro"] < meta["test"]["f1_macro"] - args.tolerance_f1:
+        raisons.append(f"F1 test {meta['test']['f1_macro']:.3f} -> {score_ancien['f1_macro']:.3f}")
+    if args.forcer_recherche:
+        raisons.append("recherche demandée")
+
+    # Un modèle « warm » ne grossit pas sans limite : au-delà du double des arbres retenus, on repart de zéro
+    mode = args.mode
+    n_retenu = int(parametres.get("clf__n_estimators", ancien.named_steps["clf"].n_estimators))
+    if mode == "warm" and ancien.named_steps["clf"].n_estimators + args.ajout > 2 * n_retenu:
+        mode = "fixe"
+
+    t0 = time.perf_counter()
+    if raisons:
+        print("Recherche complète :", ", ".join(raisons))
+        nouveau, parametres = recherche_complete(X_train, y_train, **meta.get("variables", {}))
+        mode = "recherche"
+    else:
+        nouveau = rafraichir(ancien, X_train, y_train, mode=mode, n_ajout=args.ajout, parametres=parametres)
+    duree = time.perf_counter() - t0
+    score_nouveau = scores(nouveau, X_test, y_test)
+
+    rapport = pd.DataFrame({"Ancien": score_ancien, "Nouveau": score_nouveau})
+    rapport["Écart"] = rapport["Nouveau"] - rapport["Ancien"]
+    print(f"Mode : {mode} ({duree:.1f} s) - {len(X_train)} parfums d'entraînement, {len(X_test)} de test")
+    print("Dérive :", ", ".join(f"{k} {v:+.3f}" for k, v in ecarts.items()))
+    print(rapport.round(4).to_string())
+
+    # Légère baisse tolérée (--tolerance-f1) ; les références ne sont remplacées qu'après une recherche complète
+    if score_nouveau["f1_macro"] >= score_ancien["f1_macro"] - args.tolerance_f1:
+        joblib.dump(nouveau, MODEL_PATH)
+        sauver_meta(construire_meta(nouveau, X_train, y_train, score_nouveau, parametres, dataset_version(CSV_PATH), mode,
+                                    variables=meta.get("variables"), reference=None if mode == "recherche" else meta))
+        print(f"Nouveau modèle enregistré dans {MODEL_PATH}")
+    else:
+        print(f"Nouveau modèle moins bon de plus de {args.tolerance_f1} en F1 macro : l'ancien est conservé.")
+
+
+#-----------------------------------------------------------------------------------------------------------------------
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Ce fichier évalue en lot un fichier CSV ou Parquet de parfums (réels ou hypothétiques) avec le modèle entraîné par Model_GB.py.
+Chaque ligne doit contenir les colonnes du formulaire Prédire ; les ingrédients et concepts sont des termes séparés par des espaces.
+
+Exemple : python -m src.Machine_learning.Scoring_batch candidats.csv predictions.csv --processus 4 --taille-bloc 5000
+"""
+
+import argparse
+import os
+
+from src.Machine_learning.module.pretraitement import MODEL_PATH
+from src.Machine_learning.module.scoring import scorer_fichier
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prédit la catégorie de prix de chaque parfum d'un fichier CSV / Parquet.")
+    parser.add_argument("entree", help="Fichier d'entrée (.csv ou .parquet)")
+    parser.add_argument("sortie", help="Fichier de sortie (.csv ou .parquet)")
+    parser.add_argument("--modele", default=str(MODEL_PATH), help="Modèle sauvegardé (.pkl)")
+    parser.add_argument("--taille-bloc", type=int, default=5000, help="Nombre de lignes lues et évaluées par bloc")
+    parser.add_argument("--processus", type=int, default=os.cpu_count() or 1, help="Nombre de processus d'évaluation")
+    args = parser.parse_args()
+
+    try:
+        bilan = scorer_fichier(args.entree, args.sortie, args.modele, args.taille_bloc, args.processus)
+    except ValueError as e:
+        raise SystemExit(f"Erreur : {e}")
+    print(
+        f"{bilan['lignes']} parfums évalués en {bilan['duree_s']:.1f} s "
+        f"({bilan['lignes_par_s']:,.0f} lignes/s, {bilan['blocs']} blocs) -> {args.sortie}"
+    )
+
+
+#-----------------------------------------------------------------------------------------------------------------------
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Ce fichier lance un serveur HTTP de prédiction de la catégorie de prix (bibliothèque standard, sans dépendance web).
+Le modèle est chargé une seule fois ; les requêtes concurrentes sont regroupées en micro-lots.
+
+Exemple : python -m src.Machine_learning.Serveur_prediction --port 8000 --fenetre-ms 5
+
+    POST /predict   corps : un objet au schéma de X_new, une liste d'objets ou {"instances": [...]}
+    GET  /metrics   compteurs, débits et histogrammes de latence
+    GET  /health    état du serveur
+"""
+
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import joblib
+
+from src.Machine_learning.module.pretraitement import MODEL_PATH
+from src.Machine_learning.module.service import MicroBatcher, lignes_depuis_payload
+
+
+def creer_serveur(batcher: MicroBatcher, host: str = "127.0.0.1", port: int = 8000) -> ThreadingHTTPServer:
+    """
+    Serveur HTTP multi-thread (un thread par requête) adossé à `batcher`.
+
+    :param batcher: Micro-batcher du modèle chargé
+    :param host: Adresse d'écoute
+    :param port: Port (0 = port libre choisi par le système)
+    :return: Serveur prêt à `serve_forever`
+    :rtype: ThreadingHTTPServer
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def _repondre(self, code: int, corps):
+            data = json.dumps(corps, ensure_ascii=False).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/metrics":
+                self._repondre(200, batcher.metriques())
+            elif self.path == "/health":
+                self._repondre(200, {"statut": "ok", "classes": batcher.classes})
+            else:
+                self._repondre(404, {"erreur": "Route inconnue"})
+
+        def do_POST(self):
+            if self.path != "/predict":
+                self._repondre(404, {"erreur": "Route inconnue"})
+                return
+            try:
+                taille = int(self.headers.get("Content-Length", 0))
+                X, lot = lignes_depuis_payload(json.loads(self.rfile.read(taille) or b"null"))
+            except (ValueError, TypeError) as e:
+                self._repondre(400, {"erreur": str(e)})
+                return
+            try:
+                preds = batcher.predire(X)
+            except Exception as e:
+                self._repondre(500, {"erreur": str(e)})
+                return
+            sorties = [{"label": p.label, "probas": dict(zip(p.classes, p.probas))} for p in preds]
+            self._repondre(200, sorties if lot else sorties[0])
+
+        def log_message(self, format, *args):
+            pass
+
+    serveur = ThreadingHTTPServer((host, port), Handler)
+    serveur.daemon_threads = True
+    return serveur
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur HTTP de prédiction de la catégorie de prix.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--fenetre-ms", type=float, default=5.0, help="Fenêtre de regroupement des requêtes")
+    parser.add_argument("--taille-max", type=int, default=256, help="Nombre maximal de lignes par micro-lot")
+    args = parser.parse_args()
+
+    batcher = MicroBatcher(joblib.load(MODEL_PATH), fenetre_ms=args.fenetre_ms, taille_max=args.taille_max)
+    serveur = creer_serveur(batcher, args.host, args.port)
+    print(f"Serveur de prédiction sur http://{args.host}:{serveur.server_port} (POST /predict, GET /metrics)")
+    try:
+        serveur.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        serveur.server_close()
+        batcher.arreter()
+
+
+#-----------------------------------------------------------------------------------------------------------------------
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Apprentissage en flux pour les catalogues qui ne tiennent pas en mémoire.
+
+Le catalogue nettoyé est lu en Parquet, un groupe de lignes (« row group ») à la
+fois. Les variables sont calculées sans état (aucun vocabulaire ni catégorie à
+apprendre sur l'ensemble des données) :
+    - termes et bigrammes des colonnes texte hachés (`HashingVectorizer`),
+    - catégories et décennie de l'année hachées sous forme « colonne=valeur » (`FeatureHasher`),
+et le classifieur est un `SGDClassifier` entraîné bloc par bloc (`partial_fit`).
+La mémoire est donc bornée par la taille d'un groupe de lignes.
+
+Le jeu de test est celui de `Model_GB.py` (`split_stable`, hachage de Marque +
+Fragrance, calculable bloc par bloc) : le F1 macro est directement comparable à
+celui du GradientBoosting entraîné en mémoire.
+"""
+
+import time
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import f1_score
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer
+
+from src.Machine_learning.module.pretraitement import CAT_COLS, CSV_PATH, TARGET, TEXT_COLS, TFIDF_PARAMS, prepare_X
+from src.Machine_learning.module.reentrainement import split_stable
+
+PARQUET_PATH = CSV_PATH.with_suffix(".parquet")
+
+# Dimensions des espaces hachés : par colonne texte, et pour les catégories + année
+N_HASH_TEXTE = 2 ** 18
+N_HASH_CAT = 2 ** 12
+
+# Lignes par groupe à l'écriture du Parquet (unité de lecture de l'apprentissage)
+TAILLE_GROUPE = 1000
+
+
+def csv_vers_parquet(csv_path: Path = CSV_PATH, parquet_path: Path = PARQUET_PATH, taille_groupe: int = TAILLE_GROUPE) -> Path:
+    """
+    Convertit le catalogue nettoyé (CSV) en Parquet, par blocs (mémoire bornée).
+
+    Le schéma est fixé d'après l'en-tête (texte, `Année` en réel) : une colonne vide dans
+    tout un bloc garde son type.
+
+    :param csv_path: Catalogue nettoyé
+    :param parquet_path: Fichier Parquet écrit
+    :param taille_groupe: Lignes par groupe de lignes
+    :return: Chemin du fichier Parquet
+    :rtype: Path
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    colonnes = pd.read_csv(csv_path, nrows=0, encoding="utf-8").columns
+    types = {c: "float64" if c == "Année" else "string" for c in colonnes}
+    schema = pa.schema([(c, pa.float64() if t == "float64" else pa.string()) for c, t in types.items()])
+    with pq.ParquetWriter(parquet_path, schema) as writer:
+        for bloc in pd.read_csv(csv_path, chunksize=taille_groupe, encoding="utf-8", dtype=types):
+            writer.write_table(pa.Table.from_pandas(bloc, schema=schema, preserve_index=False), row_group_size=taille_groupe)
+    return Path(parquet_path)
+
+
+def lire_groupes(path: Path, colonnes: Optional[list[str]] = None) -> Iterator[pd.DataFrame]:
+    """
+    Lit un fichier Parquet un groupe de lignes à la fois.
+
+    :param path: Fichier Parquet
+    :param colonnes: Colonnes lues (toutes par défaut)
+    :return: Itérateur de DataFrames
+    :rtype: Iterator[pd.DataFrame]
+    """
+    import pyarrow.parquet as pq
+
+    fichier = pq.ParquetFile(path)
+    for i in range(fichier.num_row_groups):
+        yield fichier.read_row_group(i, columns=colonnes).to_pandas()
+
+
+def classes_parquet(path: Path) -> np.ndarray:
+    """Classes de la cible présentes dans le fichier (lecture de la seule colonne cible)."""
+    classes = set()
+    for bloc in lire_groupes(path, colonnes=[TARGET]):
+        classes.update(bloc[TARGET].dropna().astype(str))
+    return np.array(sorted(classes))
+
+
+def variables_flux(X: pd.DataFrame, n_hash_texte: int = N_HASH_TEXTE, n_hash_cat: int = N_HASH_CAT) -> sparse.csr_matrix:
+    """
+    Variables sans état d'un bloc de parfums (le même bloc donne toujours la même matrice).
+
+    :param X: Variables explicatives (`prepare_X`)
+    :param n_hash_texte: Dimension par colonne texte
+    :param n_hash_cat: Dimension des catégories et de la décennie
+    :return: Matrice CSR len(X) x (2 * n_hash_texte + n_hash_cat)
+    :rtype: sparse.csr_matrix
+    """
+    blocs = [
+        HashingVectorizer(n_features=n_hash_texte, ngram_range=TFIDF_PARAMS["ngram_range"], alternate_sign=False).transform(
+            X[col].fillna("").astype(str)
+        )
+        for col in TEXT_COLS
+    ]
+    annees = pd.to_numeric(X["Année"], errors="coerce")
+    decennies = np.where(annees.notna(), (annees.fillna(0) // 10 * 10).astype(int).astype(str), "inconnue")
+    jetons = [
+        [f"{col}={v}" for col, v in zip(CAT_COLS, ligne)] + [f"Décennie={d}"]
+        for ligne, d in zip(X[CAT_COLS].astype(str).itertuples(index=False, name=None), decennies)
+    ]
+    blocs.append(FeatureHasher(n_features=n_hash_cat, input_type="string", alternate_sign=False).transform(jetons))
+    return sparse.hstack(blocs, format="csr")
+
+
+def modele_flux(n_hash_texte: int = N_HASH_TEXTE, n_hash_cat: int = N_HASH_CAT, alpha: float = 1e-5, random_state: int = 1) -> Pipeline:
+    """
+    Pipeline (`prep` sans état, `clf` incrémental), utilisable comme le modèle de `Model_GB.py` (predict / predict_proba).
+
+    :param alpha: Régularisation du SGDClassifier
+    :return: Pipeline non entraîné
+    :rtype: Pipeline
+    """
+    prep = FunctionTransformer(variables_flux, kw_args={"n_hash_texte": n_hash_texte, "n_hash_cat": n_hash_cat}, accept_sparse=True)
+    clf = SGDClassifier(loss="log_loss", alpha=alpha, average=True, random_state=random_state)
+    return Pipeline([("prep", prep), ("clf", clf)])
+
+
+def _bloc_train_test(bloc: pd.DataFrame):
+    bloc = bloc.dropna(subset=[TARGET]).reset_index(drop=True)
+    return prepare_X(bloc), bloc[TARGET].astype(str), split_stable(bloc)
+
+
+def entrainer_flux(path: Path, model: Optional[Pipeline] = None, epoques: int = 3, random_state: int = 1, progression=None) -> tuple[Pipeline, dict]:
+    """
+    Entraîne le modèle en flux sur les lignes d'entraînement (`split_stable`) du fichier Parquet.
+
+    :param path: Catalogue nettoyé (Parquet)
+    :param model: Pipeline `modele_flux` (créé par défaut)
+    :param epoques: Nombre de passes sur le fichier (lignes mélangées dans chaque bloc)
+    :param random_state: Graine du mélange
+    :param progression: Fonction appelée après chaque bloc avec (époque, lignes vues)
+    :return: (pipeline entraîné, bilan : lignes, blocs, durée, lignes/s)
+    :rtype: tuple[Pipeline, dict]
+    """
+    model = modele_flux() if model is None else model
+    prep, clf = model.named_steps["prep"], model.named_steps["clf"]
+    classes = classes_parquet(path)
+    rng = np.random.default_rng(random_state)
+
+    lignes, blocs = 0, 0
+    t0 = time.perf_counter()
+    for epoque in range(epoques):
+        for bloc in lire_groupes(path):
+            X, y, test = _bloc_train_test(bloc)
+            if test.all():
+                continue
+            ordre = rng.permutation(np.flatnonzero(~test))
+            X, y = X.iloc[ordre], y.iloc[ordre]
+            if blocs == 0:
+                prep.fit(X)
+            clf.partial_fit(prep.transform(X), y, classes=classes)
+            lignes += len(X)
+            blocs += 1
+            if progression is not None:
+                progression(epoque, lignes)
+    duree = time.perf_counter() - t0
+    return model, {"lignes": lignes, "blocs": blocs, "epoques": epoques, "duree_s": duree, "lignes_par_s": lignes / duree if duree else 0.0}
+
+
+def evaluer_flux(path: Path, modeles: dict) -> dict:
+    """
+    F1 macro de chaque modèle sur les lignes de test (`split_stable`) du fichier, lues bloc par bloc.
+
+    :param path: Catalogue nettoyé (Parquet)
+    :param modeles: Nom -> modèle (pipelines acceptant `prepare_X`)
+    :return: Nom -> {"f1_macro", "lignes", "lignes_par_s"}
+    :rtype: dict
+    """
+    vrais, predits, durees = [], {nom: [] for nom in modeles}, dict.fromkeys(modeles, 0.0)
+    for bloc in lire_groupes(path):
+        X, y, test = _bloc_train_test(bloc)
+        if not test.any():
+            continue
+        vrais.extend(y[test])
+        for nom, model in modeles.items():
+            t0 = time.perf_counter()
+            predits[nom].extend(map(str, model.predict(X[test])))
+            durees[nom] += time.perf_counter() - t0
+    return {
+        nom: {
+            "f1_macro": float(f1_score(vrais, predits[nom], average="macro")) if vrais else float("nan"),
+            "lignes": len(vrais),
+            "lignes_par_s": len(vrais) / durees[nom] if durees[nom] else 0.0,
+        }
+        for nom in modeles
+    }
@@ -0,0 +1,237 @@
+"""
+Banc de comparaison des familles de modèles et des modes d'extraction des variables (reproductible, parallèle).
+
+Tous les modèles sont évalués sur les mêmes plis de validation croisée stratifiée
+et sur les mêmes variables : une matrice par pli (cache `feature_store`), dont le
+préprocesseur n'a vu que les lignes d'entraînement du pli. Chaque couple
+(modèle, pli) est une tâche indépendante exécutée dans un pool de processus ; les
+matrices, relues en mémoire mappée, sont partagées entre les processus sans copie. Pour chaque modèle : F1 macro (moyenne et écart-type sur
+les plis), temps d'entraînement, latence de prédiction par ligne (en lot et
+ligne à ligne) et taille du modèle sérialisé.
+
+`comparer_variables` mesure de la même façon le compromis des modes d'extraction
+des variables texte (`build_preprocess` : TF-IDF, hashing, élagage chi², float32) :
+F1, mémoire de la matrice, taille du modèle et latence d'une prédiction complète
+(préprocesseur compris) pour un parfum.
+"""
+
+import pickle
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.ensemble import GradientBoostingClassifier, HistGradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import f1_score
+from sklearn.model_selection import StratifiedKFold
+from sklearn.pipeline import Pipeline, make_pipeline
+from sklearn.preprocessing import FunctionTransformer, MaxAbsScaler
+from sklearn.svm import LinearSVC
+
+from src.Machine_learning.module.feature_store import FEATURES_DIR, materialiser_plis
+from src.Machine_learning.module.pretraitement import build_preprocess
+
+
+def _dense(X):
+    return X.toarray().astype(np.float32) if hasattr(X, "toarray") else np.asarray(X, dtype=np.float32)
+
+
+def _gbc():
+    return GradientBoostingClassifier(random_state=1)
+
+
+def _histgb():
+    # HistGradientBoosting n'accepte pas les matrices creuses : conversion dense (float32) par pli
+    return make_pipeline(FunctionTransformer(_dense, accept_sparse=True), HistGradientBoostingClassifier(random_state=1))
+
+
+def _logreg():
+    # L'année (non normalisée par le préprocesseur) est ramenée à l'échelle des TF-IDF
+    return make_pipeline(MaxAbsScaler(), LogisticRegression(max_iter=5000))
+
+
+def _linearsvc():
+    return make_pipeline(MaxAbsScaler(), LinearSVC())
+
+
+def _random_forest():
+    return RandomForestClassifier(n_estimators=300, random_state=1, n_jobs=1)
+
+
+# Modèles comparés : nom -> fabrique (une fonction de module, transmissible aux processus)
+MODELES = {
+    "GradientBoosting": _gbc,
+    "HistGradientBoosting": _histgb,
+    "LogisticRegression": _logreg,
+    "LinearSVC": _linearsvc,
+    "RandomForest": _random_forest,
+}
+
+
+def evaluer_pli(nom: str, X, y: np.ndarray, train: np.ndarray, test: np.ndarray, n_unitaires: int = 50) -> dict:
+    """
+    Entraîne le modèle `nom` sur un pli et mesure score, temps et taille.
+
+    :param nom: Clé de `MODELES`
+    :param X: Matrice de variables du pli (toutes les lignes, préprocesseur entraîné sur `train`)
+    :param y: Cible
+    :param train: Positions d'entraînement
+    :param test: Positions de test
+    :param n_unitaires: Nombre de prédictions ligne à ligne chronométrées
+    :return: Mesures du pli
+    :rtype: dict
+    """
+    model = MODELES[nom]()
+    X_train, X_test = X[train], X[test]
+
+    t0 = time.perf_counter()
+    model.fit(X_train, y[train])
+    fit_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    pred = model.predict(X_test)
+    lot_s = time.perf_counter() - t0
+
+    n = min(n_unitaires, X_test.shape[0])
+    t0 = time.perf_counter()
+    for i in range(n):
+        model.predict(X_test[i:i + 1])
+    unitaire_s = (time.perf_counter() - t0) / max(n, 1)
+
+    return {
+        "Modèle": nom,
+        "F1 macro": f1_score(y[test], pred, average="macro"),
+        "Entraînement (s)": fit_s,
+        "Prédiction lot (µs/ligne)": lot_s / len(test) * 1e6,
+        "Prédiction unitaire (ms)": unitaire_s * 1000,
+        "Taille (Ko)": len(pickle.dumps(model)) / 1024,
+    }
+
+
+def comparer(
+    X: pd.DataFrame,
+    y,
+    modeles: Optional[list[str]] = None,
+    n_splits: int = 5,
+    n_jobs: int = -1,
+    random_state: int = 1,
+    dossier=FEATURES_DIR,
+    **variables,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Évalue les modèles sur les mêmes plis, en parallèle (une tâche par modèle et par pli).
+
+    :param X: Variables explicatives brutes (`prepare_X`) : le préprocesseur est entraîné sur chaque pli
+    :param y: Cible
+    :param modeles: Noms de modèles (par défaut tous ceux de `MODELES`)
+    :param n_splits: Nombre de plis
+    :param n_jobs: Nombre de processus (-1 = tous les cœurs)
+    :param random_state: Graine du découpage
+    :param dossier: Dossier du cache des matrices par pli
+    :param variables: Options de `build_preprocess` (mode, n_hash, k_chi2, float32)
+    :return: (tableau récapitulatif trié par F1 décroissant, mesures détaillées par pli)
+    :rtype: tuple[pd.DataFrame, pd.DataFrame]
+    """
+    modeles = list(MODELES) if modeles is None else modeles
+    inconnus = [m for m in modeles if m not in MODELES]
+    if inconnus:
+        raise ValueError(f"Modèles inconnus : {', '.join(inconnus)} (disponibles : {', '.join(MODELES)})")
+
+    y = np.asarray(y)
+    plis = list(StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state).split(np.zeros(len(y)), y))
+    features = materialiser_plis(X, y, plis, dossier=dossier, **variables)
+    mesures = Parallel(n_jobs=n_jobs)(
+        delayed(evaluer_pli)(nom, f.X, y, train, test) for nom in modeles for f, (train, test) in zip(features, plis)
+    )
+    detail = pd.DataFrame(mesures)
+    detail.insert(1, "Pli", [i for _ in modeles for i in range(len(plis))])
+
+    resume = detail.groupby("Modèle", sort=False).agg(
+        **{
+            "F1 macro": ("F1 macro", "mean"),
+            "F1 écart-type": ("F1 macro", "std"),
+            "Entraînement (s)": ("Entraînement (s)", "mean"),
+            "Prédiction lot (µs/ligne)": ("Prédiction lot (µs/ligne)", "mean"),
+            "Prédiction unitaire (ms)": ("Prédiction unitaire (ms)", "mean"),
+            "Taille (Ko)": ("Taille (Ko)", "mean"),
+        }
+    )
+    return resume.sort_values("F1 macro", ascending=False).reset_index(), detail
+
+
+# Modes d'extraction comparés : libellé -> options de `build_preprocess`
+MODES_VARIABLES = {
+    "TF-IDF float64": {},
+    "TF-IDF float32": {"float32": True},
+    "Chi² 300 termes float32": {"mode": "chi2", "k_chi2": 300, "float32": True},
+    "Hashing 2^10 float32": {"mode": "hashing", "n_hash": 2 ** 10, "float32": True},
+    "Hashing 2^12 float32": {"mode": "hashing", "n_hash": 2 ** 12, "float32": True},
+}
+
+
+def evaluer_variables(libelle: str, options: dict, clf, X_train: pd.DataFrame, y_train, X_test: pd.DataFrame, y_test,
+                      n_unitaires: int = 50) -> dict:
+    """
+    Entraîne préprocesseur (mode `options`) + classifieur et mesure score, mémoire et latence.
+
+    :param libelle: Nom du mode dans le tableau
+    :param options: Options de `build_preprocess`
+    :param clf: Classifieur (cloné)
+    :param n_unitaires: Nombre de parfums prédits un à un (latence du pipeline complet)
+    :return: Mesures du mode
+    :rtype: dict
+    """
+    model = Pipeline([("prep", build_preprocess(**options)), ("clf", clone(clf))])
+    t0 = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_s = time.perf_counter() - t0
+
+    Xt = model.named_steps["prep"].transform(X_train)
+    memoire = sum(getattr(Xt, a).nbytes for a in ("data", "indices", "indptr")) if hasattr(Xt, "indptr") else Xt.nbytes
+
+    n = min(n_unitaires, len(X_test))
+    temps = []
+    for i in range(n):
+        t0 = time.perf_counter()
+        model.predict(X_test.iloc[i:i + 1])
+        temps.append(time.perf_counter() - t0)
+
+    return {
+        "Mode": libelle,
+        "F1 macro": f1_score(y_test, model.predict(X_test), average="macro"),
+        "Variables": Xt.shape[1],
+        "Matrice (Mo)": memoire / 1024 ** 2,
+        "Modèle (Ko)": len(pickle.dumps(model)) / 1024,
+        "Entraînement (s)": fit_s,
+        "Prédiction unitaire p50 (ms)": float(np.median(temps)) * 1000,
+    }
+
+
+def comparer_variables(
+    X_train: pd.DataFrame,
+    y_train,
+    X_test: pd.DataFrame,
+    y_test,
+    clf=None,
+    modes: Optional[dict] = None,
+    n_jobs: int = -1,
+) -> pd.DataFrame:
+    """
+    Compare les modes d'extraction des variables avec le même classifieur et le même découpage, en parallèle.
+
+    :param clf: Classifieur (par défaut GradientBoosting, comme `Model_GB.py`)
+    :param modes: Libellé -> options de `build_preprocess` (par défaut `MODES_VARIABLES`)
+    :param n_jobs: Nombre de processus
+    :return: Tableau des compromis F1 / mémoire / latence
+    :rtype: pd.DataFrame
+    """
+    clf = _gbc() if clf is None else clf
+    modes = MODES_VARIABLES if modes is None else modes
+    mesures = Parallel(n_jobs=n_jobs)(
+        delayed(evaluer_variables)(libelle, options, clf, X_train, y_train, X_test, y_test)
+        for libelle, options in modes.items()
+    )
+    return pd.DataFrame(mesures)
@@ -0,0 +1,240 @@
+"""
+Contributions des variables aux prédictions du GradientBoosting (méthode des chemins, « Saabas »).
+
+Dans chaque arbre, le passage d'un nœud à son fils modifie la valeur prédite ;
+cette variation est attribuée à la variable testée par le nœud. Pour une classe,
+la somme des contributions plus un biais (propre à la ligne) redonne exactement le
+score brut `decision_function` du modèle.
+
+Le calcul est vectorisé : pour chaque arbre, `decision_path` donne la matrice creuse
+lignes x nœuds traversés, multipliée par une matrice nœuds x variables des variations.
+Les résultats du catalogue sont ensuite réduits aux `k` plus fortes contributions
+(en valeur absolue) par ligne et par classe, et enregistrés dans un fichier .npz.
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from src.Machine_learning.module.pretraitement import CAT_COLS
+
+# Libellés des blocs du ColumnTransformer (`build_preprocess`)
+PREFIXES = {"ing": "Ingrédient", "con": "Concept"}
+
+
+def _variations_arbre(tree, n_features: int) -> sparse.csr_matrix:
+    """Matrice nœuds x variables : variation de valeur à l'entrée de chaque nœud, sur la variable du parent."""
+    n_noeuds = tree.node_count
+    valeur = tree.value[:, 0, 0]
+    parent = np.full(n_noeuds, -1)
+    for fils in (tree.children_left, tree.children_right):
+        interne = fils >= 0
+        parent[fils[interne]] = np.flatnonzero(interne)
+    noeuds = np.flatnonzero(parent >= 0)
+    return sparse.csr_matrix(
+        (valeur[noeuds] - valeur[parent[noeuds]], (noeuds, tree.feature[parent[noeuds]])),
+        shape=(n_noeuds, n_features),
+    )
+
+
+def contributions_gbc(clf, Xt) -> tuple[list[sparse.csr_matrix], np.ndarray]:
+    """
+    Contributions par variable d'un GradientBoostingClassifier sur des données déjà transformées.
+
+    :param clf: GradientBoostingClassifier entraîné
+    :param Xt: Données transformées (sortie du préprocesseur)
+    :return: (une matrice creuse n_lignes x n_variables par score brut, biais n_lignes x n_scores)
+    :rtype: tuple[list[sparse.csr_matrix], np.ndarray]
+    """
+    Xt = sparse.csr_matrix(Xt, dtype=np.float32)
+    n_scores = clf.estimators_.shape[1]
+    contributions = []
+    for k in range(n_scores):
+        C = sparse.csr_matrix((Xt.shape[0], Xt.shape[1]), dtype=np.float64)
+        for arbre in clf.estimators_[:, k]:
+            chemins = arbre.decision_path(Xt)
+            C = C + chemins @ _variations_arbre(arbre.tree_, Xt.shape[1])
+        contributions.append((clf.learning_rate * C).tocsr())
+    brut = np.asarray(clf.decision_function(Xt), dtype=float).reshape(Xt.shape[0], -1)
+    biais = brut - np.column_stack([np.asarray(C.sum(axis=1)).ravel() for C in contributions])
+    return contributions, biais
+
+
+def top_k_lignes(C: sparse.csr_matrix, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Les `k` contributions les plus fortes (en valeur absolue) de chaque ligne.
+
+    :param C: Contributions n_lignes x n_variables
+    :param k: Nombre de contributions gardées par ligne
+    :return: (indices de variables, valeurs), n_lignes x k, triés par |valeur| décroissante ; -1 / 0 pour compléter
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    C = sparse.csr_matrix(C)
+    indices = np.full((C.shape[0], k), -1, dtype=np.int32)
+    valeurs = np.zeros((C.shape[0], k), dtype=np.float32)
+    for i in range(C.shape[0]):
+        debut, fin = C.indptr[i], C.indptr[i + 1]
+        v, j = C.data[debut:fin], C.indices[debut:fin]
+        if len(v) > k:
+            garde = np.argpartition(-np.abs(v), k - 1)[:k]
+            v, j = v[garde], j[garde]
+        ordre = np.lexsort((j, -np.abs(v)))
+        indices[i, :len(ordre)] = j[ordre]
+        valeurs[i, :len(ordre)] = v[ordre]
+    return indices, valeurs
+
+
+def noms_variables(prep) -> np.ndarray:
+    """
+    Noms des variables du préprocesseur entraîné.
+
+    En mode "hashing", les colonnes texte n'ont pas de vocabulaire (`get_feature_names_out`
+    indisponible) : leurs variables sont nommées par position, `ing__h0`, `ing__h1`, ...
+
+    :param prep: ColumnTransformer entraîné (`build_preprocess`)
+    :return: Noms des variables, dans l'ordre des colonnes transformées
+    :rtype: np.ndarray
+    """
+    try:
+        return np.asarray(prep.get_feature_names_out(), dtype=str)
+    except AttributeError:
+        pass
+    noms = []
+    for nom, transformeur, colonnes in prep.transformers_:
+        bloc = prep.output_indices_[nom]
+        if bloc.stop == bloc.start:
+            continue
+        try:
+            noms += [f"{nom}__{v}" for v in transformeur.get_feature_names_out(colonnes)]
+        except AttributeError:
+            noms += [f"{nom}__h{i}" for i in range(bloc.stop - bloc.start)]
+    return np.asarray(noms, dtype=str)
+
+
+def libelle_variable(nom: str, presente: bool = True) -> str:
+    """
+    Libellé lisible d'une variable du préprocesseur (ex. `cat__Famille_BOISÉ` -> `Famille = BOISÉ`).
+
+    Une variable absente du parfum (valeur nulle) peut aussi peser sur la prédiction :
+    elle est alors libellée `Famille ≠ BOISÉ` ou `Ingrédient : rose (absent)`. Les variables
+    hachées (`ing__h12`) sont libellées par leur position.
+    """
+    bloc, _, reste = nom.partition("__")
+    if bloc in PREFIXES and re.fullmatch(r"h\d+", reste):
+        return f"{PREFIXES[bloc]} haché n°{reste[1:]}" + ("" if presente else " (absent)")
+    if bloc in PREFIXES:
+        return f"{PREFIXES[bloc]} : {reste}" + ("" if presente else " (absent)")
+    if bloc == "cat":
+        for col in CAT_COLS:
+            if reste.startswith(col + "_"):
+                return f"{col} {'=' if presente else '≠'} {reste[len(col) + 1:]}"
+    return reste or nom
+
+
+@dataclass(frozen=True)
+class Contributions:
+    """
+    Top-k des contributions du catalogue, par ligne et par classe.
+
+    :param classes: Classes du modèle
+    :param variables: Noms des variables du préprocesseur
+    :param biais: Biais n_lignes x n_classes
+    :param indices: Indices de variables n_classes x n_lignes x k (-1 = vide)
+    :param valeurs: Contributions n_classes x n_lignes x k
+    :param presentes: Variable non nulle pour le parfum, n_classes x n_lignes x k
+    :param version: Version du dataset évalué
+    :param modele: Version du fichier du modèle qui a produit les contributions
+    """
+
+    classes: np.ndarray
+    variables: np.ndarray
+    biais: np.ndarray
+    indices: np.ndarray
+    valeurs: np.ndarray
+    presentes: np.ndarray
+    version: str = ""
+    modele: str = ""
+
+    @classmethod
+    def depuis_modele(cls, model, X: pd.DataFrame, k: int = 10, taille_bloc: int = 2000, version: str = "",
+                      modele: str = "") -> "Contributions":
+        """
+        Calcule les contributions de tout `X` pour un pipeline (`prep` + GradientBoosting), par blocs de lignes.
+
+        Pour un modèle binaire (un seul score brut), les contributions de la classe négative sont l'opposé
+        de celles de la classe positive.
+
+        :param model: Pipeline entraîné (`prep`, `clf`)
+        :param X: Variables explicatives (`prepare_X`)
+        :param k: Nombre de contributions gardées par ligne et par classe
+        :param taille_bloc: Nombre de lignes par bloc
+        :param version: Version du dataset
+        :param modele: Version du fichier du modèle (`dataset_version(MODEL_PATH)`)
+        :return: Contributions du catalogue
+        :rtype: Contributions
+        """
+        prep, clf = model.named_steps["prep"], model.named_steps["clf"]
+        classes = np.asarray([str(c) for c in clf.classes_])
+        variables = noms_variables(prep)
+        biais, indices, valeurs, presentes = [], [[] for _ in classes], [[] for _ in classes], [[] for _ in classes]
+        for debut in range(0, len(X), taille_bloc):
+            Xt = sparse.csr_matrix(prep.transform(X.iloc[debut:debut + taille_bloc]))
+            lignes = np.arange(Xt.shape[0])[:, None]
+            C, b = contributions_gbc(clf, Xt)
+            if len(C) == 1:
+                C, b = [-C[0], C[0]], np.column_stack([-b[:, 0], b[:, 0]])
+            biais.append(b)
+            for j, Cj in enumerate(C):
+                idx, val = top_k_lignes(Cj, k)
+                indices[j].append(idx)
+                valeurs[j].append(val)
+                presentes[j].append(np.asarray(Xt[lignes, np.maximum(idx, 0)].todense()) != 0)
+        return cls(
+            classes=classes,
+            variables=variables,
+            biais=np.vstack(biais).astype(np.float32),
+            indices=np.stack([np.vstack(i) for i in indices]),
+            valeurs=np.stack([np.vstack(v) for v in valeurs]),
+            presentes=np.stack([np.vstack(p) for p in presentes]),
+            version=version,
+            modele=modele,
+        )
+
+    def sauver(self, path: Path):
+        """Enregistre les contributions (.npz compressé)."""
+        np.savez_compressed(
+            path, classes=self.classes, variables=self.variables, biais=self.biais,
+            indices=self.indices, valeurs=self.valeurs, presentes=self.presentes, version=np.asarray(self.version),
+            modele=np.asarray(self.modele),
+        )
+
+    @classmethod
+    def charger(cls, path: Path) -> "Contributions":
+        """Charge des contributions enregistrées par `sauver`."""
+        with np.load(path, allow_pickle=False) as f:
+            return cls(
+                classes=f["classes"], variables=f["variables"], biais=f["biais"],
+                indices=f["indices"], valeurs=f["valeurs"], presentes=f["presentes"], version=str(f["version"]),
+                modele=str(f["modele"]) if "modele" in f.files else "",
+            )
+
+    def pour(self, position: int, classe: str) -> pd.DataFrame:
+        """
+        Contributions d'un parfum vers une classe (positif : pousse vers la classe).
+
+        :param position: Position du parfum dans le catalogue
+        :param classe: Classe visée
+        :return: DataFrame (Variable, Contribution), par |contribution| décroissante
+        :rtype: pd.DataFrame
+        """
+        j = int(np.flatnonzero(self.classes == str(classe))[0])
+        idx, val, pres = self.indices[j, position], self.valeurs[j, position], self.presentes[j, position]
+        garde = idx >= 0
+        return pd.DataFrame({
+            "Variable": [libelle_variable(self.variables[i], bool(p)) for i, p in zip(idx[garde], pres[garde])],
+            "Contribution": val[garde].astype(float),
+        })
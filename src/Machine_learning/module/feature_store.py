@@ -0,0 +1,197 @@
+"""
+Cache des matrices de variables (« feature store ») pour l'entraînement et l'évaluation.
+
+La matrice creuse produite par le préprocesseur (`build_preprocess` : TF-IDF avec
+bigrammes sur deux colonnes texte, one-hot, année) est enregistrée avec la cible et
+le préprocesseur entraîné, dans un dossier dont le nom est une empreinte SHA-256
+des données nettoyées (`prepare_X` / `prepare_y`) et de la configuration de
+prétraitement. Tant que ni les données ni la configuration ne changent, les scripts
+rechargent ce dossier (en mémoire mappée) au lieu de refaire la tokenisation.
+
+Pour la validation croisée, `materialiser_plis` enregistre une matrice par pli : le
+préprocesseur n'y est entraîné que sur les lignes d'entraînement du pli, les lignes
+de validation sont seulement transformées (vocabulaire, IDF et sélection chi² ne
+voient jamais le pli de validation). Les tableaux relus en mémoire mappée sont
+transmis aux processus joblib par référence au fichier, sans copie.
+
+Contenu d'un dossier :
+    - X_data.npy, X_indices.npy, X_indptr.npy : matrice CSR (lisibles en `mmap`),
+    - y.npy : cible,
+    - vectorizers.joblib : préprocesseur entraîné (vocabulaires TF-IDF, catégories),
+    - meta.json : empreinte, forme, configuration, date.
+"""
+
+import hashlib
+import json
+import shutil
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from scipy import sparse
+from sklearn.compose import ColumnTransformer
+
+from src.Machine_learning.module.lsh import FICHIERS_X
+from src.Machine_learning.module.pretraitement import (
+    CAT_COLS,
+    DATA_DIR,
+    NUM_COLS,
+    TEXT_COLS,
+    TFIDF_PARAMS,
+    build_preprocess,
+)
+
+FEATURES_DIR = DATA_DIR / "features"
+
+
+def config_pretraitement(**options) -> dict:
+    """
+    Configuration de prétraitement prise en compte dans l'empreinte (colonnes, TF-IDF, version de scikit-learn).
+
+    :param options: Options de `build_preprocess` (mode, n_hash, k_chi2, float32)
+    """
+    return {
+        "text_cols": TEXT_COLS,
+        "cat_cols": CAT_COLS,
+        "num_cols": NUM_COLS,
+        "tfidf": {k: list(v) if isinstance(v, tuple) else v for k, v in TFIDF_PARAMS.items()},
+        "options": dict(sorted(options.items())),
+        "sklearn": sklearn.__version__,
+    }
+
+
+def cle_features(X: pd.DataFrame, y, config: dict) -> str:
+    """
+    Empreinte SHA-256 des données nettoyées et de la configuration.
+
+    :param X: Variables explicatives (`prepare_X`)
+    :param y: Cible
+    :param config: Configuration de prétraitement
+    :return: Empreinte hexadécimale
+    :rtype: str
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps([list(map(str, X.columns)), config], sort_keys=True).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    h.update(pd.util.hash_pandas_object(pd.Series(y).astype(str), index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+@dataclass(frozen=True)
+class Features:
+    """
+    Matrice de variables matérialisée.
+
+    :param cle: Empreinte des données et de la configuration
+    :param X: Matrice CSR n_lignes x n_variables
+    :param y: Cible
+    :param prep: Préprocesseur entraîné qui a produit `X`
+    :param dossier: Dossier du cache
+    """
+
+    cle: str
+    X: sparse.csr_matrix
+    y: np.ndarray
+    prep: ColumnTransformer
+    dossier: Path
+
+    @classmethod
+    def charger(cls, dossier: Path, mmap: bool = True) -> "Features":
+        """Charge un dossier écrit par `materialiser` (tableaux en mémoire mappée si `mmap`)."""
+        dossier = Path(dossier)
+        mode = "r" if mmap else None
+        meta = json.loads((dossier / "meta.json").read_text(encoding="utf-8"))
+        arrays = {nom: np.load(dossier / f"X_{nom}.npy", mmap_mode=mode) for nom in FICHIERS_X}
+        X = sparse.csr_matrix((arrays["data"], arrays["indices"], arrays["indptr"]), shape=tuple(meta["shape"]), copy=False)
+        return cls(meta["cle"], X, np.load(dossier / "y.npy", mmap_mode=mode), joblib.load(dossier / "vectorizers.joblib"), dossier)
+
+
+def _empreinte_lignes(lignes) -> Optional[str]:
+    return None if lignes is None else hashlib.sha256(np.asarray(lignes, dtype=np.int64).tobytes()).hexdigest()
+
+
+def _elaguer(dossier: Path, garder: int, courant: Path):
+    # Supprime les entrées les plus anciennes du cache (hors `courant`)
+    anciens = sorted((d for d in Path(dossier).iterdir() if d.is_dir() and d != courant), key=lambda d: d.stat().st_mtime)
+    for d in anciens[:max(len(anciens) - (garder - 1), 0)]:
+        shutil.rmtree(d, ignore_errors=True)
+
+
+def materialiser(X: pd.DataFrame, y, dossier: Path = FEATURES_DIR, mmap: bool = True, garder: int = 4,
+                 train: Optional[np.ndarray] = None, **options) -> Features:
+    """
+    Matrice de variables de (X, y) : relue depuis le cache si elle existe, sinon calculée puis enregistrée.
+
+    :param X: Variables explicatives (`prepare_X`)
+    :param y: Cible (`prepare_y`)
+    :param dossier: Dossier racine du cache
+    :param mmap: Relire les tableaux en mémoire mappée
+    :param garder: Nombre d'entrées conservées dans le cache (les plus anciennes sont supprimées)
+    :param train: Positions des lignes sur lesquelles le préprocesseur est entraîné (toutes par défaut) ;
+        les autres lignes sont seulement transformées
+    :param options: Options de `build_preprocess` (mode d'extraction des variables texte, float32)
+    :return: Matrice (toutes les lignes), cible et préprocesseur entraîné
+    :rtype: Features
+    """
+    config = {**config_pretraitement(**options), "train": _empreinte_lignes(train)}
+    cle = cle_features(X, y, config)
+    cible = Path(dossier) / cle[:16]
+    if (cible / "meta.json").exists():
+        return Features.charger(cible, mmap=mmap)
+
+    if train is None:
+        prep = build_preprocess(**options).fit(X, y)
+    else:
+        prep = build_preprocess(**options).fit(X.iloc[train], pd.Series(y).iloc[train])
+    Xt = sparse.csr_matrix(prep.transform(X))
+    Xt.sort_indices()
+
+    # Écriture dans un dossier temporaire puis renommage : un cache incomplet n'est jamais relu
+    tmp = cible.with_name(cible.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    for nom in FICHIERS_X:
+        np.save(tmp / f"X_{nom}.npy", getattr(Xt, nom))
+    np.save(tmp / "y.npy", pd.Series(y).astype(str).to_numpy(dtype=str))
+    joblib.dump(prep, tmp / "vectorizers.joblib")
+    meta = {"cle": cle, "shape": list(Xt.shape), "nnz": int(Xt.nnz), "config": config,
+            "date": datetime.now().isoformat(timespec="seconds")}
+    (tmp / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    shutil.rmtree(cible, ignore_errors=True)
+    tmp.rename(cible)
+
+    _elaguer(dossier, garder, cible)
+    return Features.charger(cible, mmap=mmap)
+
+
+def materialiser_plis(X: pd.DataFrame, y, plis: list, dossier: Path = FEATURES_DIR, mmap: bool = True, garder: int = 4,
+                      **options) -> list[Features]:
+    """
+    Une matrice de variables par pli de validation croisée, préprocesseur entraîné sur le seul pli d'entraînement.
+
+    Les matrices d'un découpage sont rangées dans un même sous-dossier du cache (compté
+    comme une seule entrée pour `garder`).
+
+    :param X: Variables explicatives (`prepare_X`)
+    :param y: Cible (`prepare_y`)
+    :param plis: Liste de couples (positions d'entraînement, positions de validation)
+    :param dossier: Dossier racine du cache
+    :param mmap: Relire les tableaux en mémoire mappée
+    :param garder: Nombre d'entrées conservées dans le cache
+    :param options: Options de `build_preprocess`
+    :return: Features de chaque pli (toutes les lignes transformées par le préprocesseur du pli)
+    :rtype: list[Features]
+    """
+    config = {**config_pretraitement(**options), "plis": [_empreinte_lignes(train) for train, _ in plis]}
+    sous_dossier = Path(dossier) / f"plis_{cle_features(X, y, config)[:16]}"
+    features = [
+        materialiser(X, y, dossier=sous_dossier, mmap=mmap, garder=len(plis), train=train, **options)
+        for train, _ in plis
+    ]
+    _elaguer(dossier, garder, sous_dossier)
+    return features
@@ -0,0 +1,181 @@
+"""
+Index approché de parfums similaires (LSH par projections aléatoires, « SimHash »).
+
+Pour un très grand catalogue, la recherche exacte (`similarite.IndexSimilarite`)
+parcourt toutes les lignes touchées par la requête. Ici, chaque vecteur normalisé
+est résumé, dans plusieurs tables, par le signe de sa projection sur `n_bits`
+hyperplans aléatoires : deux parfums proches (cosinus élevé) ont souvent la même
+signature. Une requête ne réévalue exactement que les parfums qui partagent un
+seau avec elle (éventuellement à un bit près, `sondes`).
+
+Format sur disque (un dossier), chargeable en `mmap` :
+    - meta.json : paramètres, forme de la matrice, version du dataset,
+    - plans.npy : hyperplans (n_tables, d, n_bits), float32,
+    - codes.npy / ordre.npy : signatures triées et positions correspondantes, par table,
+    - X_data.npy, X_indices.npy, X_indptr.npy : vecteurs CSR pour le reclassement exact.
+"""
+
+import json
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from scipy import sparse
+
+FICHIERS_X = ("data", "indices", "indptr")
+
+# Taille de catalogue à partir de laquelle l'application utilise l'index approché par défaut.
+# En dessous, la recherche exacte creuse est plus rapide (voir Index_LSH.py).
+SEUIL_LSH = 500_000
+
+
+def _signatures(X: sparse.csr_matrix, plans: np.ndarray) -> np.ndarray:
+    """Signatures (n_tables, n) : bits de signe des projections, empaquetés en uint32."""
+    n_tables, _, n_bits = plans.shape
+    poids = (1 << np.arange(n_bits, dtype=np.uint32)).astype(np.uint32)
+    codes = np.empty((n_tables, X.shape[0]), dtype=np.uint32)
+    for t in range(n_tables):
+        bits = np.asarray(X @ plans[t]) > 0
+        codes[t] = bits.astype(np.uint32) @ poids
+    return codes
+
+
+class IndexLSH:
+    """
+    Index LSH (projections aléatoires) sur des vecteurs normalisés.
+
+    Utiliser `construire` (à partir d'une matrice) ou `charger` (depuis le disque).
+    """
+
+    def __init__(self, X: sparse.csr_matrix, plans: np.ndarray, codes: np.ndarray, ordre: np.ndarray, meta: dict):
+        self.X = X
+        self.plans = plans
+        self.codes = codes
+        self.ordre = ordre
+        self.meta = meta
+        self.n_tables, self.d, self.n_bits = plans.shape
+
+    @classmethod
+    def construire(cls, X: sparse.csr_matrix, n_tables: int = 32, n_bits: int = 10, seed: int = 0, version: str = "") -> "IndexLSH":
+        """
+        Construit l'index à partir de vecteurs normalisés (lignes de `X`).
+
+        :param X: Matrice CSR n_parfums x d (ex. `IndexSimilarite.X`)
+        :param n_tables: Nombre de tables de hachage
+        :param n_bits: Nombre de bits (hyperplans) par signature, au plus 32
+        :param seed: Graine des hyperplans
+        :param version: Version du dataset source (vérifiée au chargement par l'application)
+        :return: Index construit
+        :rtype: IndexLSH
+        """
+        if not 1 <= n_bits <= 32:
+            raise ValueError("n_bits doit être compris entre 1 et 32.")
+        X = sparse.csr_matrix(X, dtype=np.float32)
+        rng = np.random.default_rng(seed)
+        plans = rng.standard_normal((n_tables, X.shape[1], n_bits)).astype(np.float32)
+        codes = _signatures(X, plans)
+        ordre = np.argsort(codes, axis=1, kind="stable").astype(np.int32)
+        codes_tries = np.take_along_axis(codes, ordre, axis=1)
+        meta = {
+            "n_tables": n_tables,
+            "n_bits": n_bits,
+            "seed": seed,
+            "shape": list(X.shape),
+            "version": version,
+        }
+        return cls(X, plans, codes_tries, ordre, meta)
+
+    def sauver(self, dossier: Path):
+        """Enregistre l'index dans `dossier` (fichiers .npy + meta.json)."""
+        dossier = Path(dossier)
+        dossier.mkdir(parents=True, exist_ok=True)
+        np.save(dossier / "plans.npy", self.plans)
+        np.save(dossier / "codes.npy", self.codes)
+        np.save(dossier / "ordre.npy", self.ordre)
+        for nom in FICHIERS_X:
+            np.save(dossier / f"X_{nom}.npy", getattr(self.X, nom))
+        (dossier / "meta.json").write_text(json.dumps(self.meta, indent=2), encoding="utf-8")
+
+    @classmethod
+    def charger(cls, dossier: Path, mmap: bool = True) -> "IndexLSH":
+        """
+        Charge un index enregistré par `sauver`.
+
+        Avec `mmap=True`, les tableaux restent sur disque et ne sont lus qu'à la demande
+        (chargement quasi instantané, mémoire partagée entre processus).
+
+        :param dossier: Dossier de l'index
+        :param mmap: Ouvrir les tableaux en mémoire mappée
+        :return: Index chargé
+        :rtype: IndexLSH
+        """
+        dossier = Path(dossier)
+        mode = "r" if mmap else None
+        meta = json.loads((dossier / "meta.json").read_text(encoding="utf-8"))
+        arrays = {nom: np.load(dossier / f"X_{nom}.npy", mmap_mode=mode) for nom in FICHIERS_X}
+        X = sparse.csr_matrix((arrays["data"], arrays["indices"], arrays["indptr"]), shape=tuple(meta["shape"]), copy=False)
+        return cls(
+            X,
+            np.load(dossier / "plans.npy", mmap_mode=mode),
+            np.load(dossier / "codes.npy", mmap_mode=mode),
+            np.load(dossier / "ordre.npy", mmap_mode=mode),
+            meta,
+        )
+
+    def candidats(self, v: sparse.csr_matrix, sondes: int = 0) -> np.ndarray:
+        """
+        Positions des parfums qui partagent un seau avec `v` dans au moins une table.
+
+        :param v: Vecteur requête normalisé (1 x d)
+        :param sondes: 0 = seau exact ; 1 = aussi les seaux à un bit près (multi-probe)
+        :return: Positions candidates (sans doublons)
+        :rtype: np.ndarray
+        """
+        v = sparse.csr_matrix(v, dtype=np.float32)
+        q = _signatures(v, self.plans)[:, 0]
+        flips = [np.uint32(0)] + ([np.uint32(1 << b) for b in range(self.n_bits)] if sondes else [])
+        morceaux = []
+        for t in range(self.n_tables):
+            codes_t = self.codes[t]
+            for f in flips:
+                code = q[t] ^ f
+                lo = np.searchsorted(codes_t, code, side="left")
+                hi = np.searchsorted(codes_t, code, side="right")
+                if hi > lo:
+                    morceaux.append(np.asarray(self.ordre[t, lo:hi]))
+        if not morceaux:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(morceaux))
+
+    def voisins_vecteur(self, v: sparse.csr_matrix, k: int = 10, sondes: int = 0, exclure: Optional[int] = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Les `k` parfums les plus proches de `v` parmi les candidats, reclassés par cosinus exact.
+
+        :return: (positions, similarités), du plus proche au moins proche
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        cand = self.candidats(v, sondes=sondes)
+        if exclure is not None:
+            cand = cand[cand != exclure]
+        if not len(cand):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        scores = np.asarray(self.X[cand] @ sparse.csr_matrix(v, dtype=np.float32).T.toarray(), dtype=np.float32).ravel()
+        k = min(int(k), len(cand))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((cand[top], -scores[top]))]
+        return cand[top], scores[top]
+
+    def voisins(self, position: int, k: int = 10, sondes: int = 0) -> tuple[np.ndarray, np.ndarray]:
+        """Les `k` parfums les plus proches du parfum en `position` (lui-même exclu)."""
+        return self.voisins_vecteur(self.X[position], k=k, sondes=sondes, exclure=position)
+
+
+def rappel(exact_scores: np.ndarray, approx_scores: np.ndarray, k: int) -> float:
+    """
+    Rappel@k mesuré sur les scores : part des k résultats approchés dont le score atteint
+    le k-ième meilleur score exact (insensible aux ex aequo, ex. parfums dupliqués).
+    """
+    if not len(exact_scores):
+        return 1.0
+    seuil = np.sort(exact_scores)[::-1][:k][-1] - 1e-6
+    return float(min(np.sum(approx_scores >= seuil), k) / min(k, len(exact_scores)))
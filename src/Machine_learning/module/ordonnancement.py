@@ -0,0 +1,182 @@
+"""
+Ordonnancement du parallélisme de l'entraînement (validation croisée, recherche d'hyperparamètres).
+
+Une `Planification` fixe :
+    - le nombre de processus / threads de la validation croisée et le backend joblib
+      (« loky » : processus, « threading » : threads du processus courant),
+    - le nombre de threads BLAS / OpenMP de chaque worker (threadpoolctl), pour que
+      workers x threads ne dépasse pas le nombre de cœurs,
+    - le partage des données : les tableaux de plus de `max_nbytes` sont transmis
+      aux processus en mémoire mappée (lecture seule) au lieu d'être copiés ; les
+      matrices par pli du cache `feature_store` (`materialiser_plis`), déjà mappées,
+      sont transmises par référence à leur fichier quel que soit `max_nbytes`.
+      Un DataFrame de texte brut (dtype objet) n'est jamais mappé : il est copié.
+`garde_imbrication` met à 1 le `n_jobs` des estimateurs eux-mêmes parallèles quand
+la validation croisée l'est déjà, et `MesureCPU` enregistre l'utilisation des
+processeurs pendant l'entraînement.
+"""
+
+import os
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from joblib import cpu_count, parallel_config
+from threadpoolctl import threadpool_limits
+
+BACKENDS = ("loky", "threading")
+
+
+@dataclass(frozen=True)
+class Planification:
+    """
+    Options de parallélisme d'un entraînement.
+
+    :param n_jobs: Workers de la validation croisée (-1 = tous les cœurs, comme joblib)
+    :param backend: "loky" (processus) ou "threading"
+    :param threads: Threads BLAS / OpenMP par worker (None = cœurs / workers)
+    :param max_nbytes: Taille au-delà de laquelle un tableau est transmis en mémoire mappée (None = jamais)
+    :param dossier_temp: Dossier des fichiers mappés (par défaut celui de joblib)
+    """
+
+    n_jobs: int = -1
+    backend: str = "loky"
+    threads: Optional[int] = None
+    max_nbytes: Optional[str] = "1M"
+    dossier_temp: Optional[str] = None
+
+    def __post_init__(self):
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Backend inconnu : {self.backend} (attendu : {', '.join(BACKENDS)})")
+        if self.n_jobs == 0 or (self.threads is not None and self.threads < 1):
+            raise ValueError("n_jobs et threads doivent être non nuls")
+
+    @property
+    def workers(self) -> int:
+        """Nombre effectif de workers."""
+        return max(cpu_count() + 1 + self.n_jobs, 1) if self.n_jobs < 0 else self.n_jobs
+
+    @property
+    def threads_par_worker(self) -> int:
+        """Threads BLAS / OpenMP par worker."""
+        return self.threads if self.threads is not None else max(cpu_count() // self.workers, 1)
+
+    def resume(self) -> dict:
+        """Options effectives (enregistrées avec le modèle)."""
+        return {**asdict(self), "workers": self.workers, "threads": self.threads_par_worker, "coeurs": cpu_count()}
+
+
+@contextmanager
+def contexte(plan: Planification):
+    """
+    Applique la planification aux appels joblib (scikit-learn compris) du bloc `with`.
+
+    En « loky », la limite de threads est appliquée dans chaque processus ; en « threading »,
+    les workers partagent le processus courant, la limite y est donc appliquée directement.
+    """
+    if plan.workers * plan.threads_par_worker > cpu_count():
+        warnings.warn(
+            f"{plan.workers} workers x {plan.threads_par_worker} threads pour {cpu_count()} cœurs : surcharge des processeurs",
+            RuntimeWarning,
+            stacklevel=3,
+        )
+    options = {"backend": plan.backend, "n_jobs": plan.n_jobs, "max_nbytes": plan.max_nbytes, "mmap_mode": "r"}
+    if plan.dossier_temp is not None:
+        options["temp_folder"] = plan.dossier_temp
+    if plan.backend == "loky":
+        options["inner_max_num_threads"] = plan.threads_par_worker
+    with parallel_config(**options):
+        if plan.backend == "threading":
+            with threadpool_limits(limits=plan.threads_par_worker):
+                yield plan
+        else:
+            yield plan
+
+
+def garde_imbrication(estimateur, plan: Planification):
+    """
+    Évite le parallélisme imbriqué : si la validation croisée a plusieurs workers, les
+    paramètres `n_jobs` de l'estimateur (et de ses étapes) sont mis à 1.
+
+    :param estimateur: Estimateur scikit-learn (modifié en place)
+    :param plan: Planification de la validation croisée
+    :return: L'estimateur
+    """
+    if plan.workers > 1:
+        params = {k: 1 for k, v in estimateur.get_params().items() if k.split("__")[-1] == "n_jobs" and v != 1}
+        if params:
+            estimateur.set_params(**params)
+    return estimateur
+
+
+def _temps_cpu_machine() -> Optional[tuple[float, float]]:
+    # (temps actif, temps total) cumulés de tous les cœurs, en ticks (Linux : /proc/stat)
+    try:
+        with open("/proc/stat", encoding="ascii") as f:
+            valeurs = [float(v) for v in f.readline().split()[1:]]
+    except OSError:
+        return None
+    inactif = valeurs[3] + (valeurs[4] if len(valeurs) > 4 else 0.0)
+    return sum(valeurs) - inactif, sum(valeurs)
+
+
+def _temps_cpu_processus() -> float:
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+class MesureCPU:
+    """
+    Utilisation des processeurs pendant un bloc `with`, échantillonnée toutes les `intervalle` secondes.
+
+    Sous Linux, l'utilisation est celle de la machine (/proc/stat) : elle inclut les processus
+    loky, mais aussi toute autre charge. Ailleurs, seul le temps CPU du processus et de ses
+    enfants terminés est compté.
+
+    :param intervalle: Période d'échantillonnage (s)
+    """
+
+    def __init__(self, intervalle: float = 0.5):
+        self.intervalle = intervalle
+        self.echantillons: list[float] = []
+        self._arret = threading.Event()
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        self._cpu0 = _temps_cpu_processus()
+        self._machine0 = _temps_cpu_machine()
+        self._thread = threading.Thread(target=self._echantillonner, daemon=True)
+        self._thread.start()
+        return self
+
+    def _echantillonner(self):
+        precedent = _temps_cpu_machine()
+        while precedent is not None and not self._arret.wait(self.intervalle):
+            actuel = _temps_cpu_machine()
+            total = actuel[1] - precedent[1]
+            if total > 0:
+                self.echantillons.append((actuel[0] - precedent[0]) / total)
+            precedent = actuel
+
+    def __exit__(self, *exc):
+        self._arret.set()
+        self._thread.join()
+        duree = time.perf_counter() - self._t0
+        cpu_processus = _temps_cpu_processus() - self._cpu0
+        machine = _temps_cpu_machine()
+        if self._machine0 is not None and machine is not None and machine[1] > self._machine0[1]:
+            moyenne = (machine[0] - self._machine0[0]) / (machine[1] - self._machine0[1])
+        else:
+            moyenne = cpu_processus / (duree * cpu_count()) if duree else 0.0
+        self.bilan = {
+            "duree_s": duree,
+            "cpu_processus_s": cpu_processus,
+            "utilisation_moyenne": moyenne,
+            "utilisation_max": max(self.echantillons, default=moyenne),
+            "coeurs_equivalents": moyenne * cpu_count(),
+            "coeurs": cpu_count(),
+        }
+        return False
@@ -0,0 +1,131 @@
+"""
+Détection des parfums sur- ou sous-positionnés en prix, sur tout le catalogue.
+
+Chaque parfum est évalué par un modèle qui ne l'a pas vu à l'entraînement
+(probabilités hors échantillon, validation croisée stratifiée) : on compare
+ensuite sa catégorie réelle à la catégorie attendue d'après ses caractéristiques.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.model_selection import StratifiedKFold
+
+# Catégories de prix, de la moins chère à la plus chère
+ORDRE_PRIX = ["Mass Market", "Prestige", "Niche"]
+
+# Écart de rang (réel - attendu) au-delà duquel un parfum est signalé
+SEUIL_ECART = 0.5
+
+POSITIONNEMENT_COLS = [
+    "Fragrance", "Marque", "Prix_Categorie", "Prédiction",
+    "Proba_reelle", "Proba_predite", "Marge", "Rang_attendu", "Ecart", "Positionnement",
+]
+
+
+def _lignes(X, positions):
+    """Lignes d'un DataFrame (`iloc`) ou d'une matrice (creuse ou non) par positions."""
+    return X.iloc[positions] if isinstance(X, pd.DataFrame) else X[positions]
+
+
+def predict_proba_par_blocs(model, X, taille_bloc: int = 2000) -> np.ndarray:
+    """
+    `predict_proba` par blocs de lignes : la mémoire reste bornée quelle que soit la taille de X.
+
+    :param model: Modèle entraîné
+    :param X: Données à évaluer (DataFrame ou matrice de variables)
+    :param taille_bloc: Nombre de lignes par bloc
+    :return: Probabilités (n_lignes x n_classes, ordre de `model.classes_`)
+    :rtype: np.ndarray
+    """
+    n = X.shape[0]
+    blocs = [model.predict_proba(_lignes(X, slice(i, i + taille_bloc))) for i in range(0, n, taille_bloc)]
+    return np.vstack(blocs) if blocs else np.zeros((0, len(model.classes_)))
+
+
+def probas_hors_echantillon(
+    model,
+    X,
+    y: pd.Series,
+    n_splits: int = 5,
+    taille_bloc: int = 2000,
+    random_state: int = 1,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Probabilités hors échantillon : pour chaque pli, une copie du modèle est entraînée sur les
+    autres plis puis évalue (par blocs) les parfums du pli.
+
+    :param model: Modèle (ou pipeline) scikit-learn, entraîné ou non (seuls ses paramètres servent)
+    :param X: Variables explicatives (DataFrame pour un pipeline, matrice pour un classifieur seul)
+    :param y: Catégorie de prix
+    :param n_splits: Nombre de plis
+    :param taille_bloc: Taille des blocs de prédiction
+    :param random_state: Graine du découpage
+    :return: (probabilités n_parfums x n_classes, classes)
+    :rtype: tuple[np.ndarray, np.ndarray]
+    """
+    y = pd.Series(y).reset_index(drop=True)
+    classes = np.array(sorted(y.unique()))
+    proba = np.zeros((X.shape[0], len(classes)), dtype=float)
+    cv = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    for train, test in cv.split(np.zeros(len(y)), y):
+        m = clone(model).fit(_lignes(X, train), y.iloc[train])
+        cols = np.searchsorted(classes, m.classes_)
+        proba[np.ix_(test, cols)] = predict_proba_par_blocs(m, _lignes(X, test), taille_bloc)
+    return proba, classes
+
+
+def table_positionnement(
+    df: pd.DataFrame,
+    proba: np.ndarray,
+    classes: np.ndarray,
+    ordre: Optional[list[str]] = None,
+    seuil: float = SEUIL_ECART,
+) -> pd.DataFrame:
+    """
+    Tableau de positionnement, trié des écarts les plus forts aux plus faibles.
+
+    - Marge : probabilité de la classe prédite moins celle de la classe réelle (0 si elles coïncident),
+    - Rang_attendu : espérance du rang de prix (0 = Mass Market, 1 = Prestige, 2 = Niche),
+    - Ecart : rang réel - rang attendu (> 0 : plus cher qu'attendu, donc surpositionné).
+
+    :param df: Catalogue (mêmes lignes que `proba`)
+    :param proba: Probabilités hors échantillon
+    :param classes: Classes des colonnes de `proba`
+    :param ordre: Catégories de la moins chère à la plus chère (par défaut `ORDRE_PRIX`)
+    :param seuil: |Ecart| à partir duquel un parfum est sur- ou sous-positionné
+    :return: Tableau aux colonnes `POSITIONNEMENT_COLS`
+    :rtype: pd.DataFrame
+    """
+    ordre = ORDRE_PRIX if ordre is None else ordre
+    classes = np.asarray(classes)
+    reel = df["Prix_Categorie"].astype(str).to_numpy()
+    colonne = {str(c): j for j, c in enumerate(classes)}
+    i_reel = np.array([colonne.get(c, -1) for c in reel], dtype=np.int64)
+    i_pred = proba.argmax(axis=1)
+    lignes = np.arange(len(df))
+
+    p_reel = np.where(i_reel >= 0, proba[lignes, np.maximum(i_reel, 0)], 0.0)
+    p_pred = proba[lignes, i_pred]
+    rangs = np.array([ordre.index(c) if c in ordre else np.nan for c in classes], dtype=float)
+    rang_attendu = proba @ np.nan_to_num(rangs)
+    rang_reel = np.array([ordre.index(c) if c in ordre else np.nan for c in reel], dtype=float)
+    ecart = rang_reel - rang_attendu
+
+    out = pd.DataFrame({
+        "Fragrance": df["Fragrance"].to_numpy() if "Fragrance" in df.columns else "",
+        "Marque": df["Marque"].to_numpy() if "Marque" in df.columns else "",
+        "Prix_Categorie": reel,
+        "Prédiction": classes[i_pred],
+        "Proba_reelle": p_reel,
+        "Proba_predite": p_pred,
+        "Marge": p_pred - p_reel,
+        "Rang_attendu": rang_attendu,
+        "Ecart": ecart,
+    }, index=df.index)
+    out["Positionnement"] = np.select(
+        [out["Ecart"] >= seuil, out["Ecart"] <= -seuil], ["Surpositionné", "Sous-positionné"], "Cohérent"
+    )
+    return out.iloc[np.argsort(-np.abs(np.nan_to_num(ecart)), kind="stable")][POSITIONNEMENT_COLS]
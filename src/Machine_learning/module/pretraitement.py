@@ -0,0 +1,135 @@
+"""
+Configuration de prétraitement partagée par les modèles et le moteur de similarité.
+
+Colonnes utilisées, paramètres des vectoriseurs TF-IDF et préparation de X / y :
+le même schéma sert à l'entraînement (`Model_GB.py`), à l'application et à la
+recherche de parfums similaires.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator
+from sklearn.compose import ColumnTransformer
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
+from sklearn.feature_selection import SelectKBest, SelectorMixin, chi2
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder
+
+ROOT = Path(__file__).resolve().parents[3]
+DATA_DIR = ROOT / "data"
+CSV_PATH = DATA_DIR / "parfums_data_base_machineLearning.csv"
+MODEL_PATH = ROOT / "src" / "Machine_learning" / "best_model.pkl"
+
+TARGET = "Prix_Categorie"
+TEXT_COLS = ["Ingredients_txt", "Concepts_txt"]
+CAT_COLS = ["Famille", "Sous_famille", "Parfumeur", "Origine", "Genre"]
+NUM_COLS = ["Année"]
+DROP_COLS = [TARGET, "Fragrance", "Marque"]
+
+# Paramètres des TfidfVectorizer (un par colonne texte)
+TFIDF_PARAMS = {"min_df": 5, "ngram_range": (1, 2)}
+
+# Modes d'extraction des variables texte :
+#   - "tfidf" : vocabulaire appris (grossit avec le catalogue),
+#   - "hashing" : HashingVectorizer + TfidfTransformer, dimension fixe `n_hash` par colonne, sans vocabulaire,
+#   - "chi2" : TF-IDF puis les `k_chi2` termes les plus liés à la catégorie de prix (test du chi²) par colonne.
+MODES_TEXTE = ("tfidf", "hashing", "chi2")
+N_HASH = 2 ** 12
+K_CHI2 = 1000
+
+
+def prepare_X(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Prépare les variables explicatives : colonnes inutiles retirées, valeurs manquantes remplies.
+
+    :param df: DataFrame de parfums (base Machine Learning)
+    :type df: pd.DataFrame
+    :return: DataFrame X (texte vide, catégories "Inconnu", année médiane)
+    :rtype: pd.DataFrame
+    """
+    X = df.drop(columns=[c for c in DROP_COLS if c in df.columns])
+    for c in TEXT_COLS:
+        X[c] = X[c].fillna("")
+    for c in CAT_COLS:
+        X[c] = X[c].fillna("Inconnu")
+    for c in NUM_COLS:
+        X[c] = X[c].fillna(X[c].median())
+    return X
+
+
+def prepare_y(df: pd.DataFrame) -> pd.Series:
+    """
+    Retourne la variable cible (catégorie de prix).
+
+    :param df: DataFrame de parfums
+    :type df: pd.DataFrame
+    :return: Série cible
+    :rtype: pd.Series
+    """
+    return df[TARGET]
+
+
+class SelectKBestBorne(SelectorMixin, BaseEstimator):
+    """
+    `SelectKBest` dont `k` est borné à la taille du vocabulaire : tous les termes sont gardés,
+    sans avertissement, s'il en compte moins de `k`.
+
+    :param score_func: Fonction de score (ex. `chi2`)
+    :param k: Nombre maximal de termes gardés
+    """
+
+    def __init__(self, score_func=chi2, k: int = K_CHI2):
+        self.score_func = score_func
+        self.k = k
+
+    def fit(self, X, y=None):
+        self.selecteur_ = SelectKBest(self.score_func, k=min(self.k, X.shape[1])).fit(X, y)
+        self.n_features_in_ = self.selecteur_.n_features_in_
+        self.scores_ = self.selecteur_.scores_
+        return self
+
+    def _get_support_mask(self):
+        return self.selecteur_.get_support()
+
+
+def _float32(X):
+    return np.asarray(X, dtype=np.float32)
+
+
+def _texte(mode: str, n_hash: int, k_chi2: int, dtype):
+    """Transformeur d'une colonne texte selon le mode d'extraction."""
+    if mode == "tfidf":
+        return TfidfVectorizer(**TFIDF_PARAMS, dtype=dtype)
+    if mode == "hashing":
+        return make_pipeline(
+            HashingVectorizer(n_features=n_hash, ngram_range=TFIDF_PARAMS["ngram_range"], alternate_sign=False, norm=None, dtype=dtype),
+            TfidfTransformer(),
+        )
+    if mode == "chi2":
+        return make_pipeline(TfidfVectorizer(**TFIDF_PARAMS, dtype=dtype), SelectKBestBorne(chi2, k=k_chi2))
+    raise ValueError(f"Mode inconnu : {mode} (attendu : {', '.join(MODES_TEXTE)})")
+
+
+def build_preprocess(mode: str = "tfidf", n_hash: int = N_HASH, k_chi2: int = K_CHI2, float32: bool = False) -> ColumnTransformer:
+    """
+    ColumnTransformer du modèle : variables texte selon `mode`, one-hot des catégories, année brute.
+
+    :param mode: Extraction des variables texte (`MODES_TEXTE`)
+    :param n_hash: Dimension par colonne texte en mode "hashing"
+    :param k_chi2: Termes gardés par colonne texte en mode "chi2" (au plus la taille du vocabulaire)
+    :param float32: Matrices en float32 (moitié moins de mémoire qu'en float64)
+    :return: Préprocesseur non entraîné
+    :rtype: ColumnTransformer
+    """
+    dtype = np.float32 if float32 else np.float64
+    return ColumnTransformer(
+        transformers=[
+            ("ing", _texte(mode, n_hash, k_chi2, dtype), "Ingredients_txt"),
+            ("con", _texte(mode, n_hash, k_chi2, dtype), "Concepts_txt"),
+            ("cat", OneHotEncoder(handle_unknown="ignore", dtype=dtype), CAT_COLS),
+            # L'année (entière) convertie en float32 pour que la matrice assemblée le reste
+            ("num", FunctionTransformer(_float32, feature_names_out="one-to-one") if float32 else "passthrough", NUM_COLS),
+        ]
+    )
@@ -0,0 +1,209 @@
+"""
+Réentraînement incrémental du modèle quand le catalogue grossit.
+
+Après une recherche complète (`Model_GB.py`), les hyperparamètres retenus et des
+mesures de référence sont enregistrés à côté du modèle (best_model.json). Un
+rafraîchissement réutilise ensuite le préprocesseur déjà entraîné (vocabulaires
+TF-IDF et catégories figés) et :
+    - « warm » : ajoute quelques arbres au GradientBoosting (`warm_start`),
+    - « fixe » : réentraîne le classifieur avec les hyperparamètres retenus.
+La recherche complète n'est relancée que si une dérive des données (termes hors
+vocabulaire, catégories inconnues, répartition des classes) ou une baisse du
+score sur le jeu de test est détectée. Ces références (« derive », « test ») sont
+celles de la dernière recherche complète : un rafraîchissement les conserve, sans
+quoi une dérive ou une baisse lente passerait inaperçue d'un rafraîchissement à l'autre.
+
+Le jeu de test est choisi par hachage de (Marque, Fragrance) : un parfum reste
+dans le même jeu quand le catalogue grossit, l'ancien modèle ne l'a donc jamais vu.
+"""
+
+import copy
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.pipeline import Pipeline
+
+from src.Machine_learning.module.pretraitement import CAT_COLS, MODEL_PATH, TEXT_COLS
+
+META_PATH = MODEL_PATH.with_suffix(".json")
+
+# Seuils de dérive au-delà desquels la recherche complète est relancée
+SEUILS_DERIVE = {"hors_vocabulaire": 0.02, "categories_inconnues": 0.05, "ecart_classes": 0.05}
+
+# Baisse de F1 macro (sur le jeu de test) tolérée avant de relancer la recherche
+TOLERANCE_F1 = 0.02
+
+
+def split_stable(df: pd.DataFrame, part_test: float = 0.2) -> np.ndarray:
+    """
+    Masque du jeu de test, stable quand des parfums sont ajoutés (hachage de Marque + Fragrance).
+
+    :param df: Catalogue
+    :param part_test: Part approximative du jeu de test
+    :return: Masque booléen (True = test)
+    :rtype: np.ndarray
+    """
+    cles = (df["Marque"].astype(str) + "\x1f" + df["Fragrance"].astype(str)).to_numpy()
+    seaux = np.array([int.from_bytes(hashlib.sha1(c.encode("utf-8")).digest()[:4], "big") for c in cles])
+    return seaux % 10_000 < part_test * 10_000
+
+
+def repartition(y: pd.Series) -> dict:
+    """Part de chaque classe."""
+    return {str(k): float(v) for k, v in pd.Series(y).value_counts(normalize=True).sort_index().items()}
+
+
+def mesurer_derive(prep, X: pd.DataFrame, y: pd.Series) -> dict:
+    """
+    Mesures de dérive des données par rapport au préprocesseur entraîné.
+
+    - hors_vocabulaire : part des termes (unigrammes et bigrammes) absents des vocabulaires TF-IDF
+      (toujours 0 en mode "hashing", sans vocabulaire),
+    - categories_inconnues : part des parfums ayant au moins une catégorie jamais vue,
+    - classes : répartition des catégories de prix.
+
+    :param prep: ColumnTransformer entraîné (`build_preprocess`)
+    :param X: Variables explicatives
+    :param y: Catégorie de prix
+    :return: Mesures (comparables à celles enregistrées à l'entraînement)
+    :rtype: dict
+    """
+    hors, total = 0, 0
+    for nom, col in zip(("ing", "con"), TEXT_COLS):
+        vec = prep.named_transformers_[nom]
+        vec = vec.steps[0][1] if hasattr(vec, "steps") else vec
+        vocabulaire = getattr(vec, "vocabulary_", None)
+        if vocabulaire is None:
+            continue
+        analyse = vec.build_analyzer()
+        for texte in X[col].fillna("").astype(str):
+            termes = analyse(texte)
+            total += len(termes)
+            hors += sum(t not in vocabulaire for t in termes)
+
+    encodeur = prep.named_transformers_["cat"]
+    inconnue = np.zeros(len(X), dtype=bool)
+    for col, connues in zip(CAT_COLS, encodeur.categories_):
+        inconnue |= ~X[col].astype(str).isin(set(map(str, connues))).to_numpy()
+
+    return {
+        "hors_vocabulaire": hors / total if total else 0.0,
+        "categories_inconnues": float(inconnue.mean()) if len(X) else 0.0,
+        "classes": repartition(y),
+    }
+
+
+def ecarts_derive(reference: dict, actuelle: dict) -> dict:
+    """
+    Écarts entre les mesures de dérive de l'entraînement et celles du catalogue actuel.
+
+    :return: Écart par mesure (augmentation des taux, distance de variation totale des classes)
+    :rtype: dict
+    """
+    classes = set(reference.get("classes", {})) | set(actuelle["classes"])
+    return {
+        "hors_vocabulaire": actuelle["hors_vocabulaire"] - reference.get("hors_vocabulaire", actuelle["hors_vocabulaire"]),
+        "categories_inconnues": actuelle["categories_inconnues"] - reference.get("categories_inconnues", 0.0),
+        "ecart_classes": 0.5 * sum(
+            abs(actuelle["classes"].get(c, 0.0) - reference.get("classes", actuelle["classes"]).get(c, 0.0)) for c in classes
+        ),
+    }
+
+
+def scores(model, X: pd.DataFrame, y: pd.Series) -> dict:
+    """F1 macro, exactitude et F1 par classe sur (X, y)."""
+    pred = model.predict(X)
+    classes = sorted(pd.Series(y).unique())
+    par_classe = f1_score(y, pred, labels=classes, average=None)
+    return {
+        "f1_macro": float(f1_score(y, pred, average="macro")),
+        "exactitude": float(accuracy_score(y, pred)),
+        **{f"f1_{c}": float(v) for c, v in zip(classes, par_classe)},
+    }
+
+
+def rafraichir(model: Pipeline, X: pd.DataFrame, y: pd.Series, mode: str = "warm", n_ajout: int = 20, parametres: Optional[dict] = None) -> Pipeline:
+    """
+    Réentraîne le classifieur sans réapprendre le préprocesseur (vocabulaires et catégories figés).
+
+    :param model: Pipeline entraîné (`prep`, `clf`)
+    :param X: Variables explicatives (catalogue actuel, jeu d'entraînement)
+    :param y: Catégorie de prix
+    :param mode: "warm" (ajout de `n_ajout` arbres, `warm_start`) ou "fixe" (réentraînement complet du classifieur)
+    :param n_ajout: Nombre d'arbres ajoutés en mode "warm"
+    :param parametres: Hyperparamètres retenus (`clf__...`) appliqués en mode "fixe"
+    :return: Nouveau pipeline (le modèle d'origine n'est pas modifié)
+    :rtype: Pipeline
+    """
+    prep = model.named_steps["prep"]
+    Xt = prep.transform(X)
+    if mode == "warm":
+        clf = copy.deepcopy(model.named_steps["clf"])
+        clf.set_params(warm_start=True, n_estimators=clf.n_estimators + n_ajout)
+    elif mode == "fixe":
+        clf = clone(model.named_steps["clf"]).set_params(warm_start=False)
+        clf.set_params(**{k.removeprefix("clf__"): v for k, v in (parametres or {}).items() if k.startswith("clf__")})
+    else:
+        raise ValueError(f"Mode inconnu : {mode} (attendu : warm, fixe)")
+    clf.fit(Xt, y)
+    return Pipeline([("prep", prep), ("clf", clf)])
+
+
+def _jsonable(v):
+    if isinstance(v, np.generic):
+        return v.item()
+    if isinstance(v, dict):
+        return {str(k): _jsonable(x) for k, x in v.items()}
+    return v
+
+
+def construire_meta(model: Pipeline, X_train: pd.DataFrame, y_train: pd.Series, score_test: dict,
+                    parametres: dict, version: str, mode: str, variables: Optional[dict] = None,
+                    entrainement: Optional[dict] = None, reference: Optional[dict] = None) -> dict:
+    """
+    Métadonnées enregistrées avec le modèle : paramètres, options des variables, parallélisme et utilisation CPU,
+    références de dérive et de score de test, score du modèle enregistré.
+
+    :param reference: métadonnées précédentes, lors d'un rafraîchissement (préprocesseur inchangé) : leurs références
+        (dérive, score de test de la dernière recherche complète) sont conservées telles quelles. None après une
+        recherche complète : le modèle devient la nouvelle référence.
+    """
+    date = datetime.now().isoformat(timespec="seconds")
+    if reference and "derive" in reference and "test" in reference:
+        derive, test, date_reference = reference["derive"], reference["test"], reference.get("reference", reference.get("date"))
+    else:
+        derive, test, date_reference = mesurer_derive(model.named_steps["prep"], X_train, y_train), score_test, date
+    return _jsonable({
+        "date": date,
+        "mode": mode,
+        "version": version,
+        "n_train": len(X_train),
+        "n_estimators": model.named_steps["clf"].n_estimators,
+        "parametres": parametres,
+        "variables": variables or {},
+        "entrainement": entrainement or {},
+        "reference": date_reference,
+        "derive": derive,
+        "test": test,
+        "score": score_test,
+    })
+
+
+def charger_meta(path: Path = META_PATH) -> Optional[dict]:
+    """Métadonnées du dernier entraînement, ou None si absentes."""
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def sauver_meta(meta: dict, path: Path = META_PATH):
+    """Enregistre les métadonnées du modèle (JSON)."""
+    Path(path).write_text(json.dumps(meta, indent=2, ensure_ascii=False), encoding="utf-8")
@@ -0,0 +1,240 @@
+"""
+Évaluation par lots de fichiers de parfums (CSV ou Parquet) avec le modèle sauvegardé.
+
+Le fichier est lu par blocs, chaque bloc est normalisé comme le formulaire Prédire
+(`normaliser_entrees`) puis évalué par un pool de processus (un modèle chargé par
+processus). Les résultats sont écrits au fil de l'eau, dans l'ordre du fichier :
+la mémoire reste bornée par quelques blocs quelle que soit la taille de l'entrée.
+"""
+
+import multiprocessing as mp
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Iterator, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.app.module.fonction_prediction import normaliser_entrees
+
+FORMATS = (".csv", ".parquet")
+
+# Modèle du processus courant (chargé une fois par processus du pool)
+_MODELE = None
+
+
+def _format(path: Path) -> str:
+    suffixe = Path(path).suffix.lower()
+    if suffixe not in FORMATS:
+        raise ValueError(f"Format non pris en charge : {suffixe or '(aucun)'} (attendu : {', '.join(FORMATS)})")
+    return suffixe
+
+
+def lire_blocs(path: Path, taille_bloc: int = 5000) -> Iterator[pd.DataFrame]:
+    """
+    Lit un fichier CSV ou Parquet par blocs de `taille_bloc` lignes.
+
+    :param path: Fichier d'entrée
+    :param taille_bloc: Nombre de lignes par bloc
+    :return: Itérateur de DataFrames
+    :rtype: Iterator[pd.DataFrame]
+    """
+    if _format(path) == ".csv":
+        yield from pd.read_csv(path, chunksize=taille_bloc, encoding="utf-8")
+        return
+    import pyarrow.parquet as pq
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=taille_bloc):
+        yield batch.to_pandas()
+
+
+def nombre_lignes(path: Path) -> Optional[int]:
+    """Nombre de lignes du fichier s'il est connu sans le lire (métadonnées Parquet), sinon None."""
+    if _format(path) != ".parquet":
+        return None
+    import pyarrow.parquet as pq
+
+    return pq.ParquetFile(path).metadata.num_rows
+
+
+def schema_sortie(entree: Path, classes):
+    """
+    Schéma Parquet fixe des résultats, connu avant de lire le premier bloc.
+
+    Les colonnes d'origine gardent le type du Parquet d'entrée (colonne sans type -> texte) ;
+    celles d'un CSV sont du texte, sauf `Année` (réel). Suivent la prédiction, sa probabilité
+    et une colonne `Proba_<classe>` par classe.
+
+    :param entree: Fichier d'entrée (CSV / Parquet)
+    :param classes: Classes du modèle
+    :return: Schéma des résultats
+    :rtype: pyarrow.Schema
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if _format(entree) == ".parquet":
+        champs = [
+            pa.field(f.name, pa.string() if pa.types.is_null(f.type) else f.type)
+            for f in pq.read_schema(entree).remove_metadata()
+            if not f.name.startswith("__index_level_")
+        ]
+    else:
+        colonnes = pd.read_csv(entree, nrows=0, encoding="utf-8").columns
+        champs = [pa.field(c, pa.float64() if c == "Année" else pa.string()) for c in colonnes]
+    champs += [pa.field("Prédiction", pa.string()), pa.field("Proba_prediction", pa.float64())]
+    champs += [pa.field(f"Proba_{c}", pa.float64()) for c in classes]
+    return pa.schema(champs)
+
+
+def _table(df: pd.DataFrame, schema):
+    # Conversion d'un bloc au schéma fixe (un bloc où une colonne est vide n'en change pas le type)
+    import pyarrow as pa
+
+    colonnes = {}
+    for champ in schema:
+        v = df[champ.name] if champ.name in df.columns else pd.Series(None, index=df.index, dtype=object)
+        if pa.types.is_string(champ.type) or pa.types.is_large_string(champ.type):
+            v = v.astype("string")
+        elif pa.types.is_floating(champ.type):
+            v = pd.to_numeric(v, errors="coerce")
+        colonnes[champ.name] = v
+    return pa.Table.from_pandas(pd.DataFrame(colonnes), schema=schema, preserve_index=False)
+
+
+class Ecrivain:
+    """
+    Écriture incrémentale des résultats (CSV : ajout de lignes ; Parquet : un groupe de lignes par bloc).
+
+    :param path: Fichier de sortie (.csv ou .parquet), remplacé s'il existe
+    :param schema: Schéma Parquet des résultats (`schema_sortie`) ; par défaut celui du premier bloc
+    """
+
+    def __init__(self, path: Path, schema=None):
+        self.path = Path(path)
+        self.format = _format(self.path)
+        self.schema = schema
+        self._writer = None
+        self._premier = True
+
+    def ecrire(self, df: pd.DataFrame):
+        if self.format == ".csv":
+            df.to_csv(self.path, mode="w" if self._premier else "a", header=self._premier, index=False, encoding="utf-8")
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False) if self.schema is None else _table(df, self.schema)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table.cast(self._writer.schema))
+        self._premier = False
+
+    def fermer(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def _init_processus(model_path: str):
+    global _MODELE
+    _MODELE = joblib.load(model_path)
+
+
+def _probas(X: pd.DataFrame, model=None) -> np.ndarray:
+    return np.asarray((model if model is not None else _MODELE).predict_proba(X), dtype=float)
+
+
+def resultats_bloc(bloc: pd.DataFrame, proba: np.ndarray, classes) -> pd.DataFrame:
+    """
+    Bloc d'entrée complété par la prédiction, sa probabilité et une colonne `Proba_<classe>` par classe.
+
+    :param bloc: Lignes d'entrée (colonnes d'origine conservées)
+    :param proba: Probabilités du modèle pour ces lignes
+    :param classes: Classes du modèle
+    :return: DataFrame de sortie
+    :rtype: pd.DataFrame
+    """
+    classes = np.asarray([str(c) for c in classes])
+    out = bloc.reset_index(drop=True).copy()
+    i_pred = proba.argmax(axis=1)
+    out["Prédiction"] = classes[i_pred]
+    out["Proba_prediction"] = proba[np.arange(len(proba)), i_pred]
+    for j, c in enumerate(classes):
+        out[f"Proba_{c}"] = proba[:, j]
+    return out
+
+
+def scorer_fichier(
+    entree: Path,
+    sortie: Path,
+    model_path: Path,
+    taille_bloc: int = 5000,
+    processus: int = 1,
+    progression: bool = True,
+) -> dict:
+    """
+    Évalue toutes les lignes de `entree` et écrit les prédictions dans `sortie`, bloc par bloc.
+
+    Avec `processus > 1`, les blocs sont évalués en parallèle (au plus 2 blocs en attente par
+    processus) et réécrits dans l'ordre d'origine.
+
+    :param entree: Fichier CSV / Parquet des parfums (colonnes `FEATURE_COLS`)
+    :param sortie: Fichier CSV / Parquet de sortie
+    :param model_path: Modèle sauvegardé (`best_model.pkl`)
+    :param taille_bloc: Nombre de lignes par bloc
+    :param processus: Nombre de processus (1 = évaluation dans le processus courant)
+    :param progression: Afficher la progression sur la sortie d'erreur
+    :return: Lignes, blocs, durée (s) et débit (lignes/s)
+    :rtype: dict
+    :raises ValueError: Format de fichier ou colonnes invalides
+    """
+    _format(entree)
+    modele = joblib.load(model_path)
+    classes = list(modele.classes_)
+    ecrivain = Ecrivain(sortie, schema_sortie(entree, [str(c) for c in classes]) if _format(sortie) == ".parquet" else None)
+    total = nombre_lignes(entree)
+    pool = None
+    if processus > 1:
+        pool = mp.get_context("spawn").Pool(processus, initializer=_init_processus, initargs=(str(model_path),))
+
+    lignes = blocs = 0
+    t0 = time.perf_counter()
+
+    def ecrire(bloc: pd.DataFrame, proba: np.ndarray):
+        nonlocal lignes, blocs
+        ecrivain.ecrire(resultats_bloc(bloc, proba, classes))
+        lignes += len(bloc)
+        blocs += 1
+        if progression:
+            duree = time.perf_counter() - t0
+            sur = f"/{total}" if total else ""
+            print(f"\r{lignes}{sur} lignes - {lignes / max(duree, 1e-9):,.0f} lignes/s", end="", file=sys.stderr, flush=True)
+
+    try:
+        en_cours = deque()
+        for bloc in lire_blocs(entree, taille_bloc):
+            X = normaliser_entrees(bloc)
+            if pool is None:
+                ecrire(bloc, _probas(X, modele))
+                continue
+            en_cours.append((bloc, pool.apply_async(_probas, (X,))))
+            if len(en_cours) >= 2 * processus:
+                bloc_fini, resultat = en_cours.popleft()
+                ecrire(bloc_fini, resultat.get())
+        while en_cours:
+            bloc_fini, resultat = en_cours.popleft()
+            ecrire(bloc_fini, resultat.get())
+    finally:
+        ecrivain.fermer()
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    duree = time.perf_counter() - t0
+    if progression:
+        print(file=sys.stderr)
+    return {"lignes": lignes, "blocs": blocs, "duree_s": duree, "lignes_par_s": lignes / max(duree, 1e-9)}
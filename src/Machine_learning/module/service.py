@@ -0,0 +1,235 @@
+"""
+Service de prédiction : regroupement des requêtes en micro-lots et métriques.
+
+Chaque requête HTTP arrive dans son propre thread. Au lieu d'appeler le pipeline
+(ColumnTransformer + GradientBoosting) ligne par ligne, les requêtes reçues dans
+une fenêtre de quelques millisecondes sont concaténées et évaluées en un seul
+`predict_proba` vectorisé par un thread dédié (`MicroBatcher`), puis chaque
+requête récupère ses lignes.
+"""
+
+import bisect
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.app.module.fonction_prediction import FEATURE_COLS, Prediction, normaliser_entrees, prediction_depuis_proba
+
+# Bornes (ms) des histogrammes de latence
+BORNES_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+
+# Bornes des histogrammes de taille de lot (lignes)
+BORNES_LOT = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+class Histogramme:
+    """
+    Histogramme cumulatif à bornes fixes, sûr entre threads.
+
+    :param bornes: Bornes supérieures des classes (une classe « au-delà » est ajoutée)
+    """
+
+    def __init__(self, bornes=BORNES_MS):
+        self.bornes = tuple(bornes)
+        self.comptes = [0] * (len(self.bornes) + 1)
+        self.n = 0
+        self.somme = 0.0
+        self._lock = threading.Lock()
+
+    def observer(self, valeur: float):
+        """Ajoute une observation."""
+        i = bisect.bisect_left(self.bornes, valeur)
+        with self._lock:
+            self.comptes[i] += 1
+            self.n += 1
+            self.somme += valeur
+
+    def quantile(self, q: float) -> float:
+        """Borne supérieure de la classe qui contient le quantile `q` (inf au-delà de la dernière borne)."""
+        with self._lock:
+            if not self.n:
+                return 0.0
+            cible = q * self.n
+            cumul = 0
+            for i, c in enumerate(self.comptes):
+                cumul += c
+                if cumul >= cible:
+                    return float(self.bornes[i]) if i < len(self.bornes) else float("inf")
+        return float("inf")
+
+    def etat(self) -> dict:
+        """Comptes par classe (`le` = borne supérieure), nombre, moyenne et quantiles p50 / p95 / p99."""
+        quantiles = {f"p{int(q * 100)}": self.quantile(q) for q in (0.5, 0.95, 0.99)}
+        with self._lock:
+            classes = [{"le": b, "n": c} for b, c in zip(list(self.bornes) + ["inf"], self.comptes)]
+            return {
+                "n": self.n,
+                "moyenne": self.somme / self.n if self.n else 0.0,
+                **quantiles,
+                "classes": classes,
+            }
+
+
+def lignes_depuis_payload(payload) -> tuple[pd.DataFrame, bool]:
+    """
+    Convertit un corps JSON en DataFrame d'entrée du modèle (schéma `FEATURE_COLS`, comme `X_new`).
+
+    Formats acceptés : un objet (une ligne), une liste d'objets, ou `{"instances": [...]}`.
+    Les colonnes texte acceptent une chaîne ou une liste de termes. Chaque ligne est normalisée par
+    `cle_prediction` (via `normaliser_entrees`), comme une saisie du formulaire Prédire : une même
+    combinaison donne la même entrée du modèle, donc la même prédiction, quel que soit le chemin.
+
+    :param payload: Corps JSON décodé
+    :return: (DataFrame, True si la requête portait sur un lot)
+    :rtype: tuple[pd.DataFrame, bool]
+    :raises ValueError: Format invalide ou colonnes manquantes
+    """
+    if isinstance(payload, dict) and "instances" in payload:
+        payload = payload["instances"]
+    lot = isinstance(payload, list)
+    lignes = payload if lot else [payload]
+    if not lignes or not all(isinstance(l, dict) for l in lignes):
+        raise ValueError("Le corps doit être un objet, une liste d'objets ou {\"instances\": [...]} non vide.")
+
+    manquantes = sorted({c for l in lignes for c in FEATURE_COLS if c not in l})
+    if manquantes:
+        raise ValueError(f"Colonnes manquantes : {', '.join(manquantes)}")
+
+    X = normaliser_entrees(pd.DataFrame([{c: l[c] for c in FEATURE_COLS} for l in lignes], columns=FEATURE_COLS))
+    return X, lot
+
+
+@dataclass
+class _Demande:
+    X: pd.DataFrame
+    futur: Future
+    debut: float
+
+
+class MicroBatcher:
+    """
+    Regroupe les demandes concurrentes en micro-lots évalués par un seul `predict_proba`.
+
+    Le premier élément d'un lot ouvre une fenêtre de `fenetre_ms` ; le lot part à la fin de
+    la fenêtre ou dès qu'il atteint `taille_max` lignes.
+    Si l'évaluation du lot échoue, chaque demande est réévaluée seule : seules celles qui
+    échouent encore reçoivent l'exception.
+
+    :param model: Pipeline scikit-learn entraîné (avec `predict_proba` et `classes_`)
+    :param fenetre_ms: Durée maximale d'attente d'autres demandes
+    :param taille_max: Nombre maximal de lignes par lot
+    """
+
+    def __init__(self, model, fenetre_ms: float = 5.0, taille_max: int = 256):
+        self.model = model
+        self.classes = [str(c) for c in model.classes_]
+        self.fenetre = fenetre_ms / 1000
+        self.taille_max = max(int(taille_max), 1)
+        self.latence_ms = Histogramme(BORNES_MS)
+        self.modele_ms = Histogramme(BORNES_MS)
+        self.taille_lots = Histogramme(BORNES_LOT)
+        self.compteurs = {"requetes": 0, "lignes": 0, "lots": 0, "erreurs": 0}
+        self.debut = time.time()
+        self._lock = threading.Lock()
+        self._file: "queue.Queue[_Demande]" = queue.Queue()
+        self._arret = threading.Event()
+        self._thread = threading.Thread(target=self._boucle, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def _compter(self, **increments):
+        with self._lock:
+            for k, v in increments.items():
+                self.compteurs[k] += v
+
+    def soumettre(self, X: pd.DataFrame) -> Future:
+        """Met une demande en file ; le futur renvoie ses probabilités (n_lignes x n_classes)."""
+        futur = Future()
+        self._file.put(_Demande(X, futur, time.perf_counter()))
+        return futur
+
+    def predire(self, X: pd.DataFrame, timeout: Optional[float] = 30.0) -> list[Prediction]:
+        """
+        Prédit les lignes de `X` via le micro-lot en cours (appel bloquant).
+
+        :param X: DataFrame au schéma `FEATURE_COLS`
+        :param timeout: Attente maximale (s)
+        :return: Une prédiction par ligne
+        :rtype: list[Prediction]
+        """
+        proba = self.soumettre(X).result(timeout=timeout)
+        return [prediction_depuis_proba(self.classes, p) for p in proba]
+
+    def _boucle(self):
+        while not self._arret.is_set():
+            try:
+                premiere = self._file.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            lot = [premiere]
+            n = len(premiere.X)
+            echeance = time.perf_counter() + self.fenetre
+            while n < self.taille_max:
+                reste = echeance - time.perf_counter()
+                if reste <= 0:
+                    break
+                try:
+                    demande = self._file.get(timeout=reste)
+                except queue.Empty:
+                    break
+                lot.append(demande)
+                n += len(demande.X)
+            self._traiter(lot)
+
+    def _traiter(self, lot: list[_Demande]):
+        X = pd.concat([d.X for d in lot], ignore_index=True)
+        t0 = time.perf_counter()
+        try:
+            proba = np.asarray(self.model.predict_proba(X), dtype=float)
+        except Exception as e:
+            if len(lot) > 1:
+                # Une demande invalide ne fait pas échouer les autres : chacune est réévaluée seule
+                for d in lot:
+                    self._traiter([d])
+                return
+            self._compter(erreurs=1)
+            lot[0].futur.set_exception(e)
+            return
+        fin = time.perf_counter()
+        self.modele_ms.observer((fin - t0) * 1000)
+        self.taille_lots.observer(len(X))
+        self._compter(requetes=len(lot), lignes=len(X), lots=1)
+
+        debut = 0
+        for d in lot:
+            d.futur.set_result(proba[debut:debut + len(d.X)])
+            debut += len(d.X)
+            self.latence_ms.observer((fin - d.debut) * 1000)
+
+    def metriques(self) -> dict:
+        """Compteurs, débits (par seconde depuis le démarrage) et histogrammes."""
+        duree = max(time.time() - self.debut, 1e-9)
+        with self._lock:
+            compteurs = dict(self.compteurs)
+        return {
+            "compteurs": compteurs,
+            "debit": {
+                "requetes_par_s": compteurs["requetes"] / duree,
+                "lignes_par_s": compteurs["lignes"] / duree,
+                "lignes_par_lot": compteurs["lignes"] / compteurs["lots"] if compteurs["lots"] else 0.0,
+            },
+            "latence_ms": self.latence_ms.etat(),
+            "modele_ms": self.modele_ms.etat(),
+            "taille_lots": self.taille_lots.etat(),
+            "duree_s": duree,
+        }
+
+    def arreter(self):
+        """Arrête le thread de traitement."""
+        self._arret.set()
+        self._thread.join(timeout=1.0)
@@ -0,0 +1,131 @@
+"""
+Moteur de similarité entre parfums (« parfums proches »).
+
+Chaque parfum est représenté par un vecteur creux :
+    - un bloc TF-IDF par colonne texte (mêmes paramètres que le modèle, `TFIDF_PARAMS`),
+    - un bloc one-hot pour Famille, Sous_famille et Genre,
+chaque bloc étant normalisé puis pondéré, et le vecteur final normalisé (L2).
+La similarité cosinus est alors un simple produit scalaire : une requête est un
+produit matrice creuse x vecteur creux, suivi d'une sélection partielle des k meilleurs.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import OneHotEncoder, normalize
+
+from src.Machine_learning.module.pretraitement import TEXT_COLS, TFIDF_PARAMS
+
+SIM_CAT_COLS = ["Famille", "Sous_famille", "Genre"]
+
+# Poids de chaque bloc dans la similarité (texte et catégories)
+SIM_WEIGHTS = {"Ingredients_txt": 1.0, "Concepts_txt": 0.5, "categories": 0.5}
+
+
+class IndexSimilarite:
+    """
+    Index de similarité cosinus sur un DataFrame de parfums.
+
+    :param df: DataFrame de parfums
+    :type df: pd.DataFrame
+    :param weights: Poids des blocs (par défaut `SIM_WEIGHTS`)
+    :param tfidf_params: Paramètres des TfidfVectorizer (par défaut `TFIDF_PARAMS`)
+    """
+
+    def __init__(self, df: pd.DataFrame, weights: Optional[dict] = None, tfidf_params: Optional[dict] = None):
+        self.weights = dict(SIM_WEIGHTS if weights is None else weights)
+        params = dict(TFIDF_PARAMS if tfidf_params is None else tfidf_params)
+        # min_df est un nombre de documents : borné pour les petits jeux de données
+        if isinstance(params.get("min_df"), int):
+            params["min_df"] = max(1, min(params["min_df"], len(df) // 2))
+
+        self.n_rows = len(df)
+        self.vectorizers: dict[str, TfidfVectorizer] = {}
+        self.text_cols = [c for c in TEXT_COLS if c in df.columns]
+        self.cat_cols = [c for c in SIM_CAT_COLS if c in df.columns]
+        for col in self.text_cols:
+            vec = TfidfVectorizer(**params)
+            try:
+                vec.fit(df[col].fillna("").astype(str))
+            except ValueError:  # vocabulaire vide
+                continue
+            self.vectorizers[col] = vec
+        self.encoder = None
+        if self.cat_cols:
+            self.encoder = OneHotEncoder(handle_unknown="ignore").fit(self._categories(df))
+
+        self.X = self.transform(df)
+        # Colonnes de X en accès direct : une requête ne lit que les colonnes non nulles du vecteur
+        self.X_csc = self.X.tocsc()
+
+    def _categories(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df[self.cat_cols].fillna("Inconnu").astype(str)
+
+    def transform(self, df: pd.DataFrame) -> sparse.csr_matrix:
+        """
+        Vecteurs normalisés (CSR, float32) de parfums, nouveaux ou non.
+
+        :param df: DataFrame aux colonnes du catalogue
+        :type df: pd.DataFrame
+        :return: Matrice n_parfums x n_dimensions, lignes de norme 1 (ou nulles)
+        :rtype: sparse.csr_matrix
+        """
+        blocks = []
+        for col, vec in self.vectorizers.items():
+            B = vec.transform(df[col].fillna("").astype(str))
+            blocks.append(np.sqrt(self.weights.get(col, 1.0)) * normalize(B))
+        if self.encoder is not None:
+            B = self.encoder.transform(self._categories(df))
+            blocks.append(np.sqrt(self.weights.get("categories", 1.0)) * normalize(B))
+        if not blocks:
+            return sparse.csr_matrix((len(df), 0), dtype=np.float32)
+        return normalize(sparse.hstack(blocks, format="csr")).astype(np.float32)
+
+    def scores(self, v: sparse.csr_matrix) -> np.ndarray:
+        """
+        Similarité cosinus de tous les parfums avec un vecteur normalisé `v` (1 x d).
+
+        Seules les colonnes de `X` où `v` est non nul sont lues.
+        """
+        v = sparse.csr_matrix(v)
+        if not v.nnz:
+            return np.zeros(self.n_rows, dtype=np.float32)
+        return np.asarray(self.X_csc[:, v.indices] @ v.data, dtype=np.float32).ravel()
+
+    def top_k(self, scores: np.ndarray, k: int, exclure: Optional[int] = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Les `k` meilleurs scores (sélection partielle `argpartition`, puis tri des k).
+
+        :param scores: Scores de tous les parfums
+        :param k: Nombre de voisins
+        :param exclure: Position à exclure (le parfum requête)
+        :return: (positions, scores), du plus proche au moins proche
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        if exclure is not None:
+            scores = scores.copy()
+            scores[exclure] = -np.inf
+        k = min(int(k), len(scores) - (exclure is not None))
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((top, -scores[top]))]
+        return top, scores[top]
+
+    def voisins(self, position: int, k: int = 10) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Les `k` parfums les plus proches du parfum en `position` (lui-même exclu).
+
+        :param position: Position du parfum dans le DataFrame indexé
+        :param k: Nombre de voisins
+        :return: (positions, similarités)
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        return self.top_k(self.scores(self.X[position]), k, exclure=position)
+
+    def voisins_df(self, df_new: pd.DataFrame, k: int = 10) -> tuple[np.ndarray, np.ndarray]:
+        """Les `k` parfums les plus proches d'un parfum décrit par la première ligne de `df_new`."""
+        return self.top_k(self.scores(self.transform(df_new.iloc[:1])), k)
@@ -5,9 +5,34 @@ Fonctions avec cache pour le chargement des données et du modèle.
 import streamlit as st
 import pandas as pd
 import joblib
-import re
 from pathlib import Path
-from collections import Counter
+from src.app.module.fonction_catalogue import TERM_STATS_COLS, Catalogue, dataset_version, term_matrix, term_stats
+from src.app.module.fonction_prediction import PredictionCache
+from src.Machine_learning.module.contributions import Contributions
+from src.Machine_learning.module.lsh import IndexLSH
+from src.Machine_learning.module.similarite import IndexSimilarite
+
+def read_data(path: Path) -> pd.DataFrame:
+    """
+    Lit et nettoie le dataset des parfums (sans cache, lève une exception en cas d'erreur).
+
+    param path: Chemin du fichier CSV
+    type path: Path
+    return: DataFrame pandas contenant les données des parfums
+    rtype: pd.DataFrame
+    """
+    df = pd.read_csv(path, encoding="utf-8")
+    # Nettoyage basique
+    for col in ["Ingredients_txt", "Concepts_txt"]:
+        if col in df.columns:
+            df[col] = df[col].fillna("")
+    for col in ["Marque", "Famille", "Sous_famille", "Parfumeur", "Origine", "Genre", "Fragrance", "Prix_Categorie"]:
+        if col in df.columns:
+            df[col] = df[col].fillna("Inconnu")
+    if "Année" in df.columns:
+        df["Année"] = df["Année"].fillna(df["Année"].median()).astype(int)
+    return df
+
 
 @st.cache_data
 def load_data(path: Path) -> pd.DataFrame:
@@ -20,29 +45,138 @@ def load_data(path: Path) -> pd.DataFrame:
     rtype: pd.DataFrame
     """
     try:
-        df = pd.read_csv(path, encoding="utf-8")
-        # Nettoyage basique
-        for col in ["Ingredients_txt", "Concepts_txt"]:
-            if col in df.columns:
-                df[col] = df[col].fillna("")
-        for col in ["Marque", "Famille", "Sous_famille", "Parfumeur", "Origine", "Genre", "Fragrance", "Prix_Categorie"]:
-            if col in df.columns:
-                df[col] = df[col].fillna("Inconnu")
-        if "Année" in df.columns:
-            df["Année"] = df["Année"].fillna(df["Année"].median()).astype(int)
-        return df
+        return read_data(path)
     except Exception as e:
         st.error(f"Erreur de chargement des données : {e}")
         return pd.DataFrame()
 
 
-@st.cache_resource
-def load_model(path: Path):
+def load_catalogue(path: Path) -> Catalogue:
+    """
+    Retourne le catalogue précalculé correspondant à la version actuelle du fichier.
+
+    Seuls le chemin et la version (taille + date de modification) servent de clé de cache :
+    aucun DataFrame n'est haché. Un fichier modifié donne une nouvelle version, donc un
+    nouveau calcul.
+
+    param path: Chemin du fichier CSV
+    type path: Path
+    return: Catalogue (DataFrame + statistiques de termes + index)
+    rtype: Catalogue
+    """
+    return _build_catalogue(str(path), dataset_version(path))
+
+
+@st.cache_resource(max_entries=2)
+def _build_catalogue(path: str, version: str) -> Catalogue:
+    try:
+        df = read_data(Path(path))
+    except Exception as e:
+        st.error(f"Erreur de chargement des données : {e}")
+        df = pd.DataFrame()
+    return Catalogue.depuis_df(df, version)
+
+
+def load_similarite(path: Path) -> IndexSimilarite:
+    """
+    Retourne l'index de similarité des parfums pour la version actuelle du fichier.
+
+    param path: Chemin du fichier CSV
+    type path: Path
+    return: Index de similarité (vecteurs normalisés du catalogue)
+    rtype: IndexSimilarite
+    """
+    return _build_similarite(str(path), dataset_version(path))
+
+
+@st.cache_resource(max_entries=2)
+def _build_similarite(path: str, version: str) -> IndexSimilarite:
+    return IndexSimilarite(_build_catalogue(path, version).df)
+
+
+def load_lsh(dossier: Path, version: str) -> IndexLSH | None:
+    """
+    Charge en mémoire mappée l'index LSH construit par `Index_LSH.py` (relu s'il est reconstruit).
+
+    param dossier: Dossier de l'index
+    type dossier: Path
+    param version: Version actuelle du dataset (`Catalogue.version`)
+    type version: str
+    return: Index LSH, ou None s'il est absent ou construit sur une autre version du dataset
+    rtype: IndexLSH | None
+    """
+    meta = Path(dossier) / "meta.json"
+    if not meta.exists():
+        return None
+    index = _read_lsh(str(dossier), dataset_version(meta))
+    return index if index is not None and index.meta.get("version") == version else None
+
+
+@st.cache_resource(max_entries=2)
+def _read_lsh(dossier: str, version_index: str) -> IndexLSH | None:
+    try:
+        return IndexLSH.charger(Path(dossier), mmap=True)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def load_contributions(path: Path, version: str, modele: str) -> Contributions | None:
+    """
+    Charge les contributions des variables précalculées par `Contributions.py` (relues si elles sont régénérées).
+
+    param path: Fichier .npz des contributions
+    type path: Path
+    param version: Version actuelle du dataset (`Catalogue.version`)
+    type version: str
+    param modele: Version actuelle du fichier du modèle (`dataset_version(MODEL_PATH)`)
+    type modele: str
+    return: Contributions, ou None si elles sont absentes ou calculées sur un autre dataset ou un autre modèle
+    rtype: Contributions | None
+    """
+    if not Path(path).exists():
+        return None
+    contributions = _read_contributions(str(path), dataset_version(path))
+    if contributions is None or contributions.version != version or contributions.modele != modele:
+        return None
+    return contributions
+
+
+@st.cache_resource(max_entries=2)
+def _read_contributions(path: str, version_fichier: str) -> Contributions | None:
+    try:
+        return Contributions.charger(Path(path))
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def load_positionnement(path: Path) -> pd.DataFrame | None:
+    """
+    Retourne le tableau de positionnement calculé par `Positionnement.py` (relu s'il est régénéré).
+
+    param path: Chemin du fichier CSV du tableau
+    type path: Path
+    return: Tableau de positionnement, ou None s'il n'a pas encore été calculé
+    rtype: pd.DataFrame | None
+    """
+    if not Path(path).exists():
+        return None
+    return _read_positionnement(str(path), dataset_version(path))
+
+
+@st.cache_data(max_entries=2)
+def _read_positionnement(path: str, version: str) -> pd.DataFrame:
+    return pd.read_csv(path, encoding="utf-8")
+
+
+@st.cache_resource(max_entries=2)
+def load_model(path: Path, version: str = ""):
     """
     Charge le modèle de machine learning sauvegardé (format .pkl).
 
     param path: Chemin du fichier modèle
     type path: Path
+    param version: Version du fichier (`dataset_version(path)`) : un modèle réentraîné est relu
+    type version: str
     return: Modèle de machine learning chargé
     rtype: Any
     """
@@ -53,6 +187,27 @@ def load_model(path: Path):
         return None
 
 
+@st.cache_resource(max_entries=2)
+def load_prediction_cache(path: Path, version: str = "", maxsize: int = 2048):
+    """
+    Retourne le cache LRU de prédictions du modèle, partagé entre toutes les sessions.
+    Indexé par la version du fichier modèle : un modèle réentraîné repart d'un cache vide.
+
+    param path: Chemin du fichier modèle
+    type path: Path
+    param version: Version du fichier (`dataset_version(path)`)
+    type version: str
+    param maxsize: Nombre maximum de combinaisons mémorisées
+    type maxsize: int
+    return: Cache de prédictions, ou None si le modèle n'a pas pu être chargé
+    rtype: PredictionCache | None
+    """
+    model = load_model(path, version)
+    if model is None:
+        return None
+    return PredictionCache(model, maxsize=maxsize)
+
+
 @st.cache_data
 def build_term_stats(df_: pd.DataFrame, col: str) -> pd.DataFrame:
     """
@@ -62,36 +217,12 @@ def build_term_stats(df_: pd.DataFrame, col: str) -> pd.DataFrame:
         - nb de parfums contenant le terme ("Parfums")
         - nb d'occurrences totales ("Occurrences")
 
+    Dans l'application, préférer `load_catalogue(...).term_stats[col]`, calculé une fois par version.
+
     :param df_: DataFrame source
     :param col: Nom de la colonne texte
     :return: DataFrame avec colonnes Terme, Parfums, Occurrences
     """
     if col not in df_.columns or df_.empty:
-        return pd.DataFrame(columns=["Terme", "Parfums", "Occurrences"])
-    stopwords = {
-        "de", "d", "du", "des", "la", "le", "les", "l", "un", "une", "et", "ou",
-        "a", "à", "au", "aux", "en", "sur", "dans",
-    }
-    token_re = re.compile(r"[a-zA-ZÀ-ÖØ-öø-ÿ]+(?:'[a-zA-ZÀ-ÖØ-öø-ÿ]+)?")
-    perfumes_counter: Counter[str] = Counter()
-    occ_counter: Counter[str] = Counter()
-
-    for txt in df_[col].fillna("").astype(str):
-        tokens = [t.lower() for t in token_re.findall(txt)]
-        tokens = [t for t in tokens if t and t not in stopwords and len(t) >= 2]
-        if not tokens:
-            continue
-        occ_counter.update(tokens)
-        perfumes_counter.update(set(tokens))
-    out = (
-        pd.DataFrame(
-            {
-                "Terme": list(occ_counter.keys()),
-                "Parfums": [perfumes_counter[t] for t in occ_counter.keys()],
-                "Occurrences": [occ_counter[t] for t in occ_counter.keys()],
-            }
-        )
-        .sort_values(["Parfums", "Occurrences", "Terme"], ascending=[False, False, True])
-        .reset_index(drop=True)
-    )
-    return out
\ No newline at end of file
+        return pd.DataFrame(columns=TERM_STATS_COLS)
+    return term_stats(*term_matrix(df_[col]))
@@ -0,0 +1,261 @@
+"""
+Catalogue précalculé, identifié par une version de dataset.
+
+Toutes les structures dérivées du DataFrame (statistiques et associations de termes, index de
+filtres, index de recherche, cube de comptes, ordres de tri, options des widgets)
+sont construites une seule fois par version du fichier de données. Les caches
+Streamlit sont alors indexés par cette version (une courte chaîne) au lieu de
+hacher le DataFrame complet à chaque appel.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+
+from src.app.module.fonction_cooccurrence import associations_par_segment
+from src.app.module.fonction_cube import CubeStats
+from src.app.module.fonction_index import FILTER_COLS, FilterEngine, TermIndex
+from src.app.module.fonction_recherche import SearchIndex
+from src.app.module.fonction_requete import sort_orders
+
+TEXT_COLS = ["Ingredients_txt", "Concepts_txt"]
+
+# Tokenisation des statistiques de termes (mots, apostrophe interne autorisée)
+TOKEN_PATTERN = r"[a-zA-ZÀ-ÖØ-öø-ÿ]+(?:'[a-zA-ZÀ-ÖØ-öø-ÿ]+)?"
+STOPWORDS = frozenset({
+    "de", "d", "du", "des", "la", "le", "les", "l", "un", "une", "et", "ou",
+    "a", "à", "au", "aux", "en", "sur", "dans",
+})
+
+TERM_STATS_COLS = ["Terme", "Parfums", "Occurrences"]
+
+# Colonnes dont les listes d'options des widgets sont précalculées
+META_COLS = FILTER_COLS + ["Année"]
+
+
+def dataset_version(path: Path) -> str:
+    """
+    Identifiant de version d'un fichier de données (nom, taille, date de modification).
+    Un simple `stat` : appelable à chaque rerun sans relire le fichier.
+
+    :param path: Chemin du fichier
+    :type path: Path
+    :return: Version du dataset, ex. "parfums.csv:812345:1718000000000000000"
+    :rtype: str
+    """
+    try:
+        st_ = Path(path).stat()
+    except OSError:
+        return f"{Path(path).name}:absent"
+    return f"{Path(path).name}:{st_.st_size}:{st_.st_mtime_ns}"
+
+
+def term_matrix(series: pd.Series) -> tuple[sparse.csr_matrix, np.ndarray]:
+    """
+    Matrice creuse documents x termes (nombre d'occurrences) d'une colonne texte.
+
+    Même tokenisation que les statistiques historiques : mots en minuscules,
+    sans mots vides, d'au moins 2 caractères.
+
+    :param series: Colonne texte
+    :type series: pd.Series
+    :return: (matrice CSR n_parfums x n_termes, vocabulaire trié)
+    :rtype: tuple[sparse.csr_matrix, np.ndarray]
+    """
+    texts = series.fillna("").astype(str)
+    cv = CountVectorizer(token_pattern=TOKEN_PATTERN, lowercase=True, dtype=np.int32)
+    try:
+        X = cv.fit_transform(texts)
+    except ValueError:  # vocabulaire vide
+        return sparse.csr_matrix((len(texts), 0), dtype=np.int32), np.array([], dtype=object)
+    vocab = cv.get_feature_names_out()
+    keep = np.array([len(t) >= 2 and t not in STOPWORDS for t in vocab], dtype=bool)
+    return X[:, keep].tocsr(), vocab[keep].astype(object)
+
+
+def term_stats(X: sparse.csr_matrix, vocab: np.ndarray) -> pd.DataFrame:
+    """
+    Tableau Terme / Parfums (nb de documents) / Occurrences à partir d'une matrice de termes,
+    trié par fréquence décroissante puis par ordre alphabétique.
+    """
+    if X.shape[1] == 0:
+        return pd.DataFrame(columns=TERM_STATS_COLS)
+    parfums = np.asarray((X > 0).sum(axis=0)).ravel()
+    occurrences = np.asarray(X.sum(axis=0)).ravel()
+    return (
+        pd.DataFrame({"Terme": vocab, "Parfums": parfums, "Occurrences": occurrences})
+        .loc[lambda d: d["Occurrences"] > 0]
+        .sort_values(["Parfums", "Occurrences", "Terme"], ascending=[False, False, True])
+        .reset_index(drop=True)
+    )
+
+
+@dataclass(frozen=True)
+class MetaCatalogue:
+    """
+    Métadonnées des widgets : listes d'options triées, effectifs par valeur, bornes d'années.
+
+    Les listes sont celles de `fonction_filtre.options` / `opts_no_all`, calculées une
+    seule fois par version du dataset au lieu de l'être à chaque rerun.
+    """
+
+    valeurs: dict = field(default_factory=dict)
+    effectifs: dict = field(default_factory=dict)
+    annee_min: Optional[int] = None
+    annee_max: Optional[int] = None
+
+    @classmethod
+    def depuis_df(cls, df: pd.DataFrame, cols: Optional[list[str]] = None) -> "MetaCatalogue":
+        """Construit les métadonnées des colonnes `cols` (par défaut `META_COLS`)."""
+        valeurs, effectifs = {}, {}
+        for col in (META_COLS if cols is None else cols):
+            if col not in df.columns:
+                continue
+            vc = df[col].dropna().astype(str).value_counts()
+            valeurs[col] = tuple(sorted(vc.index.tolist()))
+            effectifs[col] = {str(v): int(n) for v, n in vc.items()}
+        annee_min = annee_max = None
+        if "Année" in df.columns:
+            years = pd.to_numeric(df["Année"], errors="coerce").dropna()
+            if len(years):
+                annee_min, annee_max = int(years.min()), int(years.max())
+        return cls(valeurs=valeurs, effectifs=effectifs, annee_min=annee_min, annee_max=annee_max)
+
+    def options(self, col: str) -> list[str]:
+        """Options d'une colonne précédées de "Tous" (comme `fonction_filtre.options`)."""
+        return ["Tous"] + list(self.valeurs.get(col, ()))
+
+    def opts_no_all(self, col: str) -> list[str]:
+        """Options sans "Tous", "Inconnu" en premier (comme `fonction_filtre.opts_no_all`)."""
+        vals = list(self.valeurs.get(col, ("Inconnu",)))
+        if "Inconnu" in vals:
+            vals = ["Inconnu"] + [v for v in vals if v != "Inconnu"]
+        return vals
+
+    def annees(self, defaut: Tuple[int, int] = (1900, 2100)) -> Tuple[int, int]:
+        """Bornes (min, max) des années du catalogue, ou `defaut` si indisponibles."""
+        if self.annee_min is None:
+            return defaut
+        return self.annee_min, self.annee_max
+
+
+@dataclass(frozen=True)
+class Catalogue:
+    """
+    Dataset + structures précalculées, pour une version donnée.
+
+    Les objets contenus sont partagés entre sessions : ils ne doivent pas être modifiés.
+    """
+
+    version: str
+    df: pd.DataFrame
+    engine: FilterEngine
+    search: SearchIndex
+    cube: Optional[CubeStats] = None
+    term_index: dict = field(default_factory=dict)
+    term_matrix: dict = field(default_factory=dict)
+    term_stats: dict = field(default_factory=dict)
+    associations: dict = field(default_factory=dict)
+    ordres: dict = field(default_factory=dict)
+    meta: MetaCatalogue = field(default_factory=MetaCatalogue)
+
+    @classmethod
+    def depuis_df(cls, df: pd.DataFrame, version: str) -> "Catalogue":
+        """Construit toutes les structures dérivées de `df`."""
+        t_index, t_matrix, t_stats, t_assoc = {}, {}, {}, {}
+        segments = df["Prix_Categorie"] if "Prix_Categorie" in df.columns else None
+        for col in TEXT_COLS:
+            series = df[col] if col in df.columns else pd.Series([""] * len(df), index=df.index)
+            X, vocab = term_matrix(series)
+            t_matrix[col] = (X, vocab)
+            t_stats[col] = term_stats(X, vocab)
+            # Associations (lift / PMI) sur tout le catalogue puis par catégorie de prix
+            t_assoc[col] = associations_par_segment(X, vocab, segments)
+            t_index[col] = TermIndex(series)
+        return cls(
+            version=version,
+            df=df,
+            engine=FilterEngine(df),
+            search=SearchIndex(df),
+            cube=CubeStats(df),
+            term_index=t_index,
+            term_matrix=t_matrix,
+            term_stats=t_stats,
+            associations=t_assoc,
+            ordres=sort_orders(df),
+            meta=MetaCatalogue.depuis_df(df),
+        )
+
+    def vue(self, filters: Optional[dict] = None, annees: Optional[tuple] = None) -> "VueCatalogue":
+        """Handle immuable d'une vue filtrée de ce catalogue."""
+        return VueCatalogue.depuis(self.version, filters, annees)
+
+    def options_dependantes(self, col: str, filters: dict, annees: Optional[tuple] = None, tous: bool = True) -> list[str]:
+        """
+        Options de `col` encore présentes parmi les parfums qui respectent les autres filtres
+        (ex. les sous-familles de la famille choisie), calculées sur les bitmaps du moteur de filtres.
+
+        :param col: Colonne dont on veut les options
+        :param filters: Filtres {colonne: valeur} déjà choisis
+        :param annees: Plage d'années (min, max) incluse, ou None
+        :param tous: Ajouter "Tous" en tête (sinon, ordre de `opts_no_all`)
+        :return: Liste d'options (toutes les options si aucune ne reste)
+        :rtype: list[str]
+        """
+        opts = self.meta.options(col)[1:] if tous else self.meta.opts_no_all(col)
+        if col in self.engine:
+            n = self.engine.counts(col, filters, annees)
+            ids = self.engine.value_ids[col]
+            opts = [v for v in opts if v in ids and n[ids[v]] > 0] or opts
+        return ["Tous"] + opts if tous else opts
+
+    def terms(self, col: str) -> list[str]:
+        """Termes d'une colonne texte, du plus fréquent au moins fréquent."""
+        stats = self.term_stats.get(col)
+        return [] if stats is None else stats["Terme"].tolist()
+
+
+@dataclass(frozen=True)
+class VueCatalogue:
+    """
+    Handle léger et immuable d'une vue filtrée : version du dataset + filtres canoniques.
+
+    Deux vues égales désignent les mêmes lignes : un cache Streamlit peut donc être indexé
+    par ce handle (hachage de quelques chaînes) au lieu du DataFrame filtré.
+    """
+
+    dataset: str
+    filtres: Tuple[Tuple[str, str], ...] = ()
+    annees: Optional[Tuple[int, int]] = None
+
+    @classmethod
+    def depuis(cls, dataset: str, filters: Optional[dict] = None, annees: Optional[tuple] = None) -> "VueCatalogue":
+        """
+        Construit une vue canonique : filtres "Tous" retirés, colonnes triées, valeurs en str.
+
+        :param dataset: Version du catalogue (`Catalogue.version`)
+        :param filters: Filtres {colonne: valeur}
+        :param annees: Plage d'années (min, max) incluse, ou None
+        :return: Vue canonique
+        :rtype: VueCatalogue
+        """
+        filtres = tuple(sorted((str(c), str(v)) for c, v in (filters or {}).items() if v != "Tous"))
+        bornes = None if annees is None else (int(annees[0]), int(annees[1]))
+        return cls(dataset=dataset, filtres=filtres, annees=bornes)
+
+    def rows(self, catalogue: Catalogue) -> np.ndarray:
+        """Positions des lignes de la vue dans `catalogue.df`."""
+        if catalogue.version != self.dataset:
+            raise ValueError(f"Vue sur {self.dataset!r}, catalogue en version {catalogue.version!r}.")
+        return catalogue.engine.rows(dict(self.filtres), self.annees)
+
+    def df(self, catalogue: Catalogue) -> pd.DataFrame:
+        """Lignes de la vue (une seule extraction `iloc`)."""
+        return catalogue.df.iloc[self.rows(catalogue)]
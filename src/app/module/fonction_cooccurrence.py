@@ -0,0 +1,166 @@
+"""
+Associations entre termes (ingrédients ou concepts) : co-occurrences, lift et PMI.
+
+Les co-occurrences sont calculées par produit creux Bᵀ·B de la matrice binaire
+parfums x termes (`term_matrix`), par blocs de `taille_bloc` termes. Pour une
+paire (a, b) présente ensemble dans n_ab parfums sur n :
+    - lift = n · n_ab / (n_a · n_b) : > 1 si les termes apparaissent ensemble plus
+      souvent que par hasard,
+    - PMI = log2(lift),
+    - confiance = n_ab / n_a : part des parfums contenant a qui contiennent aussi b.
+Seules les `k` meilleures associations de chaque terme (par lift, avec au moins
+`support_min` parfums en commun) sont gardées : le résultat occupe au plus
+n_termes x k valeurs, et le calcul au plus les co-occurrences d'un bloc de termes
+(taille_bloc x n_termes) à la fois. Le calcul est refait sur chaque catégorie de prix.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Associations gardées par terme et nombre minimal de parfums en commun
+K_ASSOCIATIONS = 20
+SUPPORT_MIN = 5
+# Termes dont les co-occurrences sont calculées à la fois
+TAILLE_BLOC = 256
+
+TOUS = "Tous"
+
+VOISINS_COLS = ["Terme", "Ensemble", "Confiance", "Lift", "PMI"]
+PAIRES_COLS = ["Terme A", "Terme B", "Ensemble", "Lift", "PMI"]
+
+
+def lift(n_ab, n_a, n_b, n: int) -> np.ndarray:
+    """Lift de paires de termes (tableaux alignés de co-occurrences et de fréquences)."""
+    return n * np.asarray(n_ab, dtype=float) / (np.asarray(n_a, dtype=float) * np.asarray(n_b, dtype=float))
+
+
+@dataclass(frozen=True)
+class Associations:
+    """
+    Meilleures associations de chaque terme d'une colonne texte.
+
+    :param vocab: Termes (ordre des colonnes de la matrice parfums x termes)
+    :param documents: Nombre de parfums contenant chaque terme
+    :param n: Nombre de parfums
+    :param top: Matrice CSR termes x termes ; la ligne a contient au plus k termes b, valeur = parfums contenant a et b
+    """
+
+    vocab: np.ndarray
+    documents: np.ndarray
+    n: int
+    top: sparse.csr_matrix
+
+    @classmethod
+    def depuis_matrice(cls, X: sparse.csr_matrix, vocab: np.ndarray, k: int = K_ASSOCIATIONS, support_min: int = SUPPORT_MIN,
+                       taille_bloc: int = TAILLE_BLOC) -> "Associations":
+        """
+        Construit les associations d'une matrice parfums x termes (comptes ou binaire).
+
+        :param X: Matrice CSR parfums x termes
+        :param vocab: Termes
+        :param k: Associations gardées par terme
+        :param support_min: Nombre minimal de parfums en commun
+        :param taille_bloc: Termes traités à la fois (borne la matrice de co-occurrences intermédiaire)
+        :return: Associations
+        :rtype: Associations
+        """
+        B = sparse.csr_matrix(X, dtype=np.int32, copy=True)
+        B.data[:] = 1
+        B.eliminate_zeros()
+        n, n_termes = B.shape
+        documents = np.asarray(B.sum(axis=0)).ravel().astype(np.int64)
+
+        Bt = B.T.tocsr()
+        morceaux = [(np.empty(0, dtype=np.int64),) * 3]
+        for debut in range(0, n_termes, taille_bloc):
+            C = (Bt[debut:debut + taille_bloc] @ B).tocoo()
+            lignes = C.row + debut
+            garde = (lignes != C.col) & (C.data >= support_min)
+            lignes, cols, n_ab = lignes[garde], C.col[garde], C.data[garde]
+            score = lift(n_ab, documents[lignes], documents[cols], n)
+
+            # Tri par terme puis lift décroissant (ex aequo : co-occurrences décroissantes), k premiers de chaque terme
+            ordre = np.lexsort((-n_ab, -score, lignes))
+            lignes, cols, n_ab = lignes[ordre], cols[ordre], n_ab[ordre]
+            rang = np.arange(len(lignes)) - np.searchsorted(lignes, lignes, side="left")
+            garde = rang < k
+            morceaux.append((lignes[garde], cols[garde], n_ab[garde]))
+
+        lignes, cols, n_ab = (np.concatenate(m) for m in zip(*morceaux))
+        top = sparse.csr_matrix((n_ab, (lignes, cols)), shape=(n_termes, n_termes), dtype=np.int32)
+        return cls(vocab=np.asarray(vocab, dtype=object), documents=documents, n=int(n), top=top)
+
+    @cached_property
+    def index(self) -> dict:
+        """Terme -> position dans `vocab`."""
+        return {t: i for i, t in enumerate(self.vocab)}
+
+    def voisins(self, terme: str, k: Optional[int] = None) -> pd.DataFrame:
+        """
+        Termes qui « vont bien avec » `terme`, par lift décroissant.
+
+        :param terme: Terme de la colonne
+        :param k: Nombre de termes (toutes les associations gardées par défaut)
+        :return: DataFrame Terme, Ensemble (parfums en commun), Confiance, Lift, PMI
+        :rtype: pd.DataFrame
+        """
+        i = self.index.get(terme)
+        if i is None:
+            return pd.DataFrame(columns=VOISINS_COLS)
+        debut, fin = self.top.indptr[i], self.top.indptr[i + 1]
+        cols, n_ab = self.top.indices[debut:fin], self.top.data[debut:fin]
+        l = lift(n_ab, self.documents[i], self.documents[cols], self.n)
+        out = pd.DataFrame({
+            "Terme": self.vocab[cols],
+            "Ensemble": n_ab,
+            "Confiance": n_ab / self.documents[i],
+            "Lift": l,
+            "PMI": np.log2(l),
+        })
+        out = out.sort_values(["Lift", "Ensemble", "Terme"], ascending=[False, False, True]).reset_index(drop=True)
+        return out if k is None else out.head(k)
+
+    def paires(self, n: int = 20) -> pd.DataFrame:
+        """
+        Meilleures paires de termes (lift décroissant), parmi les associations gardées de chaque terme.
+
+        :param n: Nombre de paires
+        :return: DataFrame Terme A, Terme B, Ensemble, Lift, PMI
+        :rtype: pd.DataFrame
+        """
+        C = self.top.tocoo()
+        a, b = np.minimum(C.row, C.col), np.maximum(C.row, C.col)
+        _, premiers = np.unique(a.astype(np.int64) * len(self.vocab) + b, return_index=True)
+        a, b, n_ab = a[premiers], b[premiers], C.data[premiers]
+        l = lift(n_ab, self.documents[a], self.documents[b], self.n)
+        out = pd.DataFrame({"Terme A": self.vocab[a], "Terme B": self.vocab[b], "Ensemble": n_ab, "Lift": l, "PMI": np.log2(l)})
+        return out.sort_values(["Lift", "Ensemble"], ascending=[False, False]).head(n).reset_index(drop=True)
+
+
+def associations_par_segment(X: sparse.csr_matrix, vocab: np.ndarray, segments: Optional[pd.Series] = None,
+                             k: int = K_ASSOCIATIONS, support_min: int = SUPPORT_MIN) -> dict[str, Associations]:
+    """
+    Associations sur tout le catalogue (clé "Tous") puis sur chaque segment (ex. catégorie de prix).
+
+    :param X: Matrice CSR parfums x termes
+    :param vocab: Termes
+    :param segments: Segment de chaque parfum (aligné sur les lignes de `X`), ou None
+    :param k: Associations gardées par terme
+    :param support_min: Nombre minimal de parfums en commun
+    :return: Segment -> Associations
+    :rtype: dict[str, Associations]
+    """
+    out = {TOUS: Associations.depuis_matrice(X, vocab, k, support_min)}
+    if segments is None:
+        return out
+    valeurs = pd.Series(segments).fillna("Inconnu").astype(str).to_numpy()
+    for segment in sorted(set(valeurs)):
+        out[segment] = Associations.depuis_matrice(X[valeurs == segment], vocab, k, support_min)
+    return out
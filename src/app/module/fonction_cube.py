@@ -0,0 +1,144 @@
+"""
+Cube de comptes pré-agrégé pour l'onglet Stats.
+
+Le catalogue est résumé une fois pour toutes en cellules
+(Prix_Categorie, Genre, Origine, Famille, Sous_famille, Année) -> nb de parfums,
+stockées de façon creuse : seules les combinaisons présentes sont gardées.
+Une vue filtrée se calcule alors par masquage des cellules puis sommation
+(`np.bincount`) : le coût dépend du nombre de cellules, pas du nombre de parfums.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+CUBE_DIMS = ["Prix_Categorie", "Genre", "Origine", "Famille", "Sous_famille", "Année"]
+
+
+def clean_labels(values) -> np.ndarray:
+    """Libellés d'affichage : même normalisation que `fonction_stats._clean_series`."""
+    s = pd.Series(values, dtype=object).fillna("Inconnu").astype(str).str.strip().replace({"": "Inconnu"})
+    return s.to_numpy(dtype=object)
+
+
+class CubeStats:
+    """
+    Cube creux de comptes sur les dimensions `dims` d'un DataFrame.
+
+    Pour chaque dimension catégorielle, on garde :
+        - `raw[dim]` : valeurs brutes converties en str (utilisées par les filtres, comme `filter_df`),
+        - `labels[dim]` : libellés nettoyés (utilisés pour regrouper, comme `distribution_df`),
+
+        - `label_of[dim]` : code brut -> indice du libellé nettoyé.
+    Chaque cellule garde aussi la position de sa première ligne (`first`), ce qui permet
+    de départager les ex aequo comme `value_counts` (ordre de première apparition).
+    La dimension année est numérique (NaN exclu des plages et des séries temporelles).
+
+    :param df: DataFrame complet
+    :type df: pd.DataFrame
+    :param dims: Dimensions du cube
+    :param year_col: Nom de la dimension année
+    """
+
+    def __init__(self, df: pd.DataFrame, dims: Optional[list[str]] = None, year_col: str = "Année"):
+        self.year_col = year_col
+        self.dims = [d for d in (dims or CUBE_DIMS) if d in df.columns]
+        self.raw: dict[str, np.ndarray] = {}
+        self.labels: dict[str, np.ndarray] = {}
+        self.label_of: dict[str, np.ndarray] = {}
+
+        codes = []
+        for dim in self.dims:
+            if dim == year_col:
+                values = pd.to_numeric(df[dim], errors="coerce").to_numpy(dtype=float)
+                c, uniques = pd.factorize(values, sort=True, use_na_sentinel=False)
+                self.raw[dim] = np.asarray(uniques, dtype=float)
+            else:
+                c, uniques = pd.factorize(df[dim].to_numpy(dtype=object), sort=False, use_na_sentinel=False)
+                self.raw[dim] = np.asarray([str(v) for v in uniques], dtype=object)
+                label_of, labels = pd.factorize(clean_labels(uniques), sort=False)
+                self.labels[dim] = np.asarray(labels, dtype=object)
+                self.label_of[dim] = label_of.astype(np.int32)
+            codes.append(c.astype(np.int32))
+
+        if codes and len(df):
+            cells, first, counts = np.unique(np.column_stack(codes), axis=0, return_index=True, return_counts=True)
+        else:
+            cells = np.zeros((0, len(self.dims)), dtype=np.int32)
+            first, counts = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        self.cells = cells.astype(np.int32)
+        self.first = first.astype(np.int64)
+        self.counts = counts.astype(np.int64)
+
+    @property
+    def n_cells(self) -> int:
+        return len(self.counts)
+
+    def supports(self, filtres: dict) -> bool:
+        """Vrai si tous les filtres portent sur des dimensions du cube."""
+        return all(col in self.dims for col in filtres)
+
+    def mask(self, filtres: dict, annees: Optional[tuple] = None) -> np.ndarray:
+        """
+        Masque des cellules qui respectent les filtres {dimension: valeur} ("Tous" ignoré)
+        et la plage d'années.
+        """
+        m = np.ones(self.n_cells, dtype=bool)
+        for col, val in filtres.items():
+            if val == "Tous":
+                continue
+            j = self.dims.index(col)
+            ok = np.flatnonzero(self.raw[col] == str(val))
+            m &= np.isin(self.cells[:, j], ok)
+        if annees is not None and self.year_col in self.dims:
+            years = self.raw[self.year_col][self.cells[:, self.dims.index(self.year_col)]]
+            m &= (years >= annees[0]) & (years <= annees[1])
+        return m
+
+    def value_counts(self, dim: str, mask: np.ndarray) -> pd.Series:
+        """
+        Comptes par libellé d'une dimension catégorielle (équivalent de `value_counts()`) :
+        effectifs décroissants, ex aequo dans l'ordre de première apparition dans la vue.
+        """
+        j = self.dims.index(dim)
+        n_labels = len(self.labels[dim])
+        lab = self.label_of[dim][self.cells[mask, j]]
+        per_label = np.bincount(lab, weights=self.counts[mask], minlength=n_labels).astype(np.int64)
+        first = np.full(n_labels, np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(first, lab, self.first[mask])
+
+        present = np.flatnonzero(per_label)
+        order = present[np.lexsort((first[present], -per_label[present]))]
+        return pd.Series(per_label[order], index=pd.Index(self.labels[dim][order], name=dim), name="count")
+
+    def year_counts(self, mask: np.ndarray) -> pd.Series:
+        """Comptes par année (NaN exclu), triés par année."""
+        j = self.dims.index(self.year_col)
+        per_code = np.bincount(self.cells[mask, j], weights=self.counts[mask], minlength=len(self.raw[self.year_col]))
+        years = self.raw[self.year_col]
+        keep = ~np.isnan(years) & (per_code > 0)
+        out = pd.Series(per_code[keep].astype(np.int64), index=pd.Index(years[keep].astype(int), name=self.year_col))
+        return out.sort_index().rename("count")
+
+    def year_by(self, dim: str, mask: np.ndarray) -> pd.DataFrame:
+        """Tableau croisé année x libellé d'une dimension (comptes, années triées)."""
+        jy = self.dims.index(self.year_col)
+        jd = self.dims.index(dim)
+        years = self.raw[self.year_col][self.cells[mask, jy]]
+        keep = ~np.isnan(years)
+        tmp = pd.DataFrame({
+            self.year_col: years[keep].astype(int),
+            dim: self.labels[dim][self.label_of[dim][self.cells[mask, jd][keep]]],
+            "Count": self.counts[mask][keep],
+        })
+        if tmp.empty:
+            return pd.DataFrame()
+        return (
+            tmp.groupby([self.year_col, dim])["Count"].sum()
+            .unstack(dim, fill_value=0)
+            .astype(int)
+            .sort_index()
+        )
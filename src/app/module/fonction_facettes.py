@@ -0,0 +1,108 @@
+"""
+Comptes par facette pour les filtres de l'explorateur.
+
+Pour chaque filtre (catégorie de prix, marque, famille…, ingrédients, concepts),
+on compte les parfums qui correspondraient à chaque option, compte tenu de tous
+les *autres* filtres. Les comptes sont affichés dans les listes déroulantes,
+ce qui évite de choisir une combinaison sans résultat.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+import numpy as np
+
+from src.app.module.fonction_catalogue import Catalogue
+from src.app.module.fonction_filtre_2 import terms_mask
+
+
+@dataclass(frozen=True)
+class Facettes:
+    """
+    Résultat de l'explorateur : lignes retenues + comptes par option de chaque filtre.
+
+    :param rows: Positions des lignes qui respectent tous les filtres
+    :param valeurs: {colonne: comptes par valeur (ordre de `FilterEngine.values`)}
+    :param termes: {colonne texte: comptes par terme (ordre de `TermIndex.vocab`)}
+    """
+
+    catalogue: Catalogue
+    rows: np.ndarray
+    valeurs: dict = field(default_factory=dict)
+    termes: dict = field(default_factory=dict)
+
+    def compte(self, col: str, val) -> Optional[int]:
+        """Nombre de parfums pour `col == val` (tous les autres filtres appliqués) ; "Tous" = total."""
+        counts = self.valeurs.get(col)
+        if counts is None:
+            return None
+        if val == "Tous":
+            return int(counts.sum())
+        i = self.catalogue.engine.value_ids[col].get(str(val))
+        return 0 if i is None else int(counts[i])
+
+    def compte_terme(self, col: str, term: str) -> Optional[int]:
+        """Nombre de parfums contenant `term` (tous les autres filtres appliqués)."""
+        counts = self.termes.get(col)
+        if counts is None:
+            return None
+        return self.catalogue.term_index[col].count(counts, term)
+
+    def libelle(self, col: str) -> Callable[[str], str]:
+        """`format_func` d'un widget : « valeur (compte) »."""
+        def _format(val) -> str:
+            n = self.compte_terme(col, val) if col in self.termes else self.compte(col, val)
+            return str(val) if n is None else f"{val} ({n})"
+        return _format
+
+
+def facettes(
+    catalogue: Catalogue,
+    filters: dict,
+    q: str = "",
+    annees: Optional[tuple] = None,
+    termes: Optional[dict] = None,
+    mode: str = "and",
+) -> Facettes:
+    """
+    Applique les filtres de l'explorateur et calcule les comptes de chaque facette.
+
+    Chaque critère est évalué une seule fois sous forme de masque (bitmaps des filtres
+    catégoriels, index de trigrammes pour `q`, index de termes) ; les facettes
+    catégorielles sont comptées par `FilterEngine.facet_counts`, les termes par un
+    produit creux avec la matrice d'incidence de `TermIndex`.
+
+    :param catalogue: Catalogue précalculé
+    :param filters: Filtres catégoriels {colonne: valeur} (colonnes de `FilterEngine`)
+    :param q: Texte de recherche
+    :param annees: Plage d'années (min, max) incluse, ou None
+    :param termes: {colonne texte: termes choisis}
+    :param mode: "and" (tous les termes) ou "or" (au moins un terme)
+    :return: Lignes retenues et comptes par facette
+    :rtype: Facettes
+    """
+    engine = catalogue.engine
+    n = engine.n_rows
+    m_q = catalogue.search.mask(q) if q.strip() else np.ones(n, dtype=bool)
+    m_termes = {
+        col: terms_mask(catalogue.df, col, picks, index=catalogue.term_index.get(col), mode=mode)
+        for col, picks in (termes or {}).items()
+        if picks
+    }
+    m_tous_termes = np.logical_and.reduce(list(m_termes.values())) if m_termes else np.ones(n, dtype=bool)
+
+    valeurs = engine.facet_counts(filters, annees, base=m_q & m_tous_termes)
+
+    m_cat = engine.mask(filters, annees)
+    counts_termes = {}
+    for col, index in catalogue.term_index.items():
+        autres = [m for c, m in m_termes.items() if c != col]
+        m = m_cat & m_q
+        if autres:
+            m = m & np.logical_and.reduce(autres)
+        counts_termes[col] = index.counts(m)
+
+    rows = np.flatnonzero(m_cat & m_q & m_tous_termes)
+    return Facettes(catalogue=catalogue, rows=rows, valeurs=valeurs, termes=counts_termes)
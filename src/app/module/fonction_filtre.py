@@ -3,12 +3,21 @@ Filtrage pour l'application Streamlit.
 
 Ce module contient des fonctions qui manipulent un DataFrame de parfums :
     - génération de listes d'options pour des widgets (avec/sans "Tous"),
-    - filtrage du DataFrame selon des valeurs choisies,
+    - filtrage du DataFrame selon des valeurs choisies (directement, ou via un
+      `FilterEngine` qui renvoie des positions de lignes),
     - recherche texte sur quelques colonnes.
 """
 
+import numpy as np
 import pandas as pd
 
+from src.app.module.fonction_index import FilterEngine
+from src.app.module.fonction_recherche import SearchIndex
+
+# Colonnes examinées par la recherche texte
+SEARCH_COLS = ["Fragrance", "Marque", "Parfumeur", "Ingredients_txt", "Concepts_txt"]
+
+
 def options(df_: pd.DataFrame, col: str):
     """
     Retourne les options d'une colonne, en ajoutant "Tous" en première position.
@@ -27,7 +36,56 @@ def options(df_: pd.DataFrame, col: str):
     return ["Tous"] + vals
 
 
-def filter_df(base: pd.DataFrame, filters: dict, q: str = "") -> pd.DataFrame:
+def _text_mask(df_: pd.DataFrame, q: str) -> pd.Series:
+    """Masque des lignes dont une des colonnes texte contient `q` (insensible à la casse)."""
+    q_ = q.strip().lower()
+    cols_search = [c for c in SEARCH_COLS if c in df_.columns]
+    mask = pd.Series(not cols_search, index=df_.index)
+    for c in cols_search:
+        mask = mask | df_[c].astype(str).str.lower().str.contains(q_, na=False)
+    return mask
+
+
+def filter_rows(base: pd.DataFrame, filters: dict, q: str = "", *, engine: FilterEngine, annees: tuple | None = None, search: SearchIndex | None = None) -> np.ndarray:
+    """
+    Positions des lignes de `base` qui respectent les filtres, la plage d'années et la recherche `q`.
+
+    Les filtres catégoriels indexés par `engine` sont combinés en un seul masque de bitmaps ;
+    seules les lignes candidates sont ensuite examinées pour les filtres restants et `q`
+    (via l'index de trigrammes `search` s'il est fourni).
+
+    :param base: DataFrame source (celui sur lequel `engine` a été construit)
+    :type base: pd.DataFrame
+    :param filters: Dictionnaire des filtres {colonne: valeur}
+    :type filters: dict
+    :param q: Texte de recherche
+    :type q: str
+    :param engine: Moteur de filtres construit sur `base`
+    :type engine: FilterEngine
+    :param annees: Plage d'années (min, max) incluse, ou None
+    :type annees: tuple | None
+    :param search: Index de recherche construit sur `base` (optionnel)
+    :type search: SearchIndex | None
+    :return: Positions des lignes retenues (ordre du DataFrame)
+    :rtype: np.ndarray
+    """
+    rows = engine.rows(filters, annees)
+    if q.strip() and search is not None:
+        rows = rows[search.mask(q)[rows]]
+        q = ""
+    others = {c: v for c, v in filters.items() if v != "Tous" and c not in engine and c in base.columns}
+    if (others or q.strip()) and len(rows):
+        cand = base.iloc[rows]
+        keep = np.ones(len(rows), dtype=bool)
+        for col, val in others.items():
+            keep &= (cand[col].astype(str) == str(val)).to_numpy()
+        if q.strip():
+            keep &= _text_mask(cand, q).to_numpy()
+        rows = rows[keep]
+    return rows
+
+
+def filter_df(base: pd.DataFrame, filters: dict, q: str = "", *, engine: FilterEngine | None = None, annees: tuple | None = None, search: SearchIndex | None = None) -> pd.DataFrame:
     """
     Filtre le DataFrame selon les valeurs dans `filters` et une recherche texte `q`.
     
@@ -37,21 +95,25 @@ def filter_df(base: pd.DataFrame, filters: dict, q: str = "") -> pd.DataFrame:
     :type filters: dict
     :param q: Texte de recherche
     :type q: str
+    :param engine: Moteur de filtres construit sur `base` (optionnel, voir `filter_rows`)
+    :type engine: FilterEngine | None
+    :param annees: Plage d'années (min, max) incluse, ou None
+    :type annees: tuple | None
+    :param search: Index de recherche construit sur `base` (utilisé avec `engine`)
+    :type search: SearchIndex | None
     :return: DataFrame filtré
     :rtype: pd.DataFrame
     """
+    if engine is not None:
+        return base.iloc[filter_rows(base, filters, q, engine=engine, annees=annees, search=search)]
     out = base.copy()
     for col, val in filters.items():
         if val != "Tous" and col in out.columns:
             out = out[out[col].astype(str) == str(val)]
+    if annees is not None and "Année" in out.columns:
+        out = out[(out["Année"] >= annees[0]) & (out["Année"] <= annees[1])]
     if q.strip():
-        q_ = q.strip().lower()
-        cols_search = [c for c in ["Fragrance", "Marque", "Parfumeur", "Ingredients_txt", "Concepts_txt"] if c in out.columns]
-        if cols_search:
-            mask = False
-            for c in cols_search:
-                mask = mask | out[c].astype(str).str.lower().str.contains(q_, na=False)
-            out = out[mask]
+        out = out[_text_mask(out, q)]
     return out
 
 
@@ -1,6 +1,9 @@
+import numpy as np
 import pandas as pd
 import streamlit as st
 
+from src.app.module.fonction_index import TermIndex
+
 
 
 def contains_term(series: pd.Series, term: str) -> pd.Series:
@@ -9,16 +12,62 @@ def contains_term(series: pd.Series, term: str) -> pd.Series:
     return s.str.contains(f" {str(term).lower()} ", regex=False)
 
 
-def filter_by_terms(df_: pd.DataFrame, col: str, terms: list[str]) -> pd.DataFrame:
-    """Filtre `df_` en conservant les lignes qui contiennent tous les termes donnés."""
+def filter_by_terms(df_: pd.DataFrame, col: str, terms: list[str], index: TermIndex | None = None, mode: str = "and") -> pd.DataFrame:
+    """
+    Filtre `df_` en conservant les lignes qui contiennent tous les termes donnés
+    (`mode="and"`) ou au moins un des termes (`mode="or"`).
+
+    Si un `TermIndex` construit sur la colonne du DataFrame complet est fourni, le filtre
+    se fait par ET / OU de bitmaps ; sinon (ou pour un terme de plusieurs mots), on
+    retombe sur le balayage texte de `contains_term`.
+    """
     if not terms or df_.empty or col not in df_.columns:
         return df_
+    if index is not None and all(TermIndex.indexable(t) for t in terms):
+        keep = index.mask(terms, mode=mode)[index.positions(df_.index)]
+        return df_[keep]
+    if mode == "or":
+        mask = pd.Series(False, index=df_.index)
+        for t in terms:
+            mask = mask | contains_term(df_[col], t)
+        return df_[mask]
     out = df_
     for t in terms:
         out = out[contains_term(out[col], t)]
     return out
 
 
+def filter_rows_by_terms(base: pd.DataFrame, rows: np.ndarray, col: str, terms: list[str], index: TermIndex | None = None, mode: str = "and") -> np.ndarray:
+    """
+    Variante de `filter_by_terms` sur des positions de lignes de `base` (sans copie du DataFrame).
+
+    :param base: DataFrame complet (celui sur lequel `index` a été construit)
+    :param rows: Positions des lignes candidates
+    :param col: Colonne texte
+    :param terms: Termes recherchés
+    :param index: Index de termes de la colonne (optionnel)
+    :param mode: "and" ou "or"
+    :return: Positions des lignes retenues (même ordre que `rows`)
+    :rtype: np.ndarray
+    """
+    rows = np.asarray(rows)
+    if not terms or not len(rows) or col not in base.columns:
+        return rows
+    if index is not None and all(TermIndex.indexable(t) for t in terms):
+        return rows[index.mask(terms, mode=mode)[rows]]
+    values = base[col].iloc[rows]
+    masks = [contains_term(values, t).to_numpy() for t in terms]
+    keep = np.logical_or.reduce(masks) if mode == "or" else np.logical_and.reduce(masks)
+    return rows[keep]
+
+
+def terms_mask(base: pd.DataFrame, col: str, terms: list[str], index: TermIndex | None = None, mode: str = "and") -> np.ndarray:
+    """Masque booléen (sur toutes les lignes de `base`) du filtre de termes de `filter_rows_by_terms`."""
+    mask = np.zeros(len(base), dtype=bool)
+    mask[filter_rows_by_terms(base, np.arange(len(base)), col, terms, index=index, mode=mode)] = True
+    return mask
+
+
 def add_terms_to_session_text(session_key: str, terms: list[str]):
     """Ajoute des termes au texte (stocké dans st.session_state) sans doublons."""
     current = (st.session_state.get(session_key) or "").strip().lower()
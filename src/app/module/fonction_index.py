@@ -0,0 +1,288 @@
+"""
+Index en mémoire pour le filtrage rapide du catalogue.
+
+Les ensembles de lignes sont stockés sous forme de bitmaps compacts
+(`np.packbits`, 1 bit par parfum) : combiner plusieurs filtres revient à
+faire des ET / OU bit à bit, au lieu de rebalayer les colonnes texte.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+def pack(mask) -> np.ndarray:
+    """Compacte un masque booléen en bitmap (uint8, 8 lignes par octet)."""
+    return np.packbits(np.asarray(mask, dtype=bool))
+
+
+def unpack(bits: np.ndarray, n_rows: int) -> np.ndarray:
+    """Décompacte un bitmap en masque booléen de longueur `n_rows`."""
+    return np.unpackbits(bits, count=n_rows).astype(bool)
+
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.int64)
+
+
+def popcount(bits: np.ndarray) -> np.ndarray:
+    """Nombre de bits à 1 d'un bitmap (ou de chaque ligne d'une matrice de bitmaps)."""
+    return _POPCOUNT[bits].sum(axis=-1)
+
+
+def _positions(labels: pd.Index, base_labels: pd.Index) -> np.ndarray:
+    """
+    Convertit des labels d'index (sous-ensemble du DataFrame indexé) en positions.
+
+    Cas courant (RangeIndex 0..n-1 issu de read_csv) : les labels sont déjà les positions.
+    """
+    if labels is base_labels:
+        return np.arange(len(base_labels))
+    if isinstance(base_labels, pd.RangeIndex) and base_labels.start == 0 and base_labels.step == 1:
+        pos = np.asarray(labels, dtype=np.int64)
+        if len(pos) and (pos.min() < 0 or pos.max() >= len(base_labels)):
+            raise KeyError("Lignes absentes de l'index.")
+        return pos
+    pos = base_labels.get_indexer(labels)
+    if (pos < 0).any():
+        raise KeyError("Lignes absentes de l'index.")
+    return pos
+
+
+class TermIndex:
+    """
+    Index inversé terme -> bitmap des parfums qui contiennent ce terme.
+
+    Les termes sont les mots (séparés par des espaces, en minuscules) de la colonne,
+    soit exactement ce que `fonction_filtre_2.contains_term` reconnaît.
+
+    :param series: Colonne texte (ex. `df["Ingredients_txt"]`)
+    :type series: pd.Series
+    """
+
+    def __init__(self, series: pd.Series):
+        self.labels = series.index
+        self.n_rows = len(series)
+
+        split = series.fillna("").astype(str).str.lower().str.split()
+        lengths = split.str.len().fillna(0).astype(int).to_numpy()
+        rows = np.repeat(np.arange(self.n_rows), lengths)
+        codes, vocab = pd.factorize(split.explode().dropna().to_numpy(), sort=True)
+
+        self.vocab = {str(t): i for i, t in enumerate(vocab)}
+        self.bitmaps = np.zeros((len(vocab), (self.n_rows + 7) // 8), dtype=np.uint8)
+        np.bitwise_or.at(self.bitmaps, (codes, rows >> 3), (128 >> (rows & 7)).astype(np.uint8))
+        self.doc_freq = popcount(self.bitmaps)
+
+        # Incidence terme x parfum (binaire) : comptes de termes d'un sous-ensemble en un produit creux
+        incidence = sparse.csr_matrix(
+            (np.ones(len(codes), dtype=np.int32), (codes, rows)), shape=(len(vocab), self.n_rows)
+        )
+        incidence.sum_duplicates()
+        incidence.data[:] = 1
+        self.incidence = incidence
+
+    def __contains__(self, term: str) -> bool:
+        return str(term).lower() in self.vocab
+
+    def bitmap(self, term: str) -> Optional[np.ndarray]:
+        """Bitmap compacté d'un terme, ou None s'il n'apparaît dans aucun parfum."""
+        i = self.vocab.get(str(term).lower())
+        return None if i is None else self.bitmaps[i]
+
+    def mask(self, terms: Iterable[str], mode: str = "and") -> np.ndarray:
+        """
+        Masque booléen (sur toutes les lignes indexées) des parfums qui contiennent
+        tous les termes (`mode="and"`) ou au moins un terme (`mode="or"`).
+
+        :param terms: Termes recherchés (un mot chacun)
+        :param mode: "and" (intersection) ou "or" (union)
+        :return: Masque booléen de longueur `n_rows`
+        :rtype: np.ndarray
+        """
+        terms = [str(t) for t in terms]
+        if not terms:
+            return np.ones(self.n_rows, dtype=bool)
+
+        bitmaps = [self.bitmap(t) for t in terms]
+        if mode == "or":
+            found = [b for b in bitmaps if b is not None]
+            if not found:
+                return np.zeros(self.n_rows, dtype=bool)
+            return unpack(np.bitwise_or.reduce(found), self.n_rows)
+
+        if any(b is None for b in bitmaps):
+            return np.zeros(self.n_rows, dtype=bool)
+        return unpack(np.bitwise_and.reduce(bitmaps), self.n_rows)
+
+    def counts(self, mask: np.ndarray) -> np.ndarray:
+        """
+        Nombre de parfums du masque qui contiennent chaque terme (ordre de `vocab`).
+
+        :param mask: Masque booléen de longueur `n_rows`
+        :return: Comptes par terme
+        :rtype: np.ndarray
+        """
+        return self.incidence @ np.asarray(mask, dtype=np.int32)
+
+    def count(self, counts: np.ndarray, term: str) -> int:
+        """Compte d'un terme dans un résultat de `counts` (0 si le terme est absent de l'index)."""
+        i = self.vocab.get(str(term).lower())
+        return 0 if i is None else int(counts[i])
+
+    def positions(self, labels: pd.Index) -> np.ndarray:
+        """Positions (dans l'index) des lignes d'un sous-ensemble du DataFrame indexé."""
+        return _positions(labels, self.labels)
+
+    @staticmethod
+    def indexable(term: str) -> bool:
+        """Vrai si le terme est un mot unique (sinon il faut un balayage texte)."""
+        t = str(term).lower()
+        return bool(t) and t.split() == [t]
+
+
+# Colonnes catégorielles filtrables dans l'application
+FILTER_COLS = ["Prix_Categorie", "Marque", "Famille", "Sous_famille", "Origine", "Genre", "Parfumeur"]
+
+
+class FilterEngine:
+    """
+    Moteur de filtres catégoriels : chaque colonne est encodée une fois en codes entiers,
+    avec un bitmap de lignes par valeur. Tous les filtres actifs (et la plage d'années)
+    se combinent en un seul masque, sans copie du DataFrame.
+
+    :param df: DataFrame complet
+    :type df: pd.DataFrame
+    :param cols: Colonnes catégorielles à indexer
+    :param year_col: Colonne année (plage min/max)
+    """
+
+    def __init__(self, df: pd.DataFrame, cols: Optional[Iterable[str]] = None, year_col: str = "Année"):
+        self.labels = df.index
+        self.n_rows = len(df)
+        self.codes: dict[str, np.ndarray] = {}
+        self.values: dict[str, list[str]] = {}
+        self.value_ids: dict[str, dict[str, int]] = {}
+        self.bitmaps: dict[str, np.ndarray] = {}
+
+        rows = np.arange(self.n_rows)
+        for col in (FILTER_COLS if cols is None else cols):
+            if col not in df.columns:
+                continue
+            # Même comparaison que filter_df : valeurs converties en str
+            codes, uniques = pd.factorize(df[col].astype(str).to_numpy(), sort=True)
+            bitmaps = np.zeros((len(uniques), (self.n_rows + 7) // 8), dtype=np.uint8)
+            np.bitwise_or.at(bitmaps, (codes, rows >> 3), (128 >> (rows & 7)).astype(np.uint8))
+            self.codes[col] = codes.astype(np.int32)
+            self.values[col] = [str(v) for v in uniques]
+            self.value_ids[col] = {str(v): i for i, v in enumerate(uniques)}
+            self.bitmaps[col] = bitmaps
+
+        self.year_col = year_col
+        self.years = (
+            pd.to_numeric(df[year_col], errors="coerce").to_numpy(dtype=float)
+            if year_col in df.columns
+            else None
+        )
+
+    def __contains__(self, col: str) -> bool:
+        return col in self.codes
+
+    def value_bitmap(self, col: str, val) -> Optional[np.ndarray]:
+        """Bitmap des lignes où `col == val`, ou None si la valeur est absente."""
+        i = self.value_ids.get(col, {}).get(str(val))
+        return None if i is None else self.bitmaps[col][i]
+
+    def year_mask(self, annees: Optional[tuple]) -> np.ndarray:
+        """Masque de la plage d'années [min, max] (bornes incluses)."""
+        if annees is None or self.years is None:
+            return np.ones(self.n_rows, dtype=bool)
+        lo, hi = annees
+        return (self.years >= lo) & (self.years <= hi)
+
+    def mask(self, filters: dict, annees: Optional[tuple] = None) -> np.ndarray:
+        """
+        Masque booléen des lignes qui respectent tous les filtres {colonne: valeur}
+        (la valeur "Tous" désactive un filtre) et la plage d'années.
+
+        Les colonnes non indexées sont ignorées : voir `fonction_filtre.filter_rows`.
+        """
+        bits = []
+        for col, val in filters.items():
+            if val == "Tous" or col not in self.codes:
+                continue
+            b = self.value_bitmap(col, val)
+            if b is None:
+                return np.zeros(self.n_rows, dtype=bool)
+            bits.append(b)
+        m = unpack(np.bitwise_and.reduce(bits), self.n_rows) if bits else np.ones(self.n_rows, dtype=bool)
+        if annees is not None:
+            m &= self.year_mask(annees)
+        return m
+
+    def counts(self, col: str, filters: dict, annees: Optional[tuple] = None) -> np.ndarray:
+        """
+        Nombre de lignes par valeur de `col` (ordre de `values[col]`) parmi les lignes qui
+        respectent les autres filtres : un ET entre chaque bitmap de valeur et le masque
+        des autres filtres, puis un comptage de bits.
+
+        :param col: Colonne indexée dont on compte les valeurs
+        :param filters: Filtres {colonne: valeur} (celui de `col` est ignoré)
+        :param annees: Plage d'années (min, max) incluse, ou None
+        :return: Comptes par valeur
+        :rtype: np.ndarray
+        """
+        others = {c: v for c, v in filters.items() if c != col}
+        return popcount(self.bitmaps[col] & pack(self.mask(others, annees)))
+
+    def facet_counts(self, filters: dict, annees: Optional[tuple] = None, base: Optional[np.ndarray] = None) -> dict[str, np.ndarray]:
+        """
+        Comptes par valeur de chaque colonne indexée, chaque colonne étant comptée sur les
+        lignes qui respectent tous les *autres* filtres (facettes).
+
+        Les masques des filtres actifs sont combinés par ET préfixes / suffixes : le masque
+        « tous sauf le filtre i » vaut préfixe[i] & suffixe[i + 1], sans recalculer les
+        autres filtres pour chaque facette. Chaque facette est ensuite un seul `np.bincount`.
+
+        :param filters: Filtres {colonne: valeur} ("Tous" = inactif)
+        :param annees: Plage d'années (min, max) incluse, ou None
+        :param base: Masque des autres critères (recherche, termes…), ou None
+        :return: {colonne: comptes par valeur, dans l'ordre de `values[colonne]`}
+        :rtype: dict[str, np.ndarray]
+        """
+        m0 = self.year_mask(annees)
+        if base is not None:
+            m0 = m0 & base
+
+        actifs = [(c, v) for c, v in filters.items() if v != "Tous" and c in self.codes]
+        masks = []
+        for col, val in actifs:
+            b = self.value_bitmap(col, val)
+            masks.append(unpack(b, self.n_rows) if b is not None else np.zeros(self.n_rows, dtype=bool))
+
+        k = len(masks)
+        prefix = [m0]
+        for m in masks:
+            prefix.append(prefix[-1] & m)
+        suffix = [np.ones(self.n_rows, dtype=bool)] * (k + 1)
+        for i in range(k - 1, -1, -1):
+            suffix[i] = suffix[i + 1] & masks[i]
+        position = {col: i for i, (col, _) in enumerate(actifs)}
+
+        out = {}
+        for col, codes in self.codes.items():
+            i = position.get(col)
+            others = prefix[k] if i is None else prefix[i] & suffix[i + 1]
+            out[col] = np.bincount(codes[others], minlength=len(self.values[col]))
+        return out
+
+    def rows(self, filters: dict, annees: Optional[tuple] = None) -> np.ndarray:
+        """Positions (triées) des lignes qui respectent les filtres."""
+        return np.flatnonzero(self.mask(filters, annees))
+
+    def positions(self, labels: pd.Index) -> np.ndarray:
+        """Positions (dans l'index) des lignes d'un sous-ensemble du DataFrame indexé."""
+        return _positions(labels, self.labels)
@@ -0,0 +1,265 @@
+"""
+Prédictions mémorisées pour l'onglet Prédire.
+
+Les utilisateurs testent souvent les mêmes combinaisons de caractéristiques.
+Ce module normalise une saisie en clé canonique, puis garde les résultats du
+modèle dans un cache LRU borné, partagé entre les sessions Streamlit.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Colonnes attendues par le pipeline (même schéma que `X_new` dans app.py)
+FEATURE_COLS = [
+    "Famille",
+    "Sous_famille",
+    "Parfumeur",
+    "Origine",
+    "Genre",
+    "Année",
+    "Ingredients_txt",
+    "Concepts_txt",
+]
+
+
+def _manquant(v) -> bool:
+    """Valeur absente (None, NaN) ; les listes et tableaux ne sont jamais considérés comme absents."""
+    return pd.api.types.is_scalar(v) and pd.isna(v)
+
+
+def _categorie(v) -> str:
+    """Catégorie en texte (valeur manquante -> "Inconnu")."""
+    return "Inconnu" if _manquant(v) else str(v)
+
+
+def _annee(v) -> int:
+    """Année entière (valeur manquante ou non numérique -> 0)."""
+    try:
+        a = float(v)
+    except (TypeError, ValueError):
+        return 0
+    return int(a) if np.isfinite(a) else 0
+
+
+def _termes(terms) -> Tuple[str, ...]:
+    """
+    Termes normalisés en minuscules.
+
+    Une liste (ou un tableau lu depuis un fichier Parquet) est traitée comme un ensemble trié, sans doublons ;
+    une chaîne est conservée telle quelle comme texte unique ; une valeur manquante ne donne aucun terme.
+    """
+    if isinstance(terms, (list, tuple, set, np.ndarray)):
+        return tuple(sorted({str(t).strip().lower() for t in terms if not _manquant(t) and str(t).strip()}))
+    if terms is None or _manquant(terms):
+        return ()
+    texte = str(terms).strip().lower()
+    return (texte,) if texte else ()
+
+
+def cle_prediction(
+    famille,
+    sous_famille,
+    parfumeur,
+    origine,
+    genre,
+    annee,
+    ingredients: Optional[Iterable[str]] = None,
+    concepts: Optional[Iterable[str]] = None,
+) -> tuple:
+    """
+    Construit la clé canonique d'une prédiction.
+
+    Les ingrédients et concepts sont traités comme des ensembles triés : l'ordre de
+    sélection dans les widgets ne change donc ni la clé ni le texte envoyé au modèle.
+    C'est la seule normalisation des entrées : `normaliser_entrees` (lots, service) passe aussi par elle.
+
+    :param famille: Famille olfactive (valeur manquante -> "Inconnu")
+    :param sous_famille: Sous-famille olfactive
+    :param parfumeur: Parfumeur
+    :param origine: Origine
+    :param genre: Genre
+    :param annee: Année (valeur manquante ou non numérique -> 0)
+    :param ingredients: Termes ingrédients sélectionnés (liste de termes ou texte)
+    :param concepts: Termes concepts sélectionnés (liste de termes ou texte)
+    :return: Tuple hashable utilisable comme clé de cache
+    :rtype: tuple
+    """
+    return (
+        _categorie(famille),
+        _categorie(sous_famille),
+        _categorie(parfumeur),
+        _categorie(origine),
+        _categorie(genre),
+        _annee(annee),
+        _termes(ingredients),
+        _termes(concepts),
+    )
+
+
+def _ligne(cle: tuple) -> dict:
+    """Ligne d'entrée du modèle (schéma `FEATURE_COLS`) correspondant à une clé."""
+    famille, sous_famille, parfumeur, origine, genre, annee, ingredients, concepts = cle
+    return {
+        "Famille": famille,
+        "Sous_famille": sous_famille,
+        "Parfumeur": parfumeur,
+        "Origine": origine,
+        "Genre": genre,
+        "Année": annee,
+        "Ingredients_txt": " ".join(ingredients),
+        "Concepts_txt": " ".join(concepts),
+    }
+
+
+def X_depuis_cle(cle: tuple) -> pd.DataFrame:
+    """
+    Reconstruit le DataFrame d'entrée du modèle (une ligne) à partir d'une clé.
+
+    :param cle: Clé produite par `cle_prediction`
+    :type cle: tuple
+    :return: DataFrame à une ligne au schéma de `FEATURE_COLS`
+    :rtype: pd.DataFrame
+    """
+    return pd.DataFrame([_ligne(cle)], columns=FEATURE_COLS)
+
+
+def normaliser_entrees(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Valide et normalise un lot de parfums exactement comme le formulaire Prédire : chaque ligne passe par
+    `cle_prediction`, puis est reconstruite comme dans `X_depuis_cle`.
+
+    - Catégories en texte (valeur manquante -> "Inconnu"),
+    - Année entière (valeur manquante ou non numérique -> 0),
+    - Ingrédients / concepts : liste de termes (triés, sans doublons) ou texte, mis en minuscules.
+
+    :param df: DataFrame contenant au moins les colonnes `FEATURE_COLS`
+    :type df: pd.DataFrame
+    :return: DataFrame d'entrée du modèle, colonnes dans l'ordre de `FEATURE_COLS`
+    :rtype: pd.DataFrame
+    :raises ValueError: Colonnes manquantes
+    """
+    manquantes = [c for c in FEATURE_COLS if c not in df.columns]
+    if manquantes:
+        raise ValueError(f"Colonnes manquantes : {', '.join(manquantes)}")
+
+    lignes = [_ligne(cle_prediction(*valeurs)) for valeurs in df[FEATURE_COLS].itertuples(index=False, name=None)]
+    X = pd.DataFrame(lignes, columns=FEATURE_COLS, index=df.index)
+    X["Année"] = X["Année"].astype(int)
+    return X
+
+
+@dataclass(frozen=True)
+class Prediction:
+    """Résultat immuable d'une prédiction : label + probabilités triées."""
+
+    label: str
+    classes: Tuple[str, ...] = ()
+    probas: Tuple[float, ...] = ()
+
+    def proba_df(self) -> Optional[pd.DataFrame]:
+        """Probabilités sous forme de DataFrame (Classe, Probabilité), ou None."""
+        if not self.classes:
+            return None
+        return pd.DataFrame({"Classe": list(self.classes), "Probabilité": list(self.probas)})
+
+
+def predire(model, X: pd.DataFrame) -> Prediction:
+    """
+    Prédit la première ligne de `X` avec un seul appel à `predict_proba`.
+
+    Le label est la classe de probabilité maximale (ce que renvoie `predict` pour un
+    GradientBoostingClassifier). Sans `predict_proba`, on retombe sur `predict`.
+
+    :param model: Pipeline scikit-learn entraîné
+    :param X: DataFrame d'entrée
+    :type X: pd.DataFrame
+    :return: Prédiction (label + probabilités triées par ordre décroissant)
+    :rtype: Prediction
+    """
+    classes = list(getattr(model, "classes_", []))
+    if not hasattr(model, "predict_proba") or not classes:
+        return Prediction(label=str(model.predict(X)[0]))
+    return prediction_depuis_proba(classes, model.predict_proba(X)[0])
+
+
+def prediction_depuis_proba(classes, proba) -> Prediction:
+    """
+    Construit une `Prediction` à partir d'une ligne de `predict_proba`.
+
+    :param classes: Classes du modèle (`model.classes_`)
+    :param proba: Probabilités d'une ligne, dans l'ordre de `classes`
+    :return: Prédiction (label + probabilités triées par ordre décroissant)
+    :rtype: Prediction
+    """
+    proba = np.asarray(proba, dtype=float)
+    order = np.argsort(-proba, kind="stable")
+    return Prediction(
+        label=str(classes[int(order[0])]),
+        classes=tuple(str(classes[i]) for i in order),
+        probas=tuple(float(proba[i]) for i in order),
+    )
+
+
+class PredictionCache:
+    """
+    Cache LRU borné de prédictions, sûr entre threads (une session Streamlit = un thread).
+
+    :param model: Pipeline scikit-learn entraîné
+    :param maxsize: Nombre maximum de clés conservées
+    """
+
+    def __init__(self, model, maxsize: int = 2048):
+        self.model = model
+        self.maxsize = max(int(maxsize), 1)
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[tuple, Prediction]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def predict(self, cle: tuple) -> Prediction:
+        """Retourne la prédiction pour `cle`, en ne sollicitant le modèle qu'en cas d'absence."""
+        with self._lock:
+            pred = self._data.get(cle)
+            if pred is not None:
+                self._data.move_to_end(cle)
+                self.hits += 1
+                return pred
+            self.misses += 1
+
+        # Calcul hors verrou : les autres sessions ne sont pas bloquées pendant le modèle
+        pred = predire(self.model, X_depuis_cle(cle))
+
+        with self._lock:
+            self._data[cle] = pred
+            self._data.move_to_end(cle)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return pred
+
+    def stats(self) -> dict:
+        """Compteurs du cache : hits, misses, taille et taux de réussite."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "taille": len(self._data),
+                "taux": (self.hits / total) if total else 0.0,
+            }
+
+    def clear(self):
+        """Vide le cache et remet les compteurs à zéro."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
@@ -3,14 +3,75 @@ Rendu des cartes parfums dans Streamlit.
 
 Ce module regroupe la logique d'affichage (UI) des résultats sous forme de cartes
 stylées, à partir d'un DataFrame de parfums.
+
+Les cartes d'une page sont assemblées en un seul bloc HTML (un seul élément
+Streamlit par page, au lieu d'un conteneur et de 8 colonnes par carte) ; leur
+style est partagé dans `style/style.css` (classes `carte-parfum*`).
 """
 
+import time
+from html import escape
+
 import streamlit as st
 import pandas as pd
-from streamlit_extras.stylable_container import stylable_container
 
+# Longueur maximale des extraits Ingrédients / Concepts
+EXTRAIT_MAX = 120
+
+# Tailles de page proposées dans l'explorateur
+PAGE_SIZES = [10, 20, 50, 100]
+
+
+def _txt(r, col: str) -> str:
+    v = r.get(col, "")
+    return "" if pd.isna(v) else str(v)
+
+
+def _extrait(texte: str, n: int = EXTRAIT_MAX) -> str:
+    return texte[:n] + ("…" if len(texte) > n else "")
 
-def pretty_cards(df_show: pd.DataFrame, max_cards: int = 30):
+
+def card_html(r) -> str:
+    """
+    HTML d'une carte parfum (valeurs échappées).
+
+    :param r: Ligne du DataFrame (Series ou dict)
+    :return: Fragment HTML sur une seule ligne
+    :rtype: str
+    """
+    prix = _txt(r, "Prix_Categorie")
+    classe_prix = "prix-niche" if prix == "Niche" else "prix-autre"
+    cellules = [
+        ("Famille", _txt(r, "Famille")),
+        ("Sous-famille", _txt(r, "Sous_famille")),
+        ("Genre", _txt(r, "Genre")),
+        ("Ingrédients", _extrait(_txt(r, "Ingredients_txt"))),
+        ("Parfumeur", _txt(r, "Parfumeur")),
+        ("Origine", _txt(r, "Origine")),
+        ("Prix", f"<span class='{classe_prix}'>{escape(prix)}</span>"),
+        ("Concepts", _extrait(_txt(r, "Concepts_txt"))),
+    ]
+    grille = "".join(
+        f"<div><b>{nom} :</b> {valeur if nom == 'Prix' else escape(valeur)}</div>"
+        for nom, valeur in cellules
+    )
+    titre = (
+        f"<div class='carte-parfum-titre'>{escape(_txt(r, 'Fragrance'))} "
+        f"<span>— {escape(_txt(r, 'Marque'))} ({escape(_txt(r, 'Année'))})</span></div>"
+    )
+    return f"<div class='carte-parfum'>{titre}<div class='carte-parfum-grille'>{grille}</div></div>"
+
+
+def cards_html(df_page: pd.DataFrame) -> str:
+    """
+    Bloc HTML de toutes les cartes d'une page.
+
+    Aucune ligne vide ni indentation : le Markdown de Streamlit garde le bloc tel quel.
+    """
+    return "".join(card_html(r) for r in df_page.to_dict("records"))
+
+
+def pretty_cards(df_show: pd.DataFrame, max_cards: int = 30) -> float:
     """
     Affiche une liste de cartes (une par parfum) pour les lignes du DataFrame.
 
@@ -18,37 +79,52 @@ def pretty_cards(df_show: pd.DataFrame, max_cards: int = 30):
     :type df_show: pd.DataFrame
     :param max_cards: Nombre maximum de cartes à afficher
     :type max_cards: int
+    :return: Durée de construction + envoi du bloc, en millisecondes
+    :rtype: float
+    """
+    t0 = time.perf_counter()
+    st.markdown(cards_html(df_show.head(max_cards)), unsafe_allow_html=True)
+    return (time.perf_counter() - t0) * 1000
+
+
+def pagination(n_rows: int, page_size: int, key: str, signature=None) -> tuple[int, int]:
     """
+    Navigation Précédent / Suivant entre les pages de résultats.
+
+    La page courante est gardée dans `st.session_state[key]` ; elle revient à la
+    première page quand `signature` (filtres, tri…) change.
+
+    :param n_rows: Nombre total de résultats
+    :param page_size: Nombre de résultats par page
+    :param key: Clé de session de la page courante
+    :param signature: Valeur hashable décrivant la requête courante
+    :return: Bornes (début, fin) de la page dans les résultats
+    :rtype: tuple[int, int]
+    """
+    page_size = max(int(page_size), 1)
+    n_pages = max((n_rows + page_size - 1) // page_size, 1)
+
+    sig_key = f"{key}_signature"
+    if st.session_state.get(sig_key) != (signature, page_size):
+        st.session_state[sig_key] = (signature, page_size)
+        st.session_state[key] = 0
+    page = min(max(int(st.session_state.get(key, 0)), 0), n_pages - 1)
+    st.session_state[key] = page
+
+    def _aller(delta: int):
+        st.session_state[key] = min(max(st.session_state[key] + delta, 0), n_pages - 1)
+
+    # Callbacks : la page est mise à jour avant le rerun, les boutons reflètent donc la nouvelle page
+    c_prev, c_info, c_next = st.columns([1, 3, 1])
+    with c_prev:
+        st.button("◀ Précédent", key=f"{key}_prev", disabled=page == 0,
+                  on_click=_aller, args=(-1,), use_container_width=True)
+    with c_next:
+        st.button("Suivant ▶", key=f"{key}_next", disabled=page >= n_pages - 1,
+                  on_click=_aller, args=(1,), use_container_width=True)
 
-    for i, r in df_show.head(max_cards).iterrows():
-        with stylable_container(
-            key=f"carte_parfum_{i}",
-            css_styles="""
-                {
-                    background-color: #fff8f5 ;
-                    border: 1px solid #e6d2c4;
-                    border-radius: 15px;
-                    padding: 20px;
-                    box-shadow: 0 2px 6px rgba(0,0,0,0.25);
-                    margin-bottom: 10px;
-                }
-                
-            """
-        ):
-            st.markdown(f"### {r.get('Fragrance','')} <span style='font-size:0.8em; color:#888; font-weight:normal'>— {r.get('Marque','')} ({r.get('Année','')})</span>", unsafe_allow_html=True)
-            ing = str(r.get("Ingredients_txt", ""))[:120]
-            con = str(r.get("Concepts_txt", ""))[:120]
-            price = r.get('Prix_Categorie','')
-            color_price = "#d35400" if price == "Niche" else "#27ae60"
-            
-            cF, cSF, cG, cI = st.columns([2, 2, 2, 5])
-            with cF: st.markdown(f"**Famille :** {r.get('Famille','')}")
-            with cSF: st.markdown(f"**Sous-famille :** {r.get('Sous_famille','')}")
-            with cG: st.markdown(f"**Genre :** {r.get('Genre','')}")
-            with cI: st.markdown(f"**Ingrédients :** {ing}...")
-
-            cP, cO, cPG, cC = st.columns([2, 2, 2, 5])
-            with cP: st.markdown(f"**Parfumeur :** {r.get('Parfumeur','')}")
-            with cO: st.markdown(f"**Origine :** {r.get('Origine','')}")
-            with cPG: st.markdown(f"**Prix :** <span style='color:{color_price}; font-weight:bold'>{price}</span>", unsafe_allow_html=True)
-            with cC: st.markdown(f"**Concepts :** {con}{'…' if len(str(r.get('Concepts_txt',''))) > 120 else ''}")
\ No newline at end of file
+    start = page * page_size
+    stop = min(start + page_size, n_rows)
+    with c_info:
+        st.caption(f"Page {page + 1} / {n_pages} — parfums {start + 1 if n_rows else 0} à {stop} sur {n_rows}")
+    return start, stop
@@ -0,0 +1,160 @@
+"""
+Index de recherche plein texte pour l'explorateur.
+
+La recherche `q` de `filter_df` porte sur Fragrance, Marque, Parfumeur,
+Ingredients_txt et Concepts_txt. Au lieu de rebalayer ces cinq colonnes à
+chaque rerun, on construit une fois par dataset :
+    - un index de trigrammes (trigramme -> lignes) pour élaguer les candidats,
+    - un vocabulaire trié pour l'autocomplétion par préfixe.
+Les candidats sont ensuite vérifiés par une recherche de sous-chaîne exacte.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Colonnes indexées et poids utilisés pour le classement des résultats
+SEARCH_WEIGHTS = {
+    "Fragrance": 5.0,
+    "Marque": 4.0,
+    "Parfumeur": 3.0,
+    "Ingredients_txt": 2.0,
+    "Concepts_txt": 1.0,
+}
+
+# Séparateur de champs : ne peut pas apparaître dans une requête saisie
+_SEP = "\x1f"
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    """
+    Index de trigrammes sur les colonnes texte d'un DataFrame.
+
+    :param df: DataFrame complet
+    :type df: pd.DataFrame
+    :param cols: Colonnes à indexer (par défaut celles de `SEARCH_WEIGHTS`)
+    """
+
+    def __init__(self, df: pd.DataFrame, cols: Optional[list[str]] = None):
+        self.labels = df.index
+        self.n_rows = len(df)
+        self.cols = [c for c in (cols or list(SEARCH_WEIGHTS)) if c in df.columns]
+        self.texts = {
+            c: df[c].astype(str).str.lower().to_numpy(dtype=object) for c in self.cols
+        }
+        self.corpus = [
+            _SEP.join(fields) for fields in zip(*(self.texts[c] for c in self.cols))
+        ] if self.cols else [""] * self.n_rows
+
+        postings: dict[str, list[int]] = defaultdict(list)
+        for row, text in enumerate(self.corpus):
+            for g in _trigrams(text):
+                postings[g].append(row)
+        self.postings = {g: np.asarray(rows, dtype=np.int32) for g, rows in postings.items()}
+
+        # Vocabulaire d'autocomplétion : valeurs courtes (noms, marques, parfumeurs) + mots
+        words: dict[str, int] = defaultdict(int)
+        for c in self.cols:
+            for value in self.texts[c]:
+                seen = set(value.split())
+                if c in ("Fragrance", "Marque", "Parfumeur"):
+                    seen.add(value.strip())
+                for w in seen:
+                    if w:
+                        words[w] += 1
+        vocab = sorted(words)
+        self.vocab = np.asarray(vocab, dtype=object)
+        self.vocab_freq = np.asarray([words[w] for w in vocab], dtype=np.int64)
+
+    def candidates(self, q: str) -> np.ndarray:
+        """
+        Lignes susceptibles de contenir `q` (intersection des listes de ses trigrammes).
+        Une requête de moins de 3 caractères ne permet pas d'élaguer : toutes les lignes.
+        """
+        q_ = q.strip().lower()
+        grams = _trigrams(q_)
+        if not grams:
+            return np.arange(self.n_rows)
+        lists = []
+        for g in grams:
+            rows = self.postings.get(g)
+            if rows is None:
+                return np.zeros(0, dtype=np.int32)
+            lists.append(rows)
+        lists.sort(key=len)
+        out = lists[0]
+        for rows in lists[1:]:
+            out = np.intersect1d(out, rows, assume_unique=True)
+            if not len(out):
+                break
+        return out
+
+    def mask(self, q: str) -> np.ndarray:
+        """Masque booléen des lignes dont un des champs contient `q` (sous-chaîne, sans casse)."""
+        q_ = q.strip().lower()
+        m = np.zeros(self.n_rows, dtype=bool)
+        if not q_:
+            m[:] = True
+            return m
+        cand = self.candidates(q_)
+        corpus = self.corpus
+        hits = [r for r in cand if q_ in corpus[r]]
+        m[np.asarray(hits, dtype=np.int64)] = True
+        return m
+
+    def search(self, q: str, rows: Optional[np.ndarray] = None, limit: Optional[int] = None) -> np.ndarray:
+        """
+        Lignes contenant `q`, classées par pertinence.
+
+        Score = somme des poids des champs qui contiennent `q`, avec un bonus quand le
+        champ commence par `q` ; à score égal, l'ordre du DataFrame est conservé.
+
+        :param q: Texte recherché
+        :param rows: Restreint la recherche à ces positions (ex. résultat des filtres)
+        :param limit: Nombre maximum de résultats
+        :return: Positions des lignes, de la plus pertinente à la moins pertinente
+        :rtype: np.ndarray
+        """
+        q_ = q.strip().lower()
+        m = self.mask(q_)
+        if rows is not None:
+            keep = np.zeros(self.n_rows, dtype=bool)
+            keep[rows] = True
+            m &= keep
+        hits = np.flatnonzero(m)
+        if not q_ or not len(hits):
+            return hits[:limit] if limit else hits
+
+        scores = np.zeros(len(hits), dtype=float)
+        for c in self.cols:
+            w = SEARCH_WEIGHTS.get(c, 1.0)
+            vals = self.texts[c][hits]
+            scores += w * np.fromiter((q_ in v for v in vals), dtype=float, count=len(hits))
+            scores += 0.5 * w * np.fromiter((v.startswith(q_) for v in vals), dtype=float, count=len(hits))
+        order = np.argsort(-scores, kind="stable")
+        ranked = hits[order]
+        return ranked[:limit] if limit else ranked
+
+    def suggest(self, prefix: str, k: int = 8) -> list[str]:
+        """
+        Autocomplétion : les `k` entrées du vocabulaire qui commencent par `prefix`,
+        des plus fréquentes aux moins fréquentes.
+        """
+        p = prefix.strip().lower()
+        if not p or not len(self.vocab):
+            return []
+        lo = int(np.searchsorted(self.vocab, p, side="left"))
+        hi = int(np.searchsorted(self.vocab, p + "\uffff", side="left"))
+        if hi <= lo:
+            return []
+        freq = self.vocab_freq[lo:hi]
+        order = np.argsort(-freq, kind="stable")[:k]
+        return [str(self.vocab[lo + i]) for i in order]
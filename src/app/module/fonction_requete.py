@@ -0,0 +1,109 @@
+"""
+Couche de requête de l'explorateur : tri et pagination sur des positions de lignes.
+
+Les filtres (`fonction_filtre.filter_rows`, `fonction_filtre_2.filter_rows_by_terms`)
+renvoient des positions dans le DataFrame complet. Ce module trie ces positions à
+l'aide d'ordres globaux précalculés (un par clé de tri, voir `Catalogue.ordres`),
+puis n'extrait que la page demandée et les colonnes utiles : la taille envoyée au
+navigateur dépend de la page, pas du nombre de résultats.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Clés de tri précalculées : colonne -> ordre ascendant ?
+SORT_KEYS = {
+    "Année": False,
+    "Marque": True,
+}
+
+# Colonnes affichées par la vue Tableau (ordre d'affichage) : le tableau reste compact,
+# les textes longs (ingrédients, concepts) ne sont lus que par les cartes
+TABLE_COLS = [
+    "Fragrance",
+    "Marque",
+    "Année",
+    "Prix_Categorie",
+    "Famille",
+    "Sous_famille",
+    "Genre",
+    "Origine",
+    "Parfumeur",
+]
+
+# Colonnes lues par les cartes (`fonction_prettycard.card_html`)
+CARD_COLS = [
+    "Fragrance",
+    "Marque",
+    "Année",
+    "Prix_Categorie",
+    "Famille",
+    "Sous_famille",
+    "Genre",
+    "Ingredients_txt",
+    "Parfumeur",
+    "Origine",
+    "Concepts_txt",
+]
+
+
+def sort_order(series: pd.Series, ascending: bool = True) -> np.ndarray:
+    """
+    Permutation globale qui trie `series` (tri stable, valeurs manquantes en dernier,
+    comme `sort_values`).
+
+    :param series: Colonne à trier
+    :type series: pd.Series
+    :param ascending: Ordre croissant (True) ou décroissant (False)
+    :return: Positions des lignes dans l'ordre de tri
+    :rtype: np.ndarray
+    """
+    codes, _ = pd.factorize(series, sort=True)
+    codes = codes.astype(np.int64)
+    na = codes < 0
+    key = codes if ascending else -codes
+    return np.lexsort((key, na))
+
+
+def sort_orders(df: pd.DataFrame, keys: Optional[dict] = None) -> dict[str, np.ndarray]:
+    """Ordres globaux de toutes les clés de tri présentes dans `df`."""
+    keys = SORT_KEYS if keys is None else keys
+    return {col: sort_order(df[col], asc) for col, asc in keys.items() if col in df.columns}
+
+
+def sort_rows(rows: np.ndarray, order: np.ndarray) -> np.ndarray:
+    """
+    Trie des positions de lignes selon un ordre global : l'ordre est simplement masqué
+    par l'ensemble des lignes retenues (pas de comparaison de valeurs).
+
+    :param rows: Positions des lignes retenues
+    :param order: Ordre global (`sort_order`) sur toutes les lignes
+    :return: Positions retenues, triées
+    :rtype: np.ndarray
+    """
+    keep = np.zeros(len(order), dtype=bool)
+    keep[rows] = True
+    return order[keep[order]]
+
+
+def page(df: pd.DataFrame, rows: np.ndarray, start: int, stop: int, cols: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    Extrait les lignes `rows[start:stop]` et les colonnes `cols` de `df`, en un seul `iloc`.
+
+    :param df: DataFrame complet
+    :param rows: Positions (déjà triées) des résultats
+    :param start: Début de la page dans les résultats
+    :param stop: Fin (exclue) de la page
+    :param cols: Colonnes à garder (absentes ignorées) ; None = toutes
+    :return: Page de résultats
+    :rtype: pd.DataFrame
+    """
+    idx = np.asarray(rows)[start:stop]
+    if cols is None:
+        return df.iloc[idx]
+    col_pos = [df.columns.get_loc(c) for c in cols if c in df.columns]
+    return df.iloc[idx, col_pos]
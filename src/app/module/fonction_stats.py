@@ -5,6 +5,12 @@ Objectif: fournir des agrégations robustes (comptes, parts, séries temporelles
 à partir du DataFrame principal, et de quoi afficher les origines en cartes + carte.
 
 Aucune dépendance externe n'est requise (hors streamlit/pandas déjà utilisés).
+
+Les fonctions `*_df` calculent à partir d'un DataFrame. Leurs équivalents sans
+suffixe sont mis en cache par `VueCatalogue` (version du dataset + filtres) :
+une recherche dans le cache ne hache que ce handle, pas le DataFrame filtré.
+Quand la vue ne filtre que sur des dimensions du cube (`fonction_cube`), ils
+répondent depuis le cube pré-agrégé, sans relire les lignes.
 """
 
 from __future__ import annotations
@@ -12,9 +18,12 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
+from src.app.module.fonction_catalogue import Catalogue, VueCatalogue
+
 try:
     # Déjà utilisé dans le projet pour les cartes parfums
     from streamlit_extras.stylable_container import stylable_container
@@ -113,8 +122,7 @@ def _clean_series(s: pd.Series) -> pd.Series:
     return s.fillna("Inconnu").astype(str).str.strip().replace({"": "Inconnu"})
 
 
-@st.cache_data
-def distribution(df: pd.DataFrame, col: str, *, top_n: Optional[int] = None) -> DistResult:
+def distribution_df(df: pd.DataFrame, col: str, *, top_n: Optional[int] = None) -> DistResult:
     """Retourne une distribution (counts + parts) pour une colonne catégorielle."""
     if df is None or df.empty or col not in df.columns:
         return DistResult(pd.DataFrame(columns=["Valeur", "Count", "Part"]))
@@ -122,6 +130,14 @@ def distribution(df: pd.DataFrame, col: str, *, top_n: Optional[int] = None) ->
     s = _clean_series(df[col])
     # On force un schéma stable: série des comptes nommée "Count"
     vc = s.value_counts(dropna=False).rename("Count")
+    return _dist_result(vc, top_n=top_n)
+
+
+def _dist_result(vc: pd.Series, *, top_n: Optional[int] = None) -> DistResult:
+    """Met en forme des comptes (index = valeurs) : regroupement "Autres" au-delà de top_n + parts."""
+    if vc.empty:
+        return DistResult(pd.DataFrame(columns=["Valeur", "Count", "Part"]))
+    vc = vc.rename("Count")
 
     if top_n is not None and top_n > 0 and len(vc) > top_n:
         top = vc.head(top_n)
@@ -158,8 +174,7 @@ def distribution(df: pd.DataFrame, col: str, *, top_n: Optional[int] = None) ->
     return DistResult(out[["Valeur", "Count", "Part"]])
 
 
-@st.cache_data
-def yearly_counts(df: pd.DataFrame, year_col: str = "Année") -> pd.DataFrame:
+def yearly_counts_df(df: pd.DataFrame, year_col: str = "Année") -> pd.DataFrame:
     """Série temporelle: nb de parfums par année."""
     if df is None or df.empty or year_col not in df.columns:
         return pd.DataFrame(columns=[year_col, "Count"])
@@ -169,8 +184,7 @@ def yearly_counts(df: pd.DataFrame, year_col: str = "Année") -> pd.DataFrame:
     return vc.rename("Count").reset_index().rename(columns={"index": year_col})
 
 
-@st.cache_data
-def price_by_year(df: pd.DataFrame, *, year_col: str = "Année", price_col: str = "Prix_Categorie") -> pd.DataFrame:
+def price_by_year_df(df: pd.DataFrame, *, year_col: str = "Année", price_col: str = "Prix_Categorie") -> pd.DataFrame:
     """Table pivot: index=année, colonnes=catégorie de prix, valeurs=counts."""
     if df is None or df.empty or year_col not in df.columns or price_col not in df.columns:
         return pd.DataFrame()
@@ -194,14 +208,18 @@ def price_by_year(df: pd.DataFrame, *, year_col: str = "Année", price_col: str
     return pivot
 
 
-@st.cache_data
-def origins_geo(df: pd.DataFrame, *, origin_col: str = "Origine", top_n: int = 30) -> pd.DataFrame:
+def origins_geo_df(df: pd.DataFrame, *, origin_col: str = "Origine", top_n: int = 30) -> pd.DataFrame:
     """Construit un DataFrame avec lat/lon pour afficher les origines sur une carte."""
     if df is None or df.empty or origin_col not in df.columns:
         return pd.DataFrame(columns=["Origine", "Count", "lat", "lon"])  # st.map attend lat/lon
 
     s = _clean_series(df[origin_col])
-    vc = s.value_counts().head(max(int(top_n), 1))
+    return _origins_geo_rows(s.value_counts(), top_n=top_n)
+
+
+def _origins_geo_rows(vc: pd.Series, *, top_n: int = 30) -> pd.DataFrame:
+    """Top origines (comptes triés) -> Origine/Count/lat/lon."""
+    vc = vc.head(max(int(top_n), 1))
 
     rows = []
     for origin, count in vc.items():
@@ -215,14 +233,18 @@ def origins_geo(df: pd.DataFrame, *, origin_col: str = "Origine", top_n: int = 3
     return pd.DataFrame(rows).sort_values("Count", ascending=False)
 
 
-@st.cache_data
-def origins_choropleth(df: pd.DataFrame, *, origin_col: str = "Origine", top_n: int = 30) -> pd.DataFrame:
+def origins_choropleth_df(df: pd.DataFrame, *, origin_col: str = "Origine", top_n: int = 30) -> pd.DataFrame:
     """Construit un DataFrame (Origine/Count/iso_alpha) pour une carte choroplèthe Plotly."""
     if df is None or df.empty or origin_col not in df.columns:
         return pd.DataFrame(columns=["Origine", "Count", "iso_alpha"])
 
     s = _clean_series(df[origin_col])
-    vc = s.value_counts().head(max(int(top_n), 1))
+    return _origins_choropleth_rows(s.value_counts(), top_n=top_n)
+
+
+def _origins_choropleth_rows(vc: pd.Series, *, top_n: int = 30) -> pd.DataFrame:
+    """Top origines (comptes triés) -> Origine/Count/iso_alpha."""
+    vc = vc.head(max(int(top_n), 1))
 
     rows = []
     for origin, count in vc.items():
@@ -236,6 +258,103 @@ def origins_choropleth(df: pd.DataFrame, *, origin_col: str = "Origine", top_n:
     return pd.DataFrame(rows).sort_values("Count", ascending=False)
 
 
+def _cube_mask(catalogue: Catalogue, vue: VueCatalogue, *dims: str) -> Optional[np.ndarray]:
+    """
+    Masque des cellules du cube pour la vue, ou None si le cube ne peut pas répondre
+    (filtre ou dimension demandée hors du cube) : on retombe alors sur les lignes brutes.
+    """
+    cube = catalogue.cube
+    filtres = dict(vue.filtres)
+    if cube is None or not cube.supports(filtres) or any(d not in cube.dims for d in dims):
+        return None
+    if vue.annees is not None and cube.year_col not in cube.dims:
+        return None
+    return cube.mask(filtres, vue.annees)
+
+
+@st.cache_data(max_entries=256)
+def distribution(_catalogue: Catalogue, vue: VueCatalogue, col: str, *, top_n: Optional[int] = None) -> DistResult:
+    """Distribution (counts + parts) d'une colonne catégorielle sur une vue du catalogue."""
+    m = _cube_mask(_catalogue, vue, col)
+    if m is None or col == _catalogue.cube.year_col:
+        return distribution_df(vue.df(_catalogue), col, top_n=top_n)
+    return _dist_result(_catalogue.cube.value_counts(col, m), top_n=top_n)
+
+
+@st.cache_data(max_entries=256)
+def yearly_counts(_catalogue: Catalogue, vue: VueCatalogue, year_col: str = "Année") -> pd.DataFrame:
+    """Nb de parfums par année sur une vue du catalogue."""
+    m = _cube_mask(_catalogue, vue, year_col)
+    if m is None or year_col != _catalogue.cube.year_col:
+        return yearly_counts_df(vue.df(_catalogue), year_col)
+    return _catalogue.cube.year_counts(m).rename("Count").reset_index()
+
+
+@st.cache_data(max_entries=256)
+def price_by_year(_catalogue: Catalogue, vue: VueCatalogue, *, year_col: str = "Année", price_col: str = "Prix_Categorie") -> pd.DataFrame:
+    """Pivot année x catégorie de prix sur une vue du catalogue."""
+    m = _cube_mask(_catalogue, vue, year_col, price_col)
+    if m is None or year_col != _catalogue.cube.year_col:
+        return price_by_year_df(vue.df(_catalogue), year_col=year_col, price_col=price_col)
+    return _catalogue.cube.year_by(price_col, m)
+
+
+@st.cache_data(max_entries=256)
+def origins_geo(_catalogue: Catalogue, vue: VueCatalogue, *, origin_col: str = "Origine", top_n: int = 30) -> pd.DataFrame:
+    """Origines + lat/lon sur une vue du catalogue."""
+    m = _cube_mask(_catalogue, vue, origin_col)
+    if m is None:
+        return origins_geo_df(vue.df(_catalogue), origin_col=origin_col, top_n=top_n)
+    vc = _catalogue.cube.value_counts(origin_col, m)
+    if vc.empty:
+        return pd.DataFrame(columns=["Origine", "Count", "lat", "lon"])
+    return _origins_geo_rows(vc, top_n=top_n)
+
+
+@st.cache_data(max_entries=256)
+def origins_choropleth(_catalogue: Catalogue, vue: VueCatalogue, *, origin_col: str = "Origine", top_n: int = 30) -> pd.DataFrame:
+    """Origines + codes ISO-3 sur une vue du catalogue."""
+    m = _cube_mask(_catalogue, vue, origin_col)
+    if m is None:
+        return origins_choropleth_df(vue.df(_catalogue), origin_col=origin_col, top_n=top_n)
+    vc = _catalogue.cube.value_counts(origin_col, m)
+    if vc.empty:
+        return pd.DataFrame(columns=["Origine", "Count", "iso_alpha"])
+    return _origins_choropleth_rows(vc, top_n=top_n)
+
+
+@st.cache_data(max_entries=256)
+def indicateurs(_catalogue: Catalogue, vue: VueCatalogue, cols: Tuple[str, ...] = ("Marque", "Origine"), year_col: str = "Année") -> Dict[str, int]:
+    """
+    Indicateurs d'une vue sans extraire ses lignes : nb de parfums, nb de valeurs distinctes de `cols`
+    (valeurs manquantes exclues, comme `nunique`) et nb d'années.
+
+    Parfums et années viennent du cube quand il couvre la vue ; les valeurs distinctes, des codes
+    du moteur de filtres (colonnes hors cube comme la marque).
+    """
+    rows = vue.rows(_catalogue)
+    engine = _catalogue.engine
+    out = {"Parfums": int(len(rows))}
+
+    for col in cols:
+        if col in engine:
+            codes = engine.codes[col][rows]
+            out[col] = int(np.unique(codes[codes >= 0]).size)
+        else:
+            out[col] = int(_catalogue.df[col].iloc[rows].nunique()) if col in _catalogue.df.columns else 0
+
+    m = _cube_mask(_catalogue, vue, year_col)
+    if m is not None and year_col == _catalogue.cube.year_col:
+        out["Parfums"] = int(_catalogue.cube.counts[m].sum())
+        out[year_col] = int(len(_catalogue.cube.year_counts(m)))
+    elif engine.years is not None and year_col == engine.year_col:
+        years = engine.years[rows]
+        out[year_col] = int(np.unique(years[~np.isnan(years)]).size)
+    else:
+        out[year_col] = 0
+    return out
+
+
 def render_origin_cards(dist_df: pd.DataFrame, *, max_cards: int = 12):
     """Affiche la distribution d'origines sous forme de cartes (top N)."""
     if dist_df is None or dist_df.empty:
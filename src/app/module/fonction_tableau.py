@@ -59,3 +59,29 @@ def show_terms_table(df_terms: pd.DataFrame, *, height: int = 520):
             ),
         },
     )
+
+
+def show_associations_table(df_assoc: pd.DataFrame, *, height: int = 420):
+    """Affiche un tableau d'associations de termes (voisins d'un terme ou paires)."""
+    if df_assoc is None or df_assoc.empty:
+        st.info("Aucune association (pas assez de parfums en commun).")
+        return
+
+    st.dataframe(
+        df_assoc,
+        use_container_width=True,
+        height=height,
+        hide_index=True,
+        column_config={
+            "Ensemble": st.column_config.ProgressColumn(
+                "Ensemble",
+                help="Nombre de parfums contenant les deux termes",
+                min_value=0,
+                max_value=int(df_assoc["Ensemble"].max()),
+                format="%d",
+            ),
+            "Confiance": st.column_config.NumberColumn("Confiance", help="Part des parfums du terme choisi qui contiennent aussi ce terme", format="percent"),
+            "Lift": st.column_config.NumberColumn("Lift", help="Co-occurrence observée / attendue si les termes étaient indépendants", format="%.2f"),
+            "PMI": st.column_config.NumberColumn("PMI", help="Information mutuelle ponctuelle : log2(lift)", format="%.2f"),
+        },
+    )
@@ -0,0 +1,67 @@
+"""
+Navigation entre les vues de l'application Streamlit.
+
+`st.tabs` exécute le contenu de tous les onglets à chaque rerun, même ceux qui
+ne sont pas affichés. Ici, chaque vue est une fonction : seule la vue choisie
+est exécutée, et son temps d'exécution est affiché dans un petit encart.
+"""
+
+import time
+from html import escape
+from typing import Callable
+
+import streamlit as st
+
+
+def choisir_vue(vues: list[str], key: str, label: str = "Navigation") -> str:
+    """
+    Sélecteur horizontal de vue (contrôle segmenté).
+
+    :param vues: Noms des vues, la première étant la vue par défaut
+    :param key: Clé de session du sélecteur
+    :param label: Libellé (masqué) du widget
+    :return: Nom de la vue choisie (vue par défaut si aucune n'est sélectionnée)
+    :rtype: str
+    """
+    choix = st.segmented_control(label, vues, default=vues[0], key=key, label_visibility="collapsed")
+    return choix if choix in vues else vues[0]
+
+
+def executer_vue(nom: str, fonction: Callable[[], None], key: str = "chronos_vues") -> float:
+    """
+    Exécute une vue et mémorise sa durée dans `st.session_state[key]` (par nom de vue).
+
+    :param nom: Nom de la vue
+    :param fonction: Fonction qui affiche la vue
+    :param key: Clé de session des durées
+    :return: Durée d'exécution en millisecondes
+    :rtype: float
+    """
+    t0 = time.perf_counter()
+    fonction()
+    ms = (time.perf_counter() - t0) * 1000
+    st.session_state.setdefault(key, {})[nom] = ms
+    return ms
+
+
+def chrono_vues(vues: list[str], active: str, total_ms: float, key: str = "chronos_vues"):
+    """
+    Encart fixe (coin inférieur droit) : durée de la vue active pour ce rerun,
+    dernière durée connue des autres vues (non exécutées) et durée totale du script.
+
+    :param vues: Noms des vues
+    :param active: Vue exécutée pendant ce rerun
+    :param total_ms: Durée du script jusqu'ici, en millisecondes
+    :param key: Clé de session des durées
+    """
+    chronos = st.session_state.get(key, {})
+    lignes = []
+    for nom in vues:
+        if nom == active:
+            lignes.append(f"<b>{escape(nom)} : {chronos.get(nom, 0):.0f} ms</b>")
+        else:
+            dernier = chronos.get(nom)
+            detail = "non exécutée" if dernier is None else f"non exécutée (dernière : {dernier:.0f} ms)"
+            lignes.append(f"{escape(nom)} : {detail}")
+    lignes.append(f"Script : {total_ms:.0f} ms")
+    st.markdown(f"<div class='chrono-vues'>⏱️ {'<br/>'.join(lignes)}</div>", unsafe_allow_html=True)
@@ -3,6 +3,32 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+import pandas as pd
+import pytest
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
+
+
+@pytest.fixture
+def catalogue_df() -> pd.DataFrame:
+    """
+    Petit catalogue artificiel partagé par les tests (une copie neuve par test).
+
+    Les variantes propres à un test (valeurs manquantes, ex aequo, autres textes)
+    sont construites localement à partir de celui-ci.
+    """
+    return pd.DataFrame({
+        "Fragrance": ["A", "B", "C", "D", "E", "F"],
+        "Marque": ["Dior", "Chanel", "Dior", "Guerlain", "Chanel", "Dior"],
+        "Prix_Categorie": ["Niche", "Prestige", "Prestige", "Mass Market", "Niche", "Niche"],
+        "Famille": ["BOISÉ", "FLORAL", "BOISÉ", "FLORAL", None, "FLORAL"],
+        "Sous_famille": ["AMBRÉ", "ROSE", "AMBRÉ", "ROSE", "CUIR", "ROSE"],
+        "Parfumeur": ["X", "W", "Y", "X", "Z", "Y"],
+        "Origine": ["France", "France", "Italie", "France", "Italie", "France"],
+        "Genre": ["Homme", "Femme", "Femme", "Homme", "Unisexe", "Femme"],
+        "Année": [2001, 2010, 2015, 2020, 2020, 2012],
+        "Ingredients_txt": ["musc ambre", "Rose musc", "", "vanille ambre rose", "rose", "musc"],
+        "Concepts_txt": ["jour", "nuit jour", "eté", "nuit", "jour", "nuit"],
+    })
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.Machine_learning.module.apprentissage_flux import (
+    classes_parquet,
+    csv_vers_parquet,
+    entrainer_flux,
+    evaluer_flux,
+    lire_groupes,
+    modele_flux,
+    variables_flux,
+)
+from src.Machine_learning.module.pretraitement import prepare_X
+
+
+def _catalogue(n=300):
+    i = np.arange(n)
+    return pd.DataFrame({
+        "Marque": [f"M{k % 7}" for k in i],
+        "Famille": np.where(i % 2, "BOISÉ", "FLORAL"),
+        "Sous_famille": "AMBRÉ",
+        "Parfumeur": "P",
+        "Prix_Categorie": np.where(i % 2, "Niche", "Mass Market"),
+        "Fragrance": [f"F{k}" for k in i],
+        "Origine": "France",
+        "Genre": "Unisexe",
+        "Année": 1990 + i % 30,
+        "Ingredients_txt": np.where(i % 2, "oud encens cuir", "fraise vanille sucre"),
+        "Concepts_txt": "jour",
+    })
+
+
+def test_parquet_par_groupes(tmp_path):
+    _catalogue().to_csv(tmp_path / "cat.csv", index=False)
+    path = csv_vers_parquet(tmp_path / "cat.csv", tmp_path / "cat.parquet", taille_groupe=64)
+    assert pq.ParquetFile(path).num_row_groups == 5
+    assert [len(b) for b in lire_groupes(path)] == [64, 64, 64, 64, 44]
+    assert list(classes_parquet(path)) == ["Mass Market", "Niche"]
+
+
+def test_parquet_premier_groupe_vide(tmp_path):
+    df = _catalogue(100)
+    df.loc[:63, "Concepts_txt"] = None
+    df.to_csv(tmp_path / "cat.csv", index=False)
+    path = csv_vers_parquet(tmp_path / "cat.csv", tmp_path / "cat.parquet", taille_groupe=64)
+    assert str(pq.read_schema(path).field("Concepts_txt").type) == "string"
+    assert pd.concat(lire_groupes(path))["Concepts_txt"].notna().sum() == 36
+
+
+def test_variables_sans_etat():
+    X = prepare_X(_catalogue(20))
+    M = variables_flux(X, n_hash_texte=256, n_hash_cat=64)
+    assert M.shape == (20, 2 * 256 + 64)
+    # Une ligne donne la même représentation seule ou dans un bloc
+    assert (variables_flux(X.iloc[5:6], n_hash_texte=256, n_hash_cat=64) != M[5]).nnz == 0
+
+
+def test_entrainer_puis_evaluer(tmp_path):
+    _catalogue().to_csv(tmp_path / "cat.csv", index=False)
+    path = csv_vers_parquet(tmp_path / "cat.csv", tmp_path / "cat.parquet", taille_groupe=64)
+    model, bilan = entrainer_flux(path, modele_flux(n_hash_texte=1024, n_hash_cat=128), epoques=2)
+    assert bilan["blocs"] == 10 and bilan["lignes_par_s"] > 0
+    mesures = evaluer_flux(path, {"flux": model})["flux"]
+    assert 0 < mesures["lignes"] < 300 and mesures["f1_macro"] == 1.0
+    assert model.predict_proba(prepare_X(_catalogue(4))).shape == (4, 2)
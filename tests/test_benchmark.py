@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from src.Machine_learning.module.benchmark import MODELES, comparer, evaluer_pli
+
+
+def _jeu(n=60, seed=0):
+    rng = np.random.default_rng(seed)
+    y = np.array(["Mass Market", "Niche", "Prestige"])[np.arange(n) % 3]
+    X = rng.random((n, 8)) * 0.1
+    X[np.arange(n), np.arange(n) % 3] += 1.0
+    return sparse.csr_matrix(X), y
+
+
+def test_evaluer_pli_tous_les_modeles():
+    X, y = _jeu(150)
+    train, test = np.arange(0, 120), np.arange(120, 150)
+    for nom in MODELES:
+        mesures = evaluer_pli(nom, X, y, train, test, n_unitaires=3)
+        assert mesures["Modèle"] == nom
+        assert mesures["F1 macro"] > 0.9
+        assert mesures["Taille (Ko)"] > 0 and mesures["Prédiction unitaire (ms)"] > 0
+
+
+def _catalogue(n=60):
+    import pandas as pd
+
+    from src.Machine_learning.module.pretraitement import prepare_X
+
+    y = np.array(["Mass Market", "Niche", "Prestige"])[np.arange(n) % 3]
+    df = pd.DataFrame({
+        "Marque": "M", "Fragrance": [f"F{i}" for i in range(n)],
+        "Famille": np.where(y == "Niche", "BOISÉ", "FLORAL"), "Sous_famille": "AMBRÉ", "Parfumeur": None,
+        "Origine": "France", "Genre": "Unisexe", "Année": 2000,
+        "Ingredients_txt": np.where(y == "Prestige", "rose oud vanille", "musc ambre vanille"), "Concepts_txt": "jour nuit",
+    })
+    return prepare_X(df), y
+
+
+def test_comparer_memes_plis_en_parallele(tmp_path):
+    X, y = _catalogue()
+    resume, detail = comparer(X, y, modeles=["LogisticRegression", "LinearSVC"], n_splits=3, n_jobs=2, dossier=tmp_path)
+    assert list(resume.columns[:3]) == ["Modèle", "F1 macro", "F1 écart-type"]
+    assert set(resume["Modèle"]) == {"LogisticRegression", "LinearSVC"}
+    assert resume["F1 macro"].is_monotonic_decreasing
+    assert len(detail) == 6 and sorted(detail["Pli"].unique()) == [0, 1, 2]
+    # Une matrice par pli, préprocesseur entraîné sur le seul pli d'entraînement
+    assert len(list(next(tmp_path.iterdir()).iterdir())) == 3
+
+    with pytest.raises(ValueError, match="inconnus"):
+        comparer(X, y, modeles=["KNN"], dossier=tmp_path)
+
+
+def test_comparer_variables():
+    import pandas as pd
+    from sklearn.linear_model import LogisticRegression
+
+    from src.Machine_learning.module.benchmark import comparer_variables
+    from src.Machine_learning.module.pretraitement import prepare_X
+
+    n = 60
+    df = pd.DataFrame({
+        "Marque": "M", "Fragrance": [f"F{i}" for i in range(n)],
+        "Famille": ["BOISÉ", "FLORAL"] * (n // 2), "Sous_famille": "AMBRÉ", "Parfumeur": None,
+        "Origine": "France", "Genre": "Unisexe", "Année": 2000,
+        "Ingredients_txt": ["rose oud vanille", "musc ambre vanille"] * (n // 2), "Concepts_txt": "jour nuit",
+    })
+    X, y = prepare_X(df), pd.Series(["Niche", "Prestige"] * (n // 2))
+    modes = {"TF-IDF": {}, "Hashing": {"mode": "hashing", "n_hash": 32, "float32": True}}
+    tableau = comparer_variables(X[:40], y[:40], X[40:], y[40:], clf=LogisticRegression(), modes=modes, n_jobs=1)
+    assert list(tableau["Mode"]) == ["TF-IDF", "Hashing"]
+    assert (tableau["F1 macro"] == 1.0).all()
+    assert tableau.loc[1, "Variables"] > 2 * 32
+    assert (tableau["Prédiction unitaire p50 (ms)"] > 0).all()
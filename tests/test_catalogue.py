@@ -0,0 +1,85 @@
+"""
+Tests unitaires du catalogue précalculé (fonction_catalogue).
+"""
+
+import pandas as pd
+from src.app.module.fonction_catalogue import Catalogue, dataset_version, term_matrix, term_stats
+
+
+def test_term_stats_vectorise():
+    """
+    Teste les comptes Parfums / Occurrences (mots vides et termes d'une lettre exclus).
+    """
+    s = pd.Series(["Rose de mai rose", "rose musc x", None, "l'eau et musc"])
+    stats = term_stats(*term_matrix(s)).set_index("Terme")
+
+    assert stats.loc["rose", "Parfums"] == 2
+    assert stats.loc["rose", "Occurrences"] == 3
+    assert stats.loc["musc", "Parfums"] == 2
+    assert "l'eau" in stats.index
+    assert "de" not in stats.index and "x" not in stats.index
+    assert stats.index[0] == "rose"
+
+
+def test_catalogue_et_version(tmp_path):
+    """
+    Teste la construction du catalogue et le changement de version quand le fichier change.
+    """
+    df = pd.DataFrame({"Marque": ["A", "B"], "Ingredients_txt": ["rose", ""], "Concepts_txt": ["", ""]})
+    cat = Catalogue.depuis_df(df, "v1")
+    assert cat.terms("Ingredients_txt") == ["rose"]
+    assert cat.terms("Concepts_txt") == []
+    assert cat.engine.rows({"Marque": "B"}).tolist() == [1]
+
+    path = tmp_path / "data.csv"
+    path.write_text("a\n1\n", encoding="utf-8")
+    v1 = dataset_version(path)
+    path.write_text("a\n1\n2\n", encoding="utf-8")
+    assert dataset_version(path) != v1
+
+
+def test_vue_catalogue_canonique():
+    """
+    Teste que deux saisies équivalentes donnent le même handle, et que la vue filtre les bonnes lignes.
+    """
+    from src.app.module.fonction_stats import distribution_df
+
+    df = pd.DataFrame({
+        "Genre": ["Homme", "Femme", "Homme"],
+        "Origine": ["France", "France", "Italie"],
+        "Année": [2000, 2010, 2020],
+        "Ingredients_txt": ["", "", ""],
+        "Concepts_txt": ["", "", ""],
+    })
+    cat = Catalogue.depuis_df(df, "v1")
+    v1 = cat.vue({"Origine": "France", "Genre": "Tous"}, (2000, 2015))
+    v2 = cat.vue({"Genre": "Tous", "Origine": "France"}, [2000.0, 2015])
+    assert v1 == v2 and hash(v1) == hash(v2)
+    assert v1.rows(cat).tolist() == [0, 1]
+    assert distribution_df(v1.df(cat), "Genre").df["Count"].tolist() == [1, 1]
+
+
+def test_meta_options_et_options_dependantes():
+    """
+    Teste les listes d'options précalculées (mêmes que options / opts_no_all) et
+    les sous-familles restreintes à la famille choisie.
+    """
+    from src.app.module.fonction_filtre import options, opts_no_all
+
+    df = pd.DataFrame({
+        "Famille": ["BOISÉ", "FLORAL", "BOISÉ", "FLORAL", None],
+        "Sous_famille": ["AMBRÉ", "ROSE", "CUIR", "Inconnu", "ROSE"],
+        "Année": [2000, 2010, 2020, 2005, 1999],
+        "Ingredients_txt": ["", "", "", "", ""],
+        "Concepts_txt": ["", "", "", "", ""],
+    })
+    cat = Catalogue.depuis_df(df, "v1")
+    for col in ("Famille", "Sous_famille", "Année", "Absente"):
+        assert cat.meta.options(col) == options(df, col)
+    assert cat.meta.opts_no_all("Sous_famille") == opts_no_all(df, "Sous_famille")
+    assert cat.meta.effectifs["Sous_famille"]["ROSE"] == 2
+    assert cat.meta.annees() == (1999, 2020)
+
+    assert cat.options_dependantes("Sous_famille", {"Famille": "BOISÉ"}) == ["Tous", "AMBRÉ", "CUIR"]
+    assert cat.options_dependantes("Sous_famille", {"Famille": "FLORAL"}, tous=False) == ["Inconnu", "ROSE"]
+    assert cat.options_dependantes("Sous_famille", {"Famille": "Tous"}) == options(df, "Sous_famille")
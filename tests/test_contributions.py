@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.pipeline import Pipeline
+
+from src.Machine_learning.module.contributions import Contributions, contributions_gbc, libelle_variable, top_k_lignes
+from src.Machine_learning.module.pretraitement import build_preprocess
+
+
+def _jeu(n=90, classes=("Mass Market", "Niche", "Prestige")):
+    rng = np.random.default_rng(0)
+    y = np.array(classes)[np.arange(n) % len(classes)]
+    X = pd.DataFrame({
+        "Famille": np.where(y == classes[0], "BOISÉ", "FLORAL"),
+        "Sous_famille": "AMBRÉ",
+        "Parfumeur": rng.choice(["A", "B"], n),
+        "Origine": "France",
+        "Genre": rng.choice(["Femme", "Homme"], n),
+        "Année": rng.integers(1990, 2024, n),
+        "Ingredients_txt": np.where(y == classes[-1], "rose oud", "vanille musc"),
+        "Concepts_txt": "jour",
+    })
+    return X, pd.Series(y)
+
+
+def _modele(X, y):
+    pipe = Pipeline([("prep", build_preprocess()), ("clf", GradientBoostingClassifier(n_estimators=15, random_state=0))])
+    pipe.named_steps["prep"].set_params(ing__min_df=1, con__min_df=1)
+    return pipe.fit(X, y)
+
+
+def test_contributions_redonnent_le_score_brut():
+    X, y = _jeu()
+    model = _modele(X, y)
+    Xt = model.named_steps["prep"].transform(X)
+    C, biais = contributions_gbc(model.named_steps["clf"], Xt)
+    brut = model.named_steps["clf"].decision_function(Xt)
+    somme = np.column_stack([np.asarray(c.sum(axis=1)).ravel() for c in C]) + biais
+    assert np.allclose(somme, brut)
+
+
+def test_top_k_lignes():
+    from scipy import sparse
+
+    C = sparse.csr_matrix(np.array([[0.1, -0.5, 0.0, 0.3], [0.0, 0.0, 0.0, 0.0]]))
+    idx, val = top_k_lignes(C, 2)
+    assert idx.tolist() == [[1, 3], [-1, -1]]
+    assert np.allclose(val, [[-0.5, 0.3], [0.0, 0.0]])
+
+
+@pytest.mark.parametrize("classes", [("Mass Market", "Niche", "Prestige"), ("Mass Market", "Niche")])
+def test_contributions_catalogue(tmp_path, classes):
+    X, y = _jeu(classes=classes)
+    model = _modele(X, y)
+    contrib = Contributions.depuis_modele(model, X, k=5, taille_bloc=40, version="v1")
+    assert contrib.indices.shape == (len(classes), len(X), 5)
+
+    contrib.sauver(tmp_path / "c.npz")
+    relu = Contributions.charger(tmp_path / "c.npz")
+    assert relu.version == "v1"
+    assert np.array_equal(relu.indices, contrib.indices)
+
+    table = relu.pour(0, classes[0])
+    assert list(table.columns) == ["Variable", "Contribution"]
+    assert table["Contribution"].abs().is_monotonic_decreasing
+    # Le parfum 0 est BOISÉ : la famille apparaît comme présente (= BOISÉ) ou absente (≠ FLORAL)
+    assert set(table["Variable"]) & {"Famille = BOISÉ", "Famille ≠ FLORAL"}
+
+
+def test_libelle_variable():
+    assert libelle_variable("cat__Sous_famille_CUIR") == "Sous_famille = CUIR"
+    assert libelle_variable("cat__Famille_BOISÉ", presente=False) == "Famille ≠ BOISÉ"
+    assert libelle_variable("ing__fève tonka") == "Ingrédient : fève tonka"
+    assert libelle_variable("con__jour", presente=False) == "Concept : jour (absent)"
+    assert libelle_variable("num__Année") == "Année"
+
+
+def test_contributions_modele_hashing():
+    X, y = _jeu()
+    model = Pipeline([("prep", build_preprocess(mode="hashing", n_hash=64)), ("clf", GradientBoostingClassifier(n_estimators=10, random_state=0))])
+    model.fit(X, y)
+    contrib = Contributions.depuis_modele(model, X, k=5)
+    assert len(contrib.variables) == model.named_steps["prep"].transform(X[:1]).shape[1]
+    assert contrib.variables[0] == "ing__h0" and "con__h63" in contrib.variables
+    assert any(v.startswith("cat__Famille") for v in contrib.variables)
+    assert libelle_variable("ing__h12") == "Ingrédient haché n°12"
+    assert not contrib.pour(0, "Niche").empty
+
+
+def test_load_contributions_relues_et_modele_verifie(tmp_path):
+    """
+    Teste que l'application relit les contributions régénérées et rejette celles d'un autre modèle.
+    """
+    import os
+
+    from src.app.module.fonction_cache import load_contributions
+
+    path = tmp_path / "c.npz"
+    assert load_contributions(path, "v1", "m1") is None
+
+    X, y = _jeu()
+    model = _modele(X, y)
+    Contributions.depuis_modele(model, X, k=3, version="v1", modele="m1").sauver(path)
+    assert load_contributions(path, "v1", "m1").modele == "m1"
+    assert load_contributions(path, "v1", "m2") is None
+    assert load_contributions(path, "v2", "m1") is None
+
+    Contributions.depuis_modele(model, X, k=3, version="v1", modele="m2").sauver(path)
+    st_ = path.stat()
+    os.utime(path, ns=(st_.st_atime_ns, st_.st_mtime_ns + 1_000_000))
+    assert load_contributions(path, "v1", "m2").modele == "m2"
@@ -0,0 +1,69 @@
+"""
+Tests unitaires des associations de termes (fonction_cooccurrence).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.app.module.fonction_catalogue import Catalogue, term_matrix
+from src.app.module.fonction_cooccurrence import Associations, associations_par_segment
+
+
+def _textes():
+    # rose + oud toujours ensemble (4 parfums) ; vanille partout ; musc avec rose une fois
+    return pd.Series(["rose oud vanille", "rose oud vanille", "rose oud vanille musc", "rose oud vanille",
+                      "musc vanille", "musc vanille", "ambre vanille", "ambre vanille"])
+
+
+def test_lift_pmi_et_confiance():
+    assoc = Associations.depuis_matrice(*term_matrix(_textes()), support_min=1)
+    voisins = assoc.voisins("rose").set_index("Terme")
+    # n = 8, n_rose = n_oud = 4, n_rose_oud = 4 -> lift = 8 * 4 / 16 = 2
+    assert voisins.loc["oud", "Lift"] == pytest.approx(2.0)
+    assert voisins.loc["oud", "PMI"] == pytest.approx(1.0)
+    assert voisins.loc["oud", "Confiance"] == pytest.approx(1.0)
+    assert voisins.loc["vanille", "Lift"] == pytest.approx(1.0)
+    assert voisins.index[0] == "oud"
+    assert "rose" not in voisins.index
+    assert assoc.voisins("inconnu").empty
+
+
+def test_top_k_et_support_min():
+    X, vocab = term_matrix(_textes())
+    assoc = Associations.depuis_matrice(X, vocab, k=1, support_min=1)
+    assert np.diff(assoc.top.indptr).max() == 1
+    # rose-musc n'a qu'un parfum en commun : écarté avec un support de 2
+    assert "musc" not in set(Associations.depuis_matrice(X, vocab, support_min=2).voisins("rose")["Terme"])
+
+
+
+def test_calcul_par_blocs_identique():
+    from scipy import sparse
+
+    X = sparse.random(200, 50, density=0.1, format="csr", random_state=0)
+    vocab = np.array([f"t{i}" for i in range(50)])
+    entier = Associations.depuis_matrice(X, vocab, k=5, support_min=1, taille_bloc=50)
+    for taille_bloc in (1, 7):
+        par_blocs = Associations.depuis_matrice(X, vocab, k=5, support_min=1, taille_bloc=taille_bloc)
+        assert (par_blocs.top != entier.top).nnz == 0
+
+def test_paires_et_segments():
+    X, vocab = term_matrix(_textes())
+    segments = pd.Series(["Niche"] * 4 + ["Mass Market"] * 4)
+    assoc = associations_par_segment(X, vocab, segments, support_min=2)
+    assert list(assoc) == ["Tous", "Mass Market", "Niche"]
+
+    paires = assoc["Tous"].paires()
+    assert set(paires.iloc[0][["Terme A", "Terme B"]]) == {"oud", "rose"}
+    assert not paires.duplicated(["Terme A", "Terme B"]).any()
+    # Dans le segment Niche, rose et oud sont dans tous les parfums : lift 1
+    assert assoc["Niche"].voisins("rose").set_index("Terme").loc["oud", "Lift"] == pytest.approx(1.0)
+    assert assoc["Mass Market"].voisins("rose").empty
+
+
+def test_catalogue_associations():
+    df = pd.DataFrame({"Ingredients_txt": _textes(), "Concepts_txt": "", "Prix_Categorie": ["Niche", "Prestige"] * 4})
+    cat = Catalogue.depuis_df(df, "v1")
+    assert set(cat.associations["Ingredients_txt"]) == {"Tous", "Niche", "Prestige"}
+    assert cat.associations["Concepts_txt"]["Tous"].paires().empty
@@ -0,0 +1,50 @@
+"""
+Tests unitaires des comptes par facette (fonction_facettes).
+
+Chaque compte doit être égal au nombre de lignes obtenues en choisissant
+l'option, tous les autres filtres restant appliqués.
+"""
+
+import numpy as np
+from src.app.module.fonction_catalogue import Catalogue
+from src.app.module.fonction_facettes import facettes
+from src.app.module.fonction_filtre import filter_df
+from src.app.module.fonction_filtre_2 import filter_by_terms
+
+
+def test_facettes_identiques_au_filtrage(catalogue_df):
+    """
+    Teste les lignes retenues et les comptes catégoriels / de termes contre filter_df + filter_by_terms.
+    """
+    df = catalogue_df
+    cat = Catalogue.depuis_df(df, "v1")
+    filters = {"Prix_Categorie": "Niche", "Marque": "Tous", "Genre": "Femme"}
+    termes = {"Ingredients_txt": ["musc"], "Concepts_txt": []}
+
+    def attendu(flt, ing):
+        out = filter_df(df, flt, "", annees=(2000, 2019))
+        return filter_by_terms(out, "Ingredients_txt", ing)
+
+    res = facettes(cat, filters, "", annees=(2000, 2019), termes=termes)
+    assert res.rows.tolist() == attendu(filters, ["musc"]).index.tolist()
+
+    for col in ("Prix_Categorie", "Marque", "Genre"):
+        for val in df[col].unique():
+            assert res.compte(col, val) == len(attendu({**filters, col: val}, ["musc"]))
+        assert res.compte(col, "Tous") == len(attendu({**filters, col: "Tous"}, ["musc"]))
+
+    for term in ("musc", "rose", "ambre", "absent"):
+        assert res.compte_terme("Ingredients_txt", term) == len(attendu(filters, [term]))
+    assert res.libelle("Marque")("Dior") == "Dior (1)"
+
+
+def test_facettes_recherche_et_mode_ou(catalogue_df):
+    """
+    Teste la recherche texte et le mode « au moins un terme ».
+    """
+    df = catalogue_df
+    cat = Catalogue.depuis_df(df, "v1")
+    res = facettes(cat, {"Marque": "Tous"}, "ros", termes={"Concepts_txt": ["nuit", "eté"]}, mode="or")
+    expected = filter_by_terms(filter_df(df, {}, "ros"), "Concepts_txt", ["nuit", "eté"], mode="or")
+    assert res.rows.tolist() == expected.index.tolist()
+    assert np.asarray(res.valeurs["Marque"]).sum() == len(expected)
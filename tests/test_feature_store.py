@@ -0,0 +1,98 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from src.Machine_learning.module import feature_store
+from src.Machine_learning.module.feature_store import cle_features, config_pretraitement, materialiser
+from src.Machine_learning.module.pretraitement import prepare_X
+
+
+def _donnees(n=40, annee=2000):
+    df = pd.DataFrame({
+        "Marque": "M",
+        "Fragrance": [f"F{i}" for i in range(n)],
+        "Prix_Categorie": ["Niche", "Prestige"] * (n // 2),
+        "Famille": ["BOISÉ", "FLORAL"] * (n // 2),
+        "Sous_famille": "AMBRÉ",
+        "Parfumeur": None,
+        "Origine": "France",
+        "Genre": "Unisexe",
+        "Année": annee,
+        "Ingredients_txt": ["rose oud vanille", "musc ambre vanille"] * (n // 2),
+        "Concepts_txt": "jour nuit",
+    })
+    return prepare_X(df), df["Prix_Categorie"]
+
+
+def test_materialiser_puis_relire(tmp_path):
+    X, y = _donnees()
+    f1 = materialiser(X, y, dossier=tmp_path)
+    # Tableaux relus en mémoire mappée (lecture seule)
+    assert not f1.X.data.flags.writeable
+    assert list(f1.y) == list(y)
+    T = f1.prep.transform(X)
+    assert np.allclose(f1.X.toarray(), T.toarray() if sparse.issparse(T) else np.asarray(T))
+
+    f2 = materialiser(X, y, dossier=tmp_path)
+    assert f2.dossier == f1.dossier and f2.cle == f1.cle
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_cle_depend_des_donnees_et_de_la_config(monkeypatch):
+    X, y = _donnees()
+    config = config_pretraitement()
+    cle = cle_features(X, y, config)
+    assert cle_features(X.copy(), y.copy(), config) == cle
+    assert cle_features(_donnees(annee=2001)[0], y, config) != cle
+    assert cle_features(X, y.iloc[::-1].reset_index(drop=True), config) != cle
+
+    monkeypatch.setattr(feature_store, "TFIDF_PARAMS", {"min_df": 1, "ngram_range": (1, 1)})
+    assert cle_features(X, y, config_pretraitement()) != cle
+
+
+def test_cache_borne(tmp_path):
+    for annee in range(2000, 2005):
+        materialiser(*_donnees(annee=annee), dossier=tmp_path, garder=2)
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_modes_variables(tmp_path):
+    X, y = _donnees()
+    tfidf = materialiser(X, y, dossier=tmp_path)
+    hashing = materialiser(X, y, dossier=tmp_path, mode="hashing", n_hash=64, float32=True)
+    chi2 = materialiser(X, y, dossier=tmp_path, mode="chi2", k_chi2=2)
+    assert len({tfidf.cle, hashing.cle, chi2.cle}) == 3
+
+    # Hashing : dimension fixe par colonne texte, sans vocabulaire ; float32 conservé
+    n_autres = tfidf.X.shape[1] - sum(len(tfidf.prep.named_transformers_[n].vocabulary_) for n in ("ing", "con"))
+    assert hashing.X.shape[1] == 2 * 64 + n_autres
+    assert hashing.X.dtype == np.float32
+    # Chi² : au plus k termes par colonne texte
+    assert chi2.X.shape[1] <= 2 * 2 + n_autres
+    assert tfidf.X.dtype == np.float64
+
+    # Chi² avec k au-delà du vocabulaire : tous les termes sont gardés, sans avertissement
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        tout = materialiser(X, y, dossier=tmp_path, mode="chi2", k_chi2=10_000)
+    assert tout.X.shape == tfidf.X.shape
+
+
+def test_materialiser_plis_sans_fuite(tmp_path):
+    X, y = _donnees()
+    X.loc[X.index[-5:], "Ingredients_txt"] = "patchouli"
+    plis = [(np.arange(0, 30), np.arange(30, 40)), (np.arange(10, 40), np.arange(0, 10))]
+    f1, f2 = feature_store.materialiser_plis(X, y, plis, dossier=tmp_path)
+    # Un terme présent dans le seul pli de validation n'entre pas dans le vocabulaire du pli
+    assert "patchouli" not in f1.prep.named_transformers_["ing"].vocabulary_
+    assert "patchouli" in f2.prep.named_transformers_["ing"].vocabulary_
+    assert f1.X.shape[0] == f2.X.shape[0] == len(X)
+    T = f1.prep.transform(X)
+    assert np.allclose(f1.X.toarray(), T.toarray() if sparse.issparse(T) else np.asarray(T))
+    assert f1.cle != f2.cle and not f1.X.data.flags.writeable
+
+    relus = feature_store.materialiser_plis(X, y, plis, dossier=tmp_path)
+    assert [f.dossier for f in relus] == [f1.dossier, f2.dossier]
+    assert len(list(tmp_path.iterdir())) == 1
@@ -0,0 +1,72 @@
+"""
+Tests unitaires des index en mémoire (fonction_index) utilisés par l'explorateur.
+
+On vérifie que les filtres par bitmaps donnent exactement les mêmes lignes
+que les filtres historiques par balayage texte.
+"""
+
+import pandas as pd
+import pytest
+from src.app.module.fonction_filtre_2 import contains_term, filter_by_terms
+from src.app.module.fonction_index import TermIndex
+
+
+@pytest.fixture
+def df(catalogue_df) -> pd.DataFrame:
+    """
+    Catalogue partagé réduit à 5 parfums, dont un sans ingrédients.
+    """
+    df = catalogue_df.head(5).copy()
+    df.loc[4, "Ingredients_txt"] = None
+    return df
+
+
+def test_term_index_and_identique_au_balayage(df):
+    """
+    Teste que l'intersection de bitmaps correspond à une succession de contains_term.
+    """
+    index = TermIndex(df["Ingredients_txt"])
+    for terms in (["musc"], ["musc", "ambre"], ["rose", "ambre"], ["inconnu"]):
+        expected = df
+        for t in terms:
+            expected = expected[contains_term(expected["Ingredients_txt"], t)]
+        got = filter_by_terms(df, "Ingredients_txt", terms, index=index)
+        assert got.index.tolist() == expected.index.tolist()
+
+
+def test_term_index_or_et_sous_ensemble(df):
+    """
+    Teste le mode OU et le filtrage d'un DataFrame déjà filtré (labels d'index conservés).
+    """
+    index = TermIndex(df["Ingredients_txt"])
+    sub = df[df["Marque"] != "Dior"]
+
+    got = filter_by_terms(sub, "Ingredients_txt", ["vanille", "musc"], index=index, mode="or")
+    assert got["Fragrance"].tolist() == ["B", "D"]
+
+    no_index = filter_by_terms(sub, "Ingredients_txt", ["vanille", "musc"], mode="or")
+    assert no_index.index.tolist() == got.index.tolist()
+    assert index.doc_freq[index.vocab["ambre"]] == 2
+
+
+def test_filter_engine_identique_a_filter_df(df):
+    """
+    Teste que le moteur de filtres (bitmaps + plage d'années) retourne les mêmes lignes que filter_df.
+    """
+    from src.app.module.fonction_filtre import filter_df, filter_rows
+    from src.app.module.fonction_index import FilterEngine
+
+    engine = FilterEngine(df)
+    cases = [
+        ({"Marque": "Tous"}, None, ""),
+        ({"Marque": "Chanel"}, None, ""),
+        ({"Marque": "Chanel", "Prix_Categorie": "Niche"}, None, ""),
+        ({"Prix_Categorie": "Prestige"}, (2012, 2020), ""),
+        ({"Marque": "Absente"}, None, ""),
+        ({"Marque": "Tous"}, None, "ROSE"),
+    ]
+    for filters, annees, q in cases:
+        expected = filter_df(df, filters, q, annees=annees)
+        rows = filter_rows(df, filters, q, engine=engine, annees=annees)
+        assert df.index[rows].tolist() == expected.index.tolist()
+        assert filter_df(df, filters, q, engine=engine, annees=annees).index.tolist() == expected.index.tolist()
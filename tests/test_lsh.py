@@ -0,0 +1,79 @@
+"""
+Tests unitaires de l'index LSH des parfums similaires (lsh).
+"""
+
+import numpy as np
+from scipy import sparse
+from sklearn.preprocessing import normalize
+from src.Machine_learning.module.lsh import IndexLSH, rappel
+
+
+def make_X(n: int = 200, d: int = 50, seed: int = 0) -> sparse.csr_matrix:
+    """
+    Vecteurs creux normalisés aléatoires, les 10 premiers dupliqués en fin de matrice.
+    """
+    X = sparse.random(n, d, density=0.1, random_state=seed, format="csr", dtype=np.float32)
+    X = sparse.vstack([X, X[:10]], format="csr")
+    return normalize(X).astype(np.float32)
+
+
+def test_lsh_sauver_charger_mmap(tmp_path):
+    """
+    Teste l'aller-retour disque (mmap) : mêmes candidats et mêmes voisins.
+    """
+    X = make_X()
+    index = IndexLSH.construire(X, n_tables=4, n_bits=8, version="v1")
+    index.sauver(tmp_path / "lsh")
+    charge = IndexLSH.charger(tmp_path / "lsh", mmap=True)
+
+    assert isinstance(charge.codes, np.memmap)
+    assert charge.meta["version"] == "v1"
+    for p in (0, 5, 123):
+        assert np.array_equal(charge.candidats(X[p]), index.candidats(X[p]))
+        assert np.array_equal(charge.voisins(p, k=3)[0], index.voisins(p, k=3)[0])
+
+
+def test_lsh_doublon_trouve_et_scores_exacts():
+    """
+    Teste qu'un doublon exact est toujours candidat, et que les scores sont des cosinus exacts.
+    """
+    X = make_X()
+    index = IndexLSH.construire(X, n_tables=4, n_bits=8)
+    pos, sim = index.voisins(3, k=1)
+    assert pos.tolist() == [203] and np.isclose(sim[0], 1.0, atol=1e-5)
+
+    pos, sim = index.voisins(50, k=5, sondes=1)
+    dense = (X @ X[50].T).toarray().ravel()
+    assert np.allclose(sim, dense[pos], atol=1e-5)
+    assert 50 not in pos
+
+
+def test_rappel_sur_les_scores():
+    """
+    Teste le rappel@k calculé sur les scores (ex aequo compris).
+    """
+    exact = np.array([0.9, 0.8, 0.8, 0.1])
+    assert rappel(exact, np.array([0.9, 0.8]), 2) == 1.0
+    assert rappel(exact, np.array([0.9, 0.1]), 2) == 0.5
+
+
+def test_load_lsh_relu_apres_reconstruction(tmp_path):
+    """
+    Teste que l'application ne garde pas en cache un index absent ou d'une autre version.
+    """
+    import os
+
+    from src.app.module.fonction_cache import load_lsh
+
+    dossier = tmp_path / "lsh"
+    assert load_lsh(dossier, "v1") is None
+
+    X = make_X()
+    IndexLSH.construire(X, n_tables=2, n_bits=8, version="v1").sauver(dossier)
+    assert load_lsh(dossier, "v1").meta["version"] == "v1"
+    assert load_lsh(dossier, "v2") is None
+
+    IndexLSH.construire(X, n_tables=2, n_bits=8, version="v2").sauver(dossier)
+    st_ = (dossier / "meta.json").stat()
+    os.utime(dossier / "meta.json", ns=(st_.st_atime_ns, st_.st_mtime_ns + 1_000_000))
+    assert load_lsh(dossier, "v2").meta["version"] == "v2"
@@ -0,0 +1,79 @@
+import warnings
+
+import numpy as np
+import pytest
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import MaxAbsScaler
+from threadpoolctl import threadpool_info
+
+from src.Machine_learning.module import ordonnancement
+from src.Machine_learning.module.ordonnancement import MesureCPU, Planification, contexte, garde_imbrication
+
+
+def test_planification(monkeypatch):
+    monkeypatch.setattr(ordonnancement, "cpu_count", lambda: 32)
+    assert Planification().workers == 32 and Planification().threads_par_worker == 1
+    assert Planification(n_jobs=8).threads_par_worker == 4
+    assert Planification(n_jobs=-4).workers == 29
+    assert Planification(n_jobs=4, threads=2).resume()["threads"] == 2
+    with pytest.raises(ValueError, match="Backend"):
+        Planification(backend="dask")
+
+
+def test_garde_imbrication():
+    model = make_pipeline(MaxAbsScaler(), RandomForestClassifier(n_jobs=-1))
+    garde_imbrication(model, Planification(n_jobs=1))
+    assert model[-1].n_jobs == -1
+    garde_imbrication(model, Planification(n_jobs=2))
+    assert model[-1].n_jobs == 1
+
+
+def _tableau_partage(x):
+    # Tableau reçu par le worker : mappé en lecture seule, pas copié
+    return not x.flags.writeable
+
+
+def test_contexte_memoire_mappee_et_threads():
+    x = np.zeros(1_000_000)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        with contexte(Planification(n_jobs=2, max_nbytes="1M")):
+            assert all(Parallel()(delayed(_tableau_partage)(x) for _ in range(2)))
+        with contexte(Planification(n_jobs=2, backend="threading", threads=1)):
+            assert all(pool["num_threads"] == 1 for pool in threadpool_info())
+
+
+
+def _fichier_mappe(X):
+    return getattr(X.data, "filename", None)
+
+
+def test_matrices_des_plis_transmises_par_reference(tmp_path):
+    import pandas as pd
+
+    from src.Machine_learning.module.feature_store import materialiser_plis
+    from src.Machine_learning.module.pretraitement import prepare_X
+
+    n = 40
+    df = pd.DataFrame({
+        "Marque": "M", "Fragrance": [f"F{i}" for i in range(n)], "Famille": ["BOISÉ", "FLORAL"] * (n // 2),
+        "Sous_famille": "AMBRÉ", "Parfumeur": None, "Origine": "France", "Genre": "Unisexe", "Année": 2000,
+        "Ingredients_txt": ["rose oud vanille", "musc ambre vanille"] * (n // 2), "Concepts_txt": "jour nuit",
+    })
+    y = pd.Series(["Niche", "Prestige"] * (n // 2))
+    (f,) = materialiser_plis(prepare_X(df), y, [(np.arange(30), np.arange(30, 40))], dossier=tmp_path)
+    # Même sans seuil de mise en mémoire mappée, le worker relit le fichier du cache au lieu d'une copie
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        with contexte(Planification(n_jobs=2, max_nbytes=None)):
+            fichiers = Parallel()(delayed(_fichier_mappe)(f.X) for _ in range(2))
+    assert [str(x) for x in fichiers] == [str(f.dossier / "X_data.npy")] * 2
+
+def test_mesure_cpu():
+    with MesureCPU(intervalle=0.05) as cpu:
+        sum(i * i for i in range(300_000))
+    assert cpu.bilan["duree_s"] > 0 and cpu.bilan["cpu_processus_s"] > 0
+    assert 0 <= cpu.bilan["utilisation_moyenne"] <= 1
+    assert cpu.bilan["coeurs_equivalents"] <= cpu.bilan["coeurs"]
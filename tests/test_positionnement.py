@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+from src.Machine_learning.module.positionnement import (
+    POSITIONNEMENT_COLS,
+    predict_proba_par_blocs,
+    probas_hors_echantillon,
+    table_positionnement,
+)
+
+
+def _jeu(n=60):
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=n)
+    y = np.where(x < -0.5, "Mass Market", np.where(x < 0.5, "Prestige", "Niche"))
+    return pd.DataFrame({"x": x}), pd.Series(y)
+
+
+def test_probas_hors_echantillon_forme_et_blocs():
+    X, y = _jeu()
+    proba, classes = probas_hors_echantillon(LogisticRegression(), X, y, n_splits=3, taille_bloc=7)
+    assert proba.shape == (len(X), 3)
+    assert list(classes) == ["Mass Market", "Niche", "Prestige"]
+    assert np.allclose(proba.sum(axis=1), 1.0)
+
+    model = LogisticRegression().fit(X, y)
+    assert np.allclose(predict_proba_par_blocs(model, X, taille_bloc=7), model.predict_proba(X))
+
+
+def test_table_positionnement_signes_et_tri():
+    classes = np.array(["Mass Market", "Niche", "Prestige"])
+    df = pd.DataFrame({
+        "Fragrance": ["a", "b", "c"],
+        "Marque": ["m", "m", "m"],
+        "Prix_Categorie": ["Niche", "Mass Market", "Prestige"],
+    })
+    proba = np.array([
+        [0.9, 0.05, 0.05],  # Niche mais prédit Mass Market : surpositionné
+        [0.0, 0.8, 0.2],    # Mass Market mais prédit Niche : sous-positionné
+        [0.1, 0.1, 0.8],    # cohérent
+    ])
+    table = table_positionnement(df, proba, classes)
+
+    assert list(table.columns) == POSITIONNEMENT_COLS
+    assert list(table["Fragrance"]) == ["a", "b", "c"]
+    par_nom = table.set_index("Fragrance")
+    assert par_nom.loc["a", "Positionnement"] == "Surpositionné" and par_nom.loc["a", "Ecart"] > 0
+    assert par_nom.loc["b", "Positionnement"] == "Sous-positionné" and par_nom.loc["b", "Ecart"] < 0
+    assert par_nom.loc["c", "Positionnement"] == "Cohérent"
+    assert par_nom.loc["c", "Marge"] == 0.0
+    assert np.isclose(par_nom.loc["a", "Marge"], 0.85)
+
+
+def test_probas_hors_echantillon_pipeline_complet():
+    from sklearn.pipeline import Pipeline
+
+    from src.Machine_learning.module.pretraitement import build_preprocess, prepare_X
+
+    n = 60
+    y = pd.Series(np.array(["Mass Market", "Niche", "Prestige"])[np.arange(n) % 3])
+    df = pd.DataFrame({
+        "Famille": "BOISÉ", "Sous_famille": "AMBRÉ", "Parfumeur": "P", "Origine": "France", "Genre": "Unisexe",
+        "Année": 2000, "Ingredients_txt": y.map({"Mass Market": "fraise", "Niche": "oud", "Prestige": "rose"}),
+        "Concepts_txt": "jour",
+    })
+    # Modèle sauvegardé en mode hashing : chaque pli réentraîne le même pipeline (préprocesseur compris)
+    model = Pipeline([("prep", build_preprocess(mode="hashing", n_hash=32)), ("clf", LogisticRegression())])
+    model.fit(prepare_X(df), y)
+    proba, classes = probas_hors_echantillon(model, prepare_X(df), y, n_splits=3)
+    assert proba.shape == (n, 3)
+    assert (classes[proba.argmax(axis=1)] == y.to_numpy()).mean() > 0.9
@@ -0,0 +1,103 @@
+"""
+Tests unitaires du cache de prédictions (onglet Prédire).
+
+On utilise un faux modèle qui compte ses appels, afin de vérifier
+la clé canonique, l'éviction LRU et les compteurs hits/misses.
+"""
+
+import numpy as np
+from src.app.module.fonction_prediction import PredictionCache, X_depuis_cle, cle_prediction
+
+
+class FakeModel:
+    """Modèle minimal : probabilité fonction du nombre d'ingrédients."""
+
+    classes_ = np.array(["Mass Market", "Niche", "Prestige"])
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict_proba(self, X):
+        self.calls += 1
+        n = len(X.iloc[0]["Ingredients_txt"].split())
+        p = np.array([0.2, 0.2, 0.2])
+        p[n % 3] = 0.6
+        return np.array([p])
+
+
+def test_cle_prediction_ignore_ordre_et_casse():
+    """
+    Teste que la clé ne dépend ni de l'ordre des termes, ni de la casse, ni des doublons.
+    """
+    k1 = cle_prediction("BOISÉ", "AMBRÉ", "X", "France", "Homme", "2020", ["Musc", "ambre"], ["jour"])
+    k2 = cle_prediction("BOISÉ", "AMBRÉ", "X", "France", "Homme", 2020, ["ambre", "musc", "musc"], ["Jour"])
+    assert k1 == k2
+    X = X_depuis_cle(k1)
+    assert X.loc[0, "Ingredients_txt"] == "ambre musc"
+    assert X.loc[0, "Année"] == 2020
+
+
+def test_cache_hits_misses_et_label_depuis_proba():
+    """
+    Teste qu'une même combinaison ne sollicite le modèle qu'une fois et que le label vient de predict_proba.
+    """
+    model = FakeModel()
+    cache = PredictionCache(model, maxsize=8)
+    key = cle_prediction("F", "SF", "P", "O", "G", 2000, ["a"], [])
+
+    first = cache.predict(key)
+    second = cache.predict(key)
+
+    assert first is second
+    assert first.label == "Niche"
+    assert first.classes[0] == "Niche"
+    assert model.calls == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_eviction_lru():
+    """
+    Teste que le cache reste borné et évince l'entrée la moins récemment utilisée.
+    """
+    model = FakeModel()
+    cache = PredictionCache(model, maxsize=2)
+    k_a = cle_prediction("A", "", "", "", "", 0, [], [])
+    k_b = cle_prediction("B", "", "", "", "", 0, [], [])
+    k_c = cle_prediction("C", "", "", "", "", 0, [], [])
+
+    cache.predict(k_a)
+    cache.predict(k_b)
+    cache.predict(k_a)  # A devient le plus récent
+    cache.predict(k_c)  # évince B
+
+    assert len(cache) == 2
+    cache.predict(k_a)
+    assert model.calls == 3
+    cache.predict(k_b)
+    assert model.calls == 4
+
+
+def test_load_prediction_cache_suit_la_version_du_modele(tmp_path):
+    """
+    Teste qu'un modèle réentraîné (même chemin, nouvelle version) est relu avec un cache vide.
+    """
+    import os
+
+    import joblib
+
+    from src.app.module.fonction_cache import load_prediction_cache
+    from src.app.module.fonction_catalogue import dataset_version
+
+    path = tmp_path / "modele.pkl"
+    joblib.dump(FakeModel(), path)
+    cache = load_prediction_cache(path, dataset_version(path))
+    cache.predict(cle_prediction("A", "", "", "", "", 0, ["a"], []))
+    assert load_prediction_cache(path, dataset_version(path)) is cache
+
+    joblib.dump(FakeModel(), path)
+    st_ = path.stat()
+    os.utime(path, ns=(st_.st_atime_ns, st_.st_mtime_ns + 1_000_000))
+    nouveau = load_prediction_cache(path, dataset_version(path))
+    assert nouveau is not cache and len(nouveau) == 0
+    assert nouveau.model is not cache.model
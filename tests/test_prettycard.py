@@ -0,0 +1,103 @@
+"""
+Tests unitaires des cartes parfums et de la pagination (fonction_prettycard).
+"""
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from src.app.module.fonction_prettycard import EXTRAIT_MAX, card_html, cards_html
+
+
+def _page_app():
+    import streamlit as st
+
+    from src.app.module.fonction_prettycard import pagination
+
+    st.session_state["bornes"] = pagination(
+        st.session_state.get("n_rows", 45), st.session_state.get("taille", 10), "page", st.session_state.get("requete")
+    )
+
+
+def _app() -> AppTest:
+    return AppTest.from_function(_page_app).run()
+
+
+def test_card_html_echappe_les_valeurs():
+    """
+    Teste l'échappement HTML, les valeurs manquantes et la coupure des extraits.
+    """
+    html = card_html({
+        "Fragrance": "<script>alert(1)</script>",
+        "Marque": "Dolce & Gabbana",
+        "Année": None,
+        "Prix_Categorie": "Niche",
+        "Ingredients_txt": "rose " * 40,
+        "Concepts_txt": "<b>nuit</b>",
+    })
+    assert "<script>" not in html and "&lt;script&gt;alert(1)&lt;/script&gt;" in html
+    assert "Dolce &amp; Gabbana" in html and "(nan)" not in html and "()" in html
+    assert "&lt;b&gt;nuit&lt;/b&gt;" in html
+    assert "<span class='prix-niche'>Niche</span>" in html
+    assert ("rose " * 40)[:EXTRAIT_MAX] + "…" in html
+    assert "\n" not in html
+
+
+def test_cards_html_une_carte_par_ligne():
+    """
+    Teste l'assemblage d'une page (une carte par ligne, page vide -> chaîne vide).
+    """
+    df = pd.DataFrame({"Fragrance": ["A", "B", "C"], "Marque": ["Dior", "Chanel", "Dior"], "Prix_Categorie": ["Niche", "Prestige", None]})
+    html = cards_html(df)
+    assert html.count("class='carte-parfum'") == 3
+    assert html.count("prix-niche") == 1 and html.count("prix-autre") == 2
+    assert cards_html(df.iloc[:0]) == ""
+
+
+def test_pagination_jusqu_a_la_derniere_page():
+    """
+    Teste la navigation jusqu'à la dernière page (incomplète) et les boutons désactivés aux bornes.
+    """
+    at = _app()
+    assert at.session_state["bornes"] == (0, 10)
+    assert at.button(key="page_prev").disabled and not at.button(key="page_next").disabled
+
+    for _ in range(4):
+        at.button(key="page_next").click().run()
+    assert at.session_state["bornes"] == (40, 45)
+    assert at.button(key="page_next").disabled
+    assert "Page 5 / 5" in at.caption[0].value
+
+    at.button(key="page_prev").click().run()
+    assert at.session_state["bornes"] == (30, 40)
+
+
+def test_pagination_revient_a_la_premiere_page():
+    """
+    Teste le retour à la première page quand la taille de page ou la requête change.
+    """
+    at = _app()
+    at.button(key="page_next").click().run()
+    at.button(key="page_next").click().run()
+    assert at.session_state["bornes"] == (20, 30)
+
+    at.session_state["taille"] = 20
+    at.run()
+    assert at.session_state["bornes"] == (0, 20)
+    assert "Page 1 / 3" in at.caption[0].value
+
+    at.button(key="page_next").click().run()
+    at.session_state["requete"] = ("Marque", "Dior")
+    at.run()
+    assert at.session_state["bornes"] == (0, 20)
+
+
+def test_pagination_sans_resultat():
+    """
+    Teste un résultat vide : une seule page, bornes vides et navigation désactivée.
+    """
+    at = AppTest.from_function(_page_app)
+    at.session_state["n_rows"] = 0
+    at.run()
+    assert at.session_state["bornes"] == (0, 0)
+    assert at.button(key="page_prev").disabled and at.button(key="page_next").disabled
+    assert "Page 1 / 1" in at.caption[0].value and "parfums 0 à 0 sur 0" in at.caption[0].value
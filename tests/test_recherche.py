@@ -0,0 +1,44 @@
+"""
+Tests unitaires de l'index de recherche plein texte (fonction_recherche).
+"""
+
+import pandas as pd
+import pytest
+from src.app.module.fonction_filtre import _text_mask
+from src.app.module.fonction_recherche import SearchIndex
+
+
+@pytest.fixture
+def df(catalogue_df) -> pd.DataFrame:
+    """
+    4 parfums du catalogue partagé, avec des noms et des textes propres à la recherche.
+    """
+    return catalogue_df.head(4).assign(
+        Fragrance=["Rose Noire", "Ambre Nuit", "Eau Fraîche", "Jardin"],
+        Marque=["Dior", "Chanel", "Dior", "Roseline"],
+        Parfumeur=["A. Morillas", "O. Polge", "F. Demachy", "Inconnu"],
+        Ingredients_txt=["rose musc", "ambre vanille", "citron", "rose jasmin"],
+        Concepts_txt=["nuit", "soir", "jour", "jardin"],
+    )
+
+
+def test_mask_identique_au_balayage(df):
+    """
+    Teste que l'index (trigrammes + vérification) trouve les mêmes lignes que str.contains.
+    """
+    index = SearchIndex(df)
+    for q in ["rose", "DIOR", "ni", "ambre vanille", "zzz", ""]:
+        expected = _text_mask(df, q).to_numpy() if q.strip() else [True] * len(df)
+        assert index.mask(q).tolist() == list(expected)
+
+
+def test_search_classement_et_autocompletion(df):
+    """
+    Teste le classement (nom du parfum avant ingrédients) et l'autocomplétion par préfixe.
+    """
+    index = SearchIndex(df)
+    assert index.search("rose").tolist() == [0, 3]
+    assert index.search("rose", rows=[3]).tolist() == [3]
+    assert index.suggest("ros")[0] == "rose"
+    assert "roseline" in index.suggest("ros")
+    assert index.suggest("xyz") == []
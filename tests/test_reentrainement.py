@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.pipeline import Pipeline
+
+from src.Machine_learning.module.pretraitement import build_preprocess
+from src.Machine_learning.module.reentrainement import (
+    charger_meta,
+    construire_meta,
+    ecarts_derive,
+    mesurer_derive,
+    rafraichir,
+    sauver_meta,
+    scores,
+    split_stable,
+)
+
+
+def _catalogue(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    y = np.array(["Mass Market", "Niche", "Prestige"])[rng.integers(0, 3, n)]
+    return pd.DataFrame({
+        "Marque": [f"M{i % 7}" for i in range(n)],
+        "Fragrance": [f"F{seed}-{i}" for i in range(n)],
+        "Famille": np.where(y == "Niche", "BOISÉ", "FLORAL"),
+        "Sous_famille": "AMBRÉ",
+        "Parfumeur": "A",
+        "Origine": "France",
+        "Genre": rng.choice(["Femme", "Homme"], n),
+        "Année": rng.integers(1990, 2024, n),
+        "Ingredients_txt": np.where(y == "Prestige", "rose oud", "vanille musc"),
+        "Concepts_txt": "jour",
+    }), pd.Series(y)
+
+
+def _modele(X, y):
+    pipe = Pipeline([("prep", build_preprocess()), ("clf", GradientBoostingClassifier(n_estimators=10, random_state=0))])
+    pipe.named_steps["prep"].set_params(ing__min_df=1, con__min_df=1)
+    return pipe.fit(X, y)
+
+
+def test_split_stable_quand_le_catalogue_grossit():
+    df, _ = _catalogue(200)
+    plus, _ = _catalogue(50, seed=1)
+    test = split_stable(df)
+    assert 0.1 < test.mean() < 0.3
+    assert np.array_equal(split_stable(pd.concat([df, plus], ignore_index=True))[:len(df)], test)
+
+
+def test_rafraichir_garde_le_preprocesseur():
+    df, y = _catalogue()
+    model = _modele(df, y)
+    vocab = dict(model.named_steps["prep"].named_transformers_["ing"].vocabulary_)
+
+    warm = rafraichir(model, df, y, mode="warm", n_ajout=5)
+    assert warm.named_steps["clf"].n_estimators == 15
+    assert model.named_steps["clf"].n_estimators == 10
+    assert warm.named_steps["prep"].named_transformers_["ing"].vocabulary_ == vocab
+
+    fixe = rafraichir(warm, df, y, mode="fixe", parametres={"clf__n_estimators": 8})
+    assert fixe.named_steps["clf"].n_estimators == 8
+    assert scores(fixe, df, y)["f1_macro"] > 0.9
+
+    with pytest.raises(ValueError):
+        rafraichir(model, df, y, mode="autre")
+
+
+def test_derive_et_meta(tmp_path):
+    df, y = _catalogue()
+    model = _modele(df, y)
+    prep = model.named_steps["prep"]
+    reference = mesurer_derive(prep, df, y)
+    assert reference["hors_vocabulaire"] == 0.0 and reference["categories_inconnues"] == 0.0
+
+    nouveaux = df.assign(Famille="CUIR", Ingredients_txt="safran cuir")
+    ecarts = ecarts_derive(reference, mesurer_derive(prep, nouveaux, y))
+    assert ecarts["categories_inconnues"] == 1.0
+    assert ecarts["hors_vocabulaire"] > 0.5
+    assert ecarts["ecart_classes"] == 0.0
+
+    meta = construire_meta(model, df, y, scores(model, df, y), {"clf__n_estimators": np.int64(10)}, "v1", "recherche")
+    sauver_meta(meta, tmp_path / "meta.json")
+    relu = charger_meta(tmp_path / "meta.json")
+    assert relu["parametres"] == {"clf__n_estimators": 10}
+    assert relu["derive"]["classes"] == reference["classes"]
+    assert charger_meta(tmp_path / "absent.json") is None
+
+
+def test_meta_rafraichissement_garde_la_reference():
+    df, y = _catalogue()
+    model = _modele(df, y)
+    recherche = construire_meta(model, df, y, {"f1_macro": 0.9}, {}, "v1", "recherche")
+    assert recherche["reference"] == recherche["date"] and recherche["test"] == recherche["score"]
+
+    nouveaux = df.assign(Famille="CUIR")
+    warm = rafraichir(model, nouveaux, y, mode="warm", n_ajout=5)
+    meta = construire_meta(warm, nouveaux, y, {"f1_macro": 0.85}, {}, "v2", "warm", reference=recherche)
+    meta = construire_meta(warm, nouveaux, y, {"f1_macro": 0.8}, {}, "v3", "fixe", reference=meta)
+    assert meta["score"] == {"f1_macro": 0.8}
+    assert meta["test"] == {"f1_macro": 0.9} and meta["derive"] == recherche["derive"]
+    assert meta["reference"] == recherche["date"]
+    assert ecarts_derive(meta["derive"], mesurer_derive(warm.named_steps["prep"], nouveaux, y))["categories_inconnues"] == 1.0
+
+
+def test_recherche_complete_preprocesseur_par_pli(tmp_path):
+    from src.Machine_learning.Model_GB import recherche_complete
+    from src.Machine_learning.module.ordonnancement import Planification
+
+    X, y = _catalogue()
+    grille = {"clf__n_estimators": [5, 10], "clf__max_depth": [2]}
+    model, params = recherche_complete(X, y, Planification(n_jobs=1), grille=grille, dossier=tmp_path, mode="chi2", k_chi2=2)
+    # Préprocesseur (sélection chi²) entraîné sur chaque pli : une matrice par pli dans le cache
+    assert list(model.named_steps) == ["prep", "clf"]
+    assert len(list(next(tmp_path.iterdir()).iterdir())) == 5
+    assert set(params) == set(grille)
+    assert model.named_steps["clf"].n_estimators == params["clf__n_estimators"]
+    assert set(model.predict(X)) <= set(y)
@@ -0,0 +1,69 @@
+"""
+Tests unitaires de la couche de requête de l'explorateur (fonction_requete).
+
+On vérifie que le tri par ordres globaux précalculés et l'extraction de page
+donnent les mêmes lignes que `sort_values` + `head` sur le DataFrame filtré.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.app.module.fonction_filtre_2 import filter_by_terms, filter_rows_by_terms
+from src.app.module.fonction_index import TermIndex
+from src.app.module.fonction_prettycard import card_html
+from src.app.module.fonction_requete import CARD_COLS, TABLE_COLS, page, sort_order, sort_rows
+
+
+@pytest.fixture
+def df(catalogue_df) -> pd.DataFrame:
+    """
+    Catalogue partagé avec ex aequo et valeurs manquantes (marque, année, ingrédients).
+    """
+    df = catalogue_df.copy()
+    df.loc[2, "Marque"] = None
+    df["Année"] = [2001, 2010, 2015, np.nan, 2020, 2010]
+    df.loc[4, "Ingredients_txt"] = None
+    return df
+
+
+def test_sort_rows_identique_a_sort_values(df):
+    """
+    Teste le tri d'un sous-ensemble de lignes (stable, valeurs manquantes en dernier).
+    """
+    rows = np.array([0, 1, 2, 3, 5])
+    for col, asc in (("Année", False), ("Marque", True)):
+        got = sort_rows(rows, sort_order(df[col], ascending=asc))
+        expected = df.iloc[rows].sort_values(col, ascending=asc, kind="stable")
+        assert df.index[got].tolist() == expected.index.tolist()
+
+
+def test_page_projection_colonnes(df):
+    """
+    Teste l'extraction d'une page avec projection sur quelques colonnes.
+    """
+    got = page(df, np.array([4, 2, 0]), 1, 3, ["Fragrance", "Absente", "Année"])
+    assert got.columns.tolist() == ["Fragrance", "Année"]
+    assert got["Fragrance"].tolist() == ["C", "A"]
+
+
+def test_projections_tableau_et_cartes(df):
+    """
+    Teste que le tableau ne lit pas les textes longs et que les cartes ont toutes leurs colonnes.
+    """
+    assert not {"Ingredients_txt", "Concepts_txt"} & set(TABLE_COLS)
+    rows = np.arange(len(df))
+    cartes = page(df, rows, 0, len(df), CARD_COLS)
+    assert [card_html(r) for r in cartes.to_dict("records")] == [card_html(r) for r in df.to_dict("records")]
+
+
+def test_filter_rows_by_terms_identique_a_filter_by_terms(df):
+    """
+    Teste le filtre de termes sur positions, avec index et en balayage texte.
+    """
+    index = TermIndex(df["Ingredients_txt"])
+    rows = np.array([0, 1, 3, 5])
+    for terms, mode in ((["musc"], "and"), (["rose", "ambre"], "and"), (["vanille", "musc"], "or"), (["rose musc"], "and")):
+        expected = filter_by_terms(df.iloc[rows], "Ingredients_txt", terms, mode=mode)
+        for idx in (index, None):
+            got = filter_rows_by_terms(df, rows, "Ingredients_txt", terms, index=idx, mode=mode)
+            assert df.index[got].tolist() == expected.index.tolist()
@@ -0,0 +1,94 @@
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.app.module.fonction_prediction import FEATURE_COLS, X_depuis_cle, cle_prediction, normaliser_entrees
+from src.Machine_learning.module.scoring import lire_blocs, scorer_fichier
+
+
+class ModeleAnnee:
+    """Niche après 2000, Mass Market avant."""
+
+    classes_ = np.array(["Mass Market", "Niche"])
+
+    def predict_proba(self, X):
+        niche = (X["Année"].to_numpy() > 2000).astype(float)
+        return np.column_stack([1 - niche, niche])
+
+
+def _candidats(n=23):
+    return pd.DataFrame({
+        "Id": range(n),
+        "Famille": ["BOISÉ"] * n,
+        "Sous_famille": [None] + ["AMBRÉ"] * (n - 1),
+        "Parfumeur": ["X"] * n,
+        "Origine": ["France"] * n,
+        "Genre": ["Unisexe"] * n,
+        "Année": [1990 + i for i in range(n)],
+        "Ingredients_txt": [" Rose Vanille "] * n,
+        "Concepts_txt": [np.nan] * n,
+    })
+
+
+def test_normaliser_entrees():
+    X = normaliser_entrees(_candidats(3).assign(**{"Année": ["2010", "abc", None]}))
+    assert list(X.columns) == FEATURE_COLS
+    assert list(X["Année"]) == [2010, 0, 0]
+    assert X.loc[0, "Sous_famille"] == "Inconnu"
+    assert X.loc[0, "Ingredients_txt"] == "rose vanille" and X.loc[0, "Concepts_txt"] == ""
+
+    with pytest.raises(ValueError, match="Genre"):
+        normaliser_entrees(_candidats(2).drop(columns="Genre"))
+
+
+def test_normaliser_entrees_comme_le_formulaire():
+    df = _candidats(3).assign(**{
+        "Année": [2010.0, "2010.0", np.nan],
+        "Ingredients_txt": [np.array(["Rose", "oud", "rose"]), ["oud", "Rose"], ("oud", None, "rose")],
+        "Concepts_txt": [np.array([], dtype=object), "Nuit", None],
+    })
+    X = normaliser_entrees(df)
+    attendu = X_depuis_cle(cle_prediction("BOISÉ", None, "X", "France", "Unisexe", 2010, ["oud", "rose"], []))
+    assert X.iloc[[0]].reset_index(drop=True).equals(attendu)
+    assert list(X["Année"]) == [2010, 2010, 0]
+    assert list(X["Ingredients_txt"]) == ["oud rose"] * 3
+    assert list(X["Concepts_txt"]) == ["", "nuit", ""]
+
+
+@pytest.mark.parametrize("suffixe", [".csv", ".parquet"])
+def test_scorer_fichier_par_blocs(tmp_path, suffixe):
+    model_path = tmp_path / "modele.pkl"
+    joblib.dump(ModeleAnnee(), model_path)
+    entree, sortie = tmp_path / f"entree{suffixe}", tmp_path / f"sortie{suffixe}"
+    df = _candidats()
+    df.to_csv(entree, index=False) if suffixe == ".csv" else df.to_parquet(entree, index=False)
+
+    bilan = scorer_fichier(entree, sortie, model_path, taille_bloc=5, processus=1, progression=False)
+
+    assert bilan["lignes"] == 23 and bilan["blocs"] == 5
+    out = pd.concat(lire_blocs(sortie, taille_bloc=100))
+    assert list(out["Id"]) == list(range(23))
+    assert list(out["Prédiction"]) == ["Niche" if a > 2000 else "Mass Market" for a in df["Année"]]
+    assert np.allclose(out["Proba_Mass Market"] + out["Proba_Niche"], 1.0)
+
+
+@pytest.mark.parametrize("suffixe", [".csv", ".parquet"])
+def test_scorer_fichier_premier_bloc_vide(tmp_path, suffixe):
+    """
+    Teste qu'une colonne vide dans tout le premier bloc ne fige pas un type nul dans le Parquet de sortie.
+    """
+    model_path = tmp_path / "modele.pkl"
+    joblib.dump(ModeleAnnee(), model_path)
+    entree, sortie = tmp_path / f"entree{suffixe}", tmp_path / "sortie.parquet"
+    df = _candidats(12)
+    df["Concepts_txt"] = [None] * 5 + ["jour"] * 7
+    df["Sous_famille"] = [None] * 5 + ["AMBRÉ"] * 7
+    df.to_csv(entree, index=False) if suffixe == ".csv" else df.to_parquet(entree, index=False)
+
+    bilan = scorer_fichier(entree, sortie, model_path, taille_bloc=5, processus=1, progression=False)
+
+    assert bilan["lignes"] == 12
+    out = pd.concat(lire_blocs(sortie, taille_bloc=100), ignore_index=True)
+    assert out["Concepts_txt"].isna().sum() == 5 and list(out["Concepts_txt"].dropna().unique()) == ["jour"]
+    assert list(out["Prédiction"]) == ["Niche" if a > 2000 else "Mass Market" for a in df["Année"]]
@@ -0,0 +1,142 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pytest
+
+from src.app.module.fonction_prediction import X_depuis_cle, cle_prediction
+from src.Machine_learning.Serveur_prediction import creer_serveur
+from src.Machine_learning.module.service import Histogramme, MicroBatcher, lignes_depuis_payload
+
+
+class ModeleFactice:
+    """Probabilités déterministes selon l'année ; compte les appels à predict_proba."""
+
+    classes_ = np.array(["Mass Market", "Niche", "Prestige"])
+
+    def __init__(self):
+        self.appels = []
+
+    def predict_proba(self, X):
+        self.appels.append(len(X))
+        niche = (X["Année"].to_numpy() > 2000).astype(float)
+        return np.column_stack([1 - niche, niche, np.zeros(len(X))])
+
+
+def _ligne(annee=2010, **kw):
+    ligne = {
+        "Famille": "BOISÉ", "Sous_famille": "AMBRÉ", "Parfumeur": "X", "Origine": "France",
+        "Genre": "Unisexe", "Année": annee, "Ingredients_txt": ["Rose", "Vanille"], "Concepts_txt": "",
+    }
+    ligne.update(kw)
+    return ligne
+
+
+def test_lignes_depuis_payload():
+    X, lot = lignes_depuis_payload(_ligne())
+    assert not lot and len(X) == 1
+    assert X.loc[0, "Ingredients_txt"] == "rose vanille"
+
+    X, lot = lignes_depuis_payload({"instances": [_ligne(), _ligne(annee="abc")]})
+    assert lot and list(X["Année"]) == [2010, 0]
+
+    with pytest.raises(ValueError, match="Genre"):
+        lignes_depuis_payload({k: v for k, v in _ligne().items() if k != "Genre"})
+
+
+def test_lignes_depuis_payload_comme_le_formulaire():
+    """
+    Teste que le serveur et le formulaire Prédire construisent la même entrée du modèle.
+    """
+    X, _ = lignes_depuis_payload(_ligne(annee=2010.0, Ingredients_txt=["vanille", "Rose", "rose"], Concepts_txt=["Nuit"]))
+    cle = cle_prediction("BOISÉ", "AMBRÉ", "X", "France", "Unisexe", 2010, ["Rose", "Vanille"], ["nuit"])
+    assert X.equals(X_depuis_cle(cle))
+
+
+def test_histogramme_quantiles():
+    h = Histogramme(bornes=(1, 10, 100))
+    for v in (0.5, 5, 5, 50):
+        h.observer(v)
+    etat = h.etat()
+    assert etat["n"] == 4
+    assert etat["p50"] == 10.0
+    assert etat["p99"] == 100.0
+    assert [c["n"] for c in etat["classes"]] == [1, 2, 1, 0]
+
+
+def test_micro_batcher_regroupe_les_demandes_concurrentes():
+    modele = ModeleFactice()
+    batcher = MicroBatcher(modele, fenetre_ms=200, taille_max=1000)
+    try:
+        X, _ = lignes_depuis_payload([_ligne(1990), _ligne(2010)])
+        resultats = [None] * 8
+        barriere = threading.Barrier(8)
+
+        def client(i):
+            barriere.wait()
+            resultats[i] = batcher.predire(X)
+
+        threads = [threading.Thread(target=client, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sum(modele.appels) == 16 and len(modele.appels) < 8
+        assert all([p.label for p in r] == ["Mass Market", "Niche"] for r in resultats)
+        m = batcher.metriques()
+        assert m["compteurs"]["requetes"] == 8 and m["compteurs"]["lignes"] == 16
+        assert m["latence_ms"]["n"] == 8
+    finally:
+        batcher.arreter()
+
+
+class ModeleFragile(ModeleFactice):
+    """Échoue sur tout lot contenant l'année 1234."""
+
+    def predict_proba(self, X):
+        if (X["Année"] == 1234).any():
+            raise ValueError("ligne invalide")
+        return super().predict_proba(X)
+
+
+def test_micro_batcher_isole_une_demande_en_erreur():
+    modele = ModeleFragile()
+    batcher = MicroBatcher(modele, fenetre_ms=200, taille_max=1000)
+    try:
+        annees = [1990, 1234, 2010]
+        futurs = [batcher.soumettre(lignes_depuis_payload(_ligne(a))[0]) for a in annees]
+        with pytest.raises(ValueError, match="invalide"):
+            futurs[1].result(timeout=5)
+        assert futurs[0].result(timeout=5).argmax(axis=1).tolist() == [0]
+        assert futurs[2].result(timeout=5).argmax(axis=1).tolist() == [1]
+        # Le lot des 3 demandes a échoué, puis les 2 demandes valides ont été évaluées seules
+        assert modele.appels == [1, 1]
+        assert batcher.metriques()["compteurs"]["erreurs"] == 1
+    finally:
+        batcher.arreter()
+
+def test_serveur_http():
+    batcher = MicroBatcher(ModeleFactice(), fenetre_ms=1)
+    serveur = creer_serveur(batcher, port=0)
+    threading.Thread(target=serveur.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{serveur.server_port}"
+
+    def post(corps):
+        req = urllib.request.Request(url + "/predict", data=json.dumps(corps).encode("utf-8"))
+        return json.loads(urllib.request.urlopen(req, timeout=5).read())
+
+    try:
+        assert post(_ligne(2010))["label"] == "Niche"
+        assert [r["label"] for r in post([_ligne(1990), _ligne(2010)])] == ["Mass Market", "Niche"]
+        with pytest.raises(urllib.error.HTTPError) as e:
+            post({"Famille": "BOISÉ"})
+        assert e.value.code == 400
+        metriques = json.loads(urllib.request.urlopen(url + "/metrics", timeout=5).read())
+        assert metriques["compteurs"]["lignes"] == 3
+    finally:
+        serveur.shutdown()
+        serveur.server_close()
+        batcher.arreter()
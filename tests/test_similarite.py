@@ -0,0 +1,63 @@
+"""
+Tests unitaires du moteur de similarité (similarite) et du prétraitement partagé (pretraitement).
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.Machine_learning.module.pretraitement import CAT_COLS, prepare_X
+from src.Machine_learning.module.similarite import IndexSimilarite
+
+
+@pytest.fixture
+def df(catalogue_df) -> pd.DataFrame:
+    """
+    5 parfums du catalogue partagé, avec des valeurs manquantes et des textes plus riches.
+    """
+    df = catalogue_df.head(5).assign(
+        Genre=["Homme", "Femme", "Homme", "Femme", "Unisexe"],
+        Ingredients_txt=["musc ambre cèdre", "rose musc", "ambre cèdre vétiver", "rose pivoine", None],
+        Concepts_txt=["nuit", "jour", "nuit hiver", "jour printemps", "eté"],
+    )
+    df.loc[1, "Parfumeur"] = None
+    df["Année"] = [2001, 2010, None, 2020, 2020]
+    return df
+
+
+def test_prepare_X(df):
+    """
+    Teste le retrait des colonnes non explicatives et le remplissage des valeurs manquantes.
+    """
+    X = prepare_X(df)
+    assert "Prix_Categorie" not in X.columns and "Marque" not in X.columns
+    assert X[CAT_COLS].notna().all().all()
+    assert X["Année"].tolist()[2] == 2015.0
+    assert X["Ingredients_txt"].tolist()[4] == ""
+
+
+def test_voisins_identiques_au_calcul_dense(df):
+    """
+    Teste que les voisins correspondent au calcul cosinus dense, sans le parfum requête.
+    """
+    index = IndexSimilarite(df, tfidf_params={"min_df": 1})
+    norms = np.sqrt(np.asarray(index.X.multiply(index.X).sum(axis=1)).ravel())
+    assert np.allclose(norms, 1.0, atol=1e-5)
+
+    dense = index.X.toarray() @ index.X.toarray().T
+    for i in range(len(df)):
+        pos, sim = index.voisins(i, k=2)
+        assert i not in pos
+        expected = np.delete(dense[i], i)
+        assert np.allclose(sim, np.sort(expected)[::-1][:2], atol=1e-5)
+    assert index.voisins(0, k=1)[0].tolist() == [2]
+
+
+def test_voisins_nouveau_parfum(df):
+    """
+    Teste une requête sur un parfum absent du catalogue.
+    """
+    index = IndexSimilarite(df, tfidf_params={"min_df": 1})
+    new = pd.DataFrame([{"Famille": "FLORAL", "Sous_famille": "ROSE", "Genre": "Femme",
+                         "Ingredients_txt": "rose", "Concepts_txt": "jour"}])
+    pos, _ = index.voisins_df(new, k=2)
+    assert sorted(pos.tolist()) == [1, 3]
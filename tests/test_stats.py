@@ -0,0 +1,134 @@
+"""
+Tests unitaires des agrégations de l'onglet Stats : le cube pré-agrégé
+doit donner les mêmes résultats que les calculs sur les lignes brutes.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.app.module import fonction_stats as fs
+from src.app.module.fonction_catalogue import Catalogue
+from src.app.module.fonction_cube import CubeStats
+from src.app.module.fonction_filtre import filter_df
+
+
+@pytest.fixture
+def stats_df(catalogue_df) -> pd.DataFrame:
+    """
+    Catalogue partagé avec des ex aequo et des origines manquantes ou vides.
+    """
+    return catalogue_df.assign(
+        Prix_Categorie=["Niche", "Prestige", "Niche", "Mass Market", "Prestige", "Niche"],
+        Genre=["Homme", "Femme", "Femme", "Homme", "Unisexe", "Homme"],
+        Origine=["Italie", "France", "France", None, "Italie", " "],
+        Famille=["BOISÉ", "FLORAL", "FLORAL", "BOISÉ", "CITRUS", "CITRUS"],
+        Sous_famille=["CUIR", "FRUITÉ", "VERT", "CUIR", "VERT", "VERT"],
+        Année=[2001, 2001, 2010, 2015, 2015, 2020],
+        Ingredients_txt=[""] * 6,
+        Concepts_txt=[""] * 6,
+    )
+
+
+@pytest.fixture
+def cat(stats_df) -> Catalogue:
+    return Catalogue.depuis_df(stats_df, "test")
+
+
+def test_cube_identique_aux_lignes_brutes(cat):
+    """
+    Teste distribution / yearly_counts / price_by_year via le cube contre les versions *_df.
+    """
+    vues = [
+        cat.vue(),
+        cat.vue({"Genre": "Homme"}),
+        cat.vue({"Prix_Categorie": "Niche"}, (2005, 2020)),
+        cat.vue({"Origine": "Absente"}),
+    ]
+    for vue in vues:
+        rows = vue.df(cat)
+        for col in ["Prix_Categorie", "Genre", "Origine", "Famille", "Sous_famille"]:
+            for top_n in (None, 2):
+                expected = fs.distribution_df(rows, col, top_n=top_n).df
+                got = fs.distribution.__wrapped__(cat, vue, col, top_n=top_n).df
+                assert got.astype(str).equals(expected.astype(str))
+
+        expected = fs.yearly_counts_df(rows)
+        got = fs.yearly_counts.__wrapped__(cat, vue)
+        assert (expected.empty and got.empty) or got.astype(str).equals(expected.astype(str))
+
+        expected = fs.price_by_year_df(rows)
+        got = fs.price_by_year.__wrapped__(cat, vue)
+        assert (expected.empty and got.empty) or got.equals(expected)
+
+
+FILTRES_CUBE = [
+    ({}, None),
+    ({"Genre": "Homme"}, None),
+    ({"Prix_Categorie": "Niche", "Genre": "Homme"}, None),
+    ({"Famille": "CITRUS", "Genre": "Tous"}, (2010, 2020)),
+    ({"Origine": " "}, None),
+    ({"Origine": "France"}, (2001, 2001)),
+    ({"Sous_famille": "VERT"}, (2016, 2030)),
+    ({"Genre": "Absent"}, None),
+]
+
+
+@pytest.mark.parametrize("filtres,annees", FILTRES_CUBE)
+def test_cube_identique_aux_agregations_df(stats_df, filtres, annees):
+    """
+    Teste chaque réponse du cube contre l'agrégation *_df des lignes retenues par filter_df
+    (année manquante comprise : exclue des séries temporelles, comptée dans les distributions).
+    """
+    df = stats_df.copy()
+    df.loc[2, "Année"] = np.nan
+    cube = CubeStats(df)
+    m = cube.mask(filtres, annees)
+    rows = filter_df(df, filtres, annees=annees)
+    assert int(cube.counts[m].sum()) == len(rows)
+
+    for col in ["Prix_Categorie", "Genre", "Origine", "Famille", "Sous_famille"]:
+        expected = fs.distribution_df(rows, col).df
+        got = fs._dist_result(cube.value_counts(col, m)).df
+        assert got.astype(str).equals(expected.astype(str)), col
+
+    expected = fs.yearly_counts_df(rows)
+    got = cube.year_counts(m).rename("Count").reset_index()
+    assert got.astype(str).equals(expected.astype(str))
+
+    for col in ("Prix_Categorie", "Genre"):
+        expected = fs.price_by_year_df(rows, price_col=col)
+        got = cube.year_by(col, m)
+        assert (expected.empty and got.empty) or got.equals(expected), col
+
+
+@pytest.mark.parametrize("filtres,annees", FILTRES_CUBE)
+def test_origines_cube_identiques_aux_lignes_filtrees(stats_df, filtres, annees):
+    """
+    Teste les cartes des origines (via le cube) contre origins_geo_df / origins_choropleth_df.
+    """
+    cat = Catalogue.depuis_df(stats_df, "test")
+    vue = cat.vue(filtres, annees)
+    rows = filter_df(stats_df, filtres, annees=annees)
+    for via_cube, via_df in ((fs.origins_geo, fs.origins_geo_df), (fs.origins_choropleth, fs.origins_choropleth_df)):
+        for top_n in (1, 30):
+            expected = via_df(rows, top_n=top_n).reset_index(drop=True)
+            got = via_cube.__wrapped__(cat, vue, top_n=top_n).reset_index(drop=True)
+            assert got.astype(str).equals(expected.astype(str))
+
+
+@pytest.mark.parametrize("filtres,annees", FILTRES_CUBE)
+def test_indicateurs_identiques_aux_lignes_filtrees(stats_df, filtres, annees):
+    """
+    Teste les indicateurs de l'onglet Stats (sans extraction des lignes) contre len / nunique des lignes retenues.
+    """
+    df = stats_df.copy()
+    df.loc[2, "Année"] = np.nan
+    cat = Catalogue.depuis_df(df, "test")
+    rows = filter_df(df, filtres, annees=annees)
+    got = fs.indicateurs.__wrapped__(cat, cat.vue(filtres, annees))
+    assert got == {
+        "Parfums": len(rows),
+        "Marque": rows["Marque"].nunique(),
+        "Origine": rows["Origine"].nunique(),
+        "Année": rows["Année"].nunique(),
+    }